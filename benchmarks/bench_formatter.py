@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+ContentFormatter ベンチマーク
+単純タグのみの記事1,000件で高速パスと汎用パスの処理時間を比較
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bs4 import BeautifulSoup
+from src.formatter import ContentFormatter
+
+
+def build_article(rng: random.Random) -> str:
+    """p/br/strong/見出しのみで構成された合成記事HTMLを生成"""
+    blocks = []
+    for section in range(rng.randint(3, 6)):
+        blocks.append(f'<h2 name="h{section}">見出し{section}：今日のテーマ</h2>')
+        for _ in range(rng.randint(5, 12)):
+            sentence = 'これはテスト用の本文です。' * rng.randint(1, 4)
+            if rng.random() < 0.3:
+                sentence += f'<strong>重要なポイント{rng.randint(1, 99)}</strong>'
+            if rng.random() < 0.3:
+                sentence += '<br/>次の行です&amp;続き→'
+            blocks.append(f'<p name="p{rng.randint(0, 9999)}">{sentence}</p>')
+    body = ''.join(blocks)
+    return f'<html><body><div class="note-common-styles__textnote-body">{body}</div></body></html>'
+
+
+def run(formatter: ContentFormatter, soups) -> float:
+    """全記事をフォーマットし、経過秒数を返す"""
+    start = time.perf_counter()
+    for soup in soups:
+        formatter.extract_formatted_content(soup)
+    return time.perf_counter() - start
+
+
+def run_extract(formatter: ContentFormatter, soups) -> float:
+    """全記事のブロック抽出のみを行い、経過秒数を返す"""
+    start = time.perf_counter()
+    for soup in soups:
+        formatter.extract_blocks(soup)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ContentFormatter 高速パスのベンチマーク')
+    parser.add_argument('--articles', type=int, default=1000, help='合成記事数（デフォルト:1000）')
+    parser.add_argument('--repeat', type=int, default=3, help='計測回数（デフォルト:3）')
+    args = parser.parse_args()
+    
+    rng = random.Random(42)
+    soups = [BeautifulSoup(build_article(rng), 'html.parser') for _ in range(args.articles)]
+    
+    fast = ContentFormatter(fast_path=True)
+    general = ContentFormatter(fast_path=False)
+    
+    # 出力が一致することを確認
+    for soup in soups:
+        assert fast.extract_formatted_content(soup) == general.extract_formatted_content(soup)
+    
+    general_time = min(run(general, soups) for _ in range(args.repeat))
+    fast_time = min(run(fast, soups) for _ in range(args.repeat))
+    
+    print(f"📊 記事数: {args.articles}")
+    print(f"🐢 汎用パス: {general_time:.3f} 秒")
+    print(f"⚡ 高速パス: {fast_time:.3f} 秒")
+    print(f"🚀 高速化: {general_time / fast_time:.2f} 倍")
+    
+    general_extract = min(run_extract(general, soups) for _ in range(args.repeat))
+    fast_extract = min(run_extract(fast, soups) for _ in range(args.repeat))
+    print(f"🧱 ブロック抽出のみ: {general_extract:.3f} 秒 → {fast_extract:.3f} 秒 "
+          f"({general_extract / fast_extract:.2f} 倍)")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,18 @@ Note記事を取得してCSVに出力
 import asyncio
 import argparse
 import time
+from datetime import datetime
 from src import NoteScraper
+from src.article import Price
+from src.journal import install_graceful_interrupt
+
+
+def date_argument(value: str) -> str:
+    """YYYY-MM-DD 形式の日付引数"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"日付は YYYY-MM-DD 形式で指定してください: {value}")
 
 
 def parse_arguments():
@@ -18,6 +29,14 @@ def parse_arguments():
     parser.add_argument('--login', action='store_true', help='手動ログインモード')
     parser.add_argument('--no-headless', action='store_true', help='ブラウザを表示する')
     parser.add_argument('--limit', type=int, help='取得記事数の上限')
+    parser.add_argument('--resume', action='store_true', help='前回中断した実行を再開（取得済み記事をスキップ）')
+    parser.add_argument('--since', type=date_argument, help='この日以降に公開された記事のみ取得（YYYY-MM-DD）')
+    parser.add_argument('--until', type=date_argument, help='この日までに公開された記事のみ取得（YYYY-MM-DD）')
+    price_group = parser.add_mutually_exclusive_group()
+    price_group.add_argument('--free-only', action='store_true', help='無料記事のみ取得')
+    price_group.add_argument('--paid-only', action='store_true', help='有料記事のみ取得')
+    parser.add_argument('--prefetch', type=int, default=0, metavar='N',
+                        help='記事の解析中にN件先の記事まで別タブで開いておく（0で無効、デフォルト:0）')
     
     return parser.parse_args()
 
@@ -28,9 +47,18 @@ async def main():
     
     # headlessモードの設定（--no-headlessが指定されたらFalse）
     headless = not args.no_headless
+    price = Price.FREE if args.free_only else Price.PAID if args.paid_only else None
+    
+    # Ctrl-C で取得済みの記事を保存してから終了
+    install_graceful_interrupt()
     
-    scraper = NoteScraper(headless=headless)
-    result = await scraper.run(args.profile_url, limit=args.limit, manual_login=args.login)
+    scraper = NoteScraper(headless=headless, prefetch_depth=args.prefetch)
+    try:
+        result = await scraper.run(args.profile_url, limit=args.limit, manual_login=args.login,
+                                   resume=args.resume, since=args.since, until=args.until, price=price)
+    except asyncio.CancelledError:
+        print("\n⏹️  中断しました。--resume を付けて再実行すると続きから再開します")
+        return
     
     if result['success']:
         print(f"\n🎉 実行完了!")
@@ -6,6 +6,7 @@ Note記事増分更新スクリプト
 
 import asyncio
 import argparse
+import json
 import sys
 from pathlib import Path
 
@@ -13,6 +14,9 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent / 'src'))
 
 from src.updater import NoteScrapeUpdater
+from src.csv_manager import CSVManager
+from src.journal import install_graceful_interrupt
+from src.listing_cache import DEFAULT_LISTING_TTL
 
 
 async def main():
@@ -26,8 +30,30 @@ async def main():
     parser.add_argument('--validate', action='store_true', help='URL検証を実行')
     parser.add_argument('--batch', action='store_true', help='バッチ処理モードで実行')
     parser.add_argument('--check-only', action='store_true', help='更新可能性のチェックのみ実行')
+    parser.add_argument('--resume', action='store_true', help='前回中断した更新を再開（取得済み記事をスキップ）')
+    parser.add_argument('--in-place', action='store_true', help='新しいCSVを作らず既存CSVを直接更新')
+    parser.add_argument('--store', help='SQLiteストアのパス（指定時はストアを正本として更新）')
+    parser.add_argument('--parquet', help='新規記事を追記するParquetデータセットのパス（pyarrow が必要）')
+    parser.add_argument('--listing', choices=['browser', 'api'],
+                        help='記事一覧を新しい順に確認し、既知の記事が続いた時点で打ち切る（api はブラウザ不要）')
+    parser.add_argument('--stop-after', type=int, default=5,
+                        help='--listing 使用時に一覧の確認を打ち切る既知記事の連続件数（デフォルト:5）')
+    parser.add_argument('--no-rss', action='store_true',
+                        help='RSSフィードでの新規記事の確認をせず、常に記事一覧を取得')
+    parser.add_argument('--no-probe', action='store_true',
+                        help='記事数・最新記事による事前確認（変更がなければ即終了）をしない')
+    parser.add_argument('--listing-ttl', type=int, default=DEFAULT_LISTING_TTL,
+                        help=f'全件展開した記事一覧を再利用する秒数（0で保存しない、デフォルト:{DEFAULT_LISTING_TTL}）')
+    parser.add_argument('--refresh-listing', action='store_true',
+                        help='保存済みの記事一覧を使わずに取得し直す')
+    parser.add_argument('--prefetch', type=int, default=0, metavar='N',
+                        help='記事の解析中にN件先の記事まで別タブで開いておく（0で無効、デフォルト:0）')
+    parser.add_argument('--health', nargs='?', const='', metavar='REPORT_JSON',
+                        help='既存CSVの健全性チェックのみ実行（パス指定時はレポートをJSONで保存）')
     
     args = parser.parse_args()
+    if args.store and (args.resume or args.in_place):
+        parser.error('--store は --resume / --in-place と同時に指定できません（ストアモードは既存CSVを更新しません）')
     
     # パス存在確認
     csv_path = Path(args.existing_csv)
@@ -36,9 +62,22 @@ async def main():
         return 1
     
     # 更新ツール初期化
-    updater = NoteScrapeUpdater(args.profile_url, headless=args.headless)
+    updater = NoteScrapeUpdater(args.profile_url, headless=args.headless,
+                                listing=args.listing, stop_after=args.stop_after,
+                                use_feed=not args.no_rss, use_probe=not args.no_probe,
+                                listing_ttl=args.listing_ttl, refresh_listing=args.refresh_listing,
+                                prefetch=args.prefetch)
     
     try:
+        # 健全性チェックのみモード
+        if args.health is not None:
+            report = CSVManager().health_report(str(csv_path))
+            if args.health:
+                with open(args.health, 'w', encoding='utf-8') as f:
+                    json.dump(report, f, ensure_ascii=False, indent=2)
+                print(f"📄 レポート保存: {args.health}")
+            return 0 if report['valid'] else 1
+        
         # チェックのみモード
         if args.check_only:
             print("🔍 更新可能性をチェックしています...")
@@ -71,7 +110,11 @@ async def main():
                     print("ℹ️  URL列がないため、全記事を新規として取得します")
                     print("💡 増分更新を実行してください")
                 else:
-                    print("💡 現在の記事数確認は実際の更新時に行います")
+                    cached_urls = None if args.refresh_listing else updater.listing_cache.load()
+                    if cached_urls is not None:
+                        print(f"📊 現在記事数（保存済みの記事一覧）: {len(cached_urls)}件")
+                    else:
+                        print("💡 現在の記事数確認は実際の更新時に行います")
                     print("💡 増分更新を実行してください")
             else:
                 print(f"❌ 更新準備エラー: {analysis.get('error', '不明')}")
@@ -82,16 +125,29 @@ async def main():
         # 実際の更新実行
         print("🚀 増分更新を開始します")
         
+        # Ctrl-C で取得済みの記事をジャーナルに保存してから終了
+        install_graceful_interrupt()
+        
         manual_setup = not args.no_manual
         
         # 更新モード選択
-        if args.batch:
+        if args.store:
+            print("🗄️  ストアモードで実行")
+            result = await updater.update_with_store(
+                str(csv_path),
+                args.store,
+                manual_setup=manual_setup,
+                output_path=args.output
+            )
+        elif args.batch:
             print("📦 バッチ処理モードで実行")
             result = await updater.batch_update_with_progress(
                 str(csv_path),
                 manual_setup=manual_setup,
                 batch_size=args.batch_size,
-                output_path=args.output
+                output_path=args.output,
+                resume=args.resume,
+                in_place=args.in_place
             )
         elif args.validate:
             print("🔍 URL検証モードで実行")
@@ -100,14 +156,18 @@ async def main():
                 manual_setup=manual_setup,
                 validate_urls=True,
                 batch_size=args.batch_size,
-                output_path=args.output
+                output_path=args.output,
+                resume=args.resume,
+                in_place=args.in_place
             )
         else:
             print("⚡ 標準モードで実行")
             result = await updater.update_from_csv(
                 str(csv_path),
                 manual_setup=manual_setup,
-                output_path=args.output
+                output_path=args.output,
+                resume=args.resume,
+                in_place=args.in_place
             )
         
         # 結果表示
@@ -120,13 +180,22 @@ async def main():
             if result.get('invalid_urls_count'):
                 print(f"⚠️  無効URL: {result['invalid_urls_count']}件")
             
+            if args.parquet:
+                manager = CSVManager()
+                if not Path(args.parquet).exists() and result['output_file'].endswith('.csv'):
+                    # 初回は更新後CSV全体から作成
+                    manager.export_parquet(result['output_file'], args.parquet)
+                else:
+                    manager.append_to_parquet(args.parquet, result['new_articles'])
+            
             return 0
         else:
             print(f"❌ 更新失敗: {result['error']}")
             return 1
             
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
         print("\n\n⏹️  ユーザーにより中断されました")
+        print("💡 --resume を付けて再実行すると続きから再開します")
         return 1
     except Exception as e:
         print(f"❌ 予期しないエラー: {e}")
@@ -159,6 +228,18 @@ def show_usage_examples():
 7. 更新可能性チェックのみ:
    python note_scraper_update.py https://note.com/ihayato existing.csv --check-only
 
+8. 中断した更新の再開:
+   python note_scraper_update.py https://note.com/ihayato existing.csv --batch --resume
+
+9. SQLiteストアを正本として更新（CSVは -o 指定時のみ書き出し）:
+   python note_scraper_update.py https://note.com/ihayato existing.csv --store output/ihayato.db -o updated.csv
+
+10. 既存CSVを直接更新（新規記事が最新なら先頭に追記するだけで全件を書き直さない）:
+   python note_scraper_update.py https://note.com/ihayato existing.csv --in-place
+
+11. 新規記事をParquetデータセットにも追記（pyarrow が必要）:
+   python note_scraper_update.py https://note.com/ihayato existing.csv --parquet output/ihayato.parquet
+
 推奨コマンド (イケハヤさんの場合):
    python note_scraper_update.py https://note.com/ihayato /Users/yusukeohata/Desktop/youtube-chanel/URLなし/07.イケハヤ2\\(note\\).csv --batch
 """)
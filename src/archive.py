@@ -0,0 +1,225 @@
+"""
+記事アーカイブモジュール
+zstd圧縮したJSONLフレームとURL索引で、必要な記事だけを展開して読めるアーカイブ（zstandard が必要）
+"""
+
+import json
+import mmap
+import os
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
+
+from .article import Article
+from .url_differ import URLDiffer
+
+try:
+    import zstandard
+except ImportError:  # zstandard は任意依存
+    zstandard = None
+
+
+ARCHIVE_VERSION = 1
+
+
+def require_zstandard():
+    """zstandard がなければ分かりやすいエラーにする"""
+    if zstandard is None:
+        raise ImportError("アーカイブ形式を使うには zstandard が必要です（pip install zstandard）")
+
+
+def index_path(archive_path: str) -> str:
+    """索引ファイルのパス（<archive>.idx.json）"""
+    return f"{archive_path}.idx.json"
+
+
+class ArticleArchiveWriter:
+    """記事を frame_size 件ごとに独立したzstdフレームとして書き出すクラス
+    
+    索引には各フレームのファイル内位置と、URL → (フレーム番号, 展開後のバイト位置) を記録する。
+    """
+    
+    def __init__(self, path: str, frame_size: int = 256, level: int = 10):
+        require_zstandard()
+        self.path = path
+        self.frame_size = max(1, frame_size)
+        self.url_differ = URLDiffer()
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._temp_path = f"{path}.tmp"
+        self._file = None
+        self._pending: List[bytes] = []
+        self._pending_urls: List[str] = []
+        self._frames: List[List[int]] = []
+        self._urls: Dict[str, List[int]] = {}
+        self._count = 0
+        self._result: Optional[Dict[str, any]] = None
+    
+    def __enter__(self) -> 'ArticleArchiveWriter':
+        return self.open()
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+    
+    def open(self) -> 'ArticleArchiveWriter':
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self._temp_path, 'wb')
+        return self
+    
+    def add(self, article: Article):
+        """記事を1件追加"""
+        article = Article.coerce(article)
+        self._pending.append(json.dumps(article.to_dict(), ensure_ascii=False).encode('utf-8') + b'\n')
+        self._pending_urls.append(self.url_differ._normalize_url(article.url))
+        self._count += 1
+        if len(self._pending) >= self.frame_size:
+            self._flush_frame()
+    
+    def close(self) -> Dict[str, any]:
+        """残りを書き出して確定（アーカイブ本体→索引の順に置き換え、2回目以降は結果のみ返す）"""
+        if self._result is not None:
+            return self._result
+        
+        self._flush_frame()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        
+        index = {
+            'version': ARCHIVE_VERSION,
+            'article_count': self._count,
+            'frames': self._frames,
+            'urls': self._urls
+        }
+        temp_index = f"{index_path(self.path)}.tmp"
+        with open(temp_index, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+        
+        os.replace(self._temp_path, self.path)
+        os.replace(temp_index, index_path(self.path))
+        
+        self._result = {
+            'success': True,
+            'filename': self.path,
+            'article_count': self._count,
+            'frame_count': len(self._frames),
+            'file_size_mb': round(os.path.getsize(self.path) / (1024 * 1024), 1)
+        }
+        return self._result
+    
+    def abort(self):
+        """書き込みを中止して一時ファイルを削除"""
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+    
+    def _flush_frame(self):
+        if not self._pending:
+            return
+        
+        frame_number = len(self._frames)
+        offset = 0
+        for line, url in zip(self._pending, self._pending_urls):
+            if url:
+                self._urls[url] = [frame_number, offset]
+            offset += len(line)
+        
+        raw = b''.join(self._pending)
+        compressed = self._compressor.compress(raw)
+        self._frames.append([self._file.tell(), len(compressed), len(raw)])
+        self._file.write(compressed)
+        
+        self._pending = []
+        self._pending_urls = []
+
+
+class ArticleArchive:
+    """記事アーカイブの読み込みクラス（ファイルはメモリマップし、必要なフレームだけ展開）"""
+    
+    def __init__(self, path: str, cache_frames: int = 8):
+        require_zstandard()
+        self.path = path
+        self.url_differ = URLDiffer()
+        self.cache_frames = max(1, cache_frames)
+        
+        with open(index_path(path), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') != ARCHIVE_VERSION:
+            raise ValueError(f"未対応のアーカイブ形式です: {path}")
+        self.frames = index['frames']
+        self.urls = index['urls']
+        self.article_count = index['article_count']
+        
+        self._decompressor = zstandard.ZstdDecompressor()
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.frames else None
+        self._cache: 'OrderedDict[int, bytes]' = OrderedDict()
+    
+    def __enter__(self) -> 'ArticleArchive':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+    
+    def __len__(self) -> int:
+        return self.article_count
+    
+    def __contains__(self, url: str) -> bool:
+        return self.url_differ._normalize_url(url) in self.urls
+    
+    def get(self, url: str) -> Optional[Article]:
+        """URLで記事を1件取得（なければ None）"""
+        location = self.urls.get(self.url_differ._normalize_url(url))
+        if location is None:
+            return None
+        return self._read_article(*location)
+    
+    def get_many(self, urls: List[str]) -> Dict[str, Article]:
+        """複数のURLの記事を取得（フレーム順にまとめて展開し、各フレームは1回だけ展開）"""
+        locations = []
+        for url in urls:
+            location = self.urls.get(self.url_differ._normalize_url(url))
+            if location is not None:
+                locations.append((location[0], location[1], url))
+        
+        articles = {}
+        for frame_number, offset, url in sorted(locations):
+            articles[url] = self._read_article(frame_number, offset)
+        return articles
+    
+    def __iter__(self) -> Iterator[Article]:
+        """全記事を書き込み順に返す"""
+        for frame_number in range(len(self.frames)):
+            for line in self._decompress(frame_number).split(b'\n')[:-1]:
+                yield Article.from_dict(json.loads(line))
+    
+    def _read_article(self, frame_number: int, offset: int) -> Article:
+        raw = self._frame(frame_number)
+        end = raw.index(b'\n', offset)
+        return Article.from_dict(json.loads(raw[offset:end]))
+    
+    def _frame(self, frame_number: int) -> bytes:
+        """展開済みフレーム（最近使ったものを cache_frames 個まで保持）"""
+        raw = self._cache.get(frame_number)
+        if raw is not None:
+            self._cache.move_to_end(frame_number)
+            return raw
+        
+        raw = self._decompress(frame_number)
+        self._cache[frame_number] = raw
+        if len(self._cache) > self.cache_frames:
+            self._cache.popitem(last=False)
+        return raw
+    
+    def _decompress(self, frame_number: int) -> bytes:
+        offset, size, raw_size = self.frames[frame_number]
+        return self._decompressor.decompress(self._mmap[offset:offset + size], max_output_size=raw_size)
@@ -0,0 +1,160 @@
+"""
+記事レコードモジュール
+パイプライン全体で受け渡す記事データ（__slots__ で軽量化、価格・購入状況は列挙型）
+"""
+
+import sys
+from datetime import datetime
+from enum import Enum
+from typing import Dict, Optional, Union
+
+
+class _TextEnum(str, Enum):
+    """値の文字列としてそのまま比較・出力できる列挙型"""
+    
+    def __str__(self) -> str:
+        return self.value
+    
+    @classmethod
+    def parse(cls, value) -> Union['_TextEnum', str]:
+        """文字列を列挙値に変換（未知の値は intern した文字列のまま返す）"""
+        if isinstance(value, cls):
+            return value
+        text = '' if value is None or value != value else str(value)  # NaN は空欄扱い
+        try:
+            return cls(text)
+        except ValueError:
+            return sys.intern(text)
+
+
+class Price(_TextEnum):
+    """価格"""
+    UNKNOWN = ''
+    FREE = '無料'
+    PAID = '有料'
+
+
+class PurchaseStatus(_TextEnum):
+    """購入状況"""
+    UNKNOWN = ''
+    FREE = '無料'
+    PURCHASED_OR_FREE = '購入済み or 無料'
+
+
+ERROR_TITLE_PREFIX = 'エラー:'
+
+
+def parse_timestamp(date: str) -> Optional[datetime]:
+    """公開日の文字列（ISO形式）を日時に変換（解析できなければ None）"""
+    if not date:
+        return None
+    try:
+        return datetime.fromisoformat(date)
+    except ValueError:
+        return None
+
+
+class Article:
+    """記事1件分のデータ
+    
+    date は取得したままの文字列（CSVにはこの値を書き出す）、published_at はそれを解析した日時。
+    辞書だった頃のコードのため get() / [] でも参照できる。
+    """
+    
+    __slots__ = ('url', 'title', 'content', 'date', 'price', 'purchase_status', 'number', 'published_at')
+    
+    FIELDS = ('url', 'title', 'content', 'date', 'price', 'purchase_status')
+    
+    def __init__(self, url: str = '', title: str = '', content: str = '', date: str = '',
+                 price: Union[Price, str] = Price.UNKNOWN,
+                 purchase_status: Union[PurchaseStatus, str] = PurchaseStatus.UNKNOWN,
+                 number: Optional[int] = None):
+        self.url = _text(url)
+        self.title = _text(title)
+        self.content = _text(content)
+        self.date = _text(date)
+        self.price = Price.parse(price)
+        self.purchase_status = PurchaseStatus.parse(purchase_status)
+        self.number = number
+        self.published_at = parse_timestamp(self.date)
+    
+    @classmethod
+    def error(cls, url: str, error: Exception) -> 'Article':
+        """スクレイピングに失敗した記事（エラー内容をタイトル・本文に入れる）"""
+        return cls(url=url, title=f"{ERROR_TITLE_PREFIX} {error}", content=f"エラーが発生しました: {error}")
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, any]) -> 'Article':
+        """辞書（ジャーナル・JSON）から作成"""
+        return cls(**{name: data.get(name) for name in cls.FIELDS}, number=data.get('number'))
+    
+    @classmethod
+    def coerce(cls, article: Union['Article', Dict[str, any]]) -> 'Article':
+        """Article ならそのまま、辞書なら変換して返す"""
+        return article if isinstance(article, cls) else cls.from_dict(article)
+    
+    @classmethod
+    def from_row(cls, row: Dict[str, any]) -> 'Article':
+        """CSVの1行（日本語の列名）から作成"""
+        return cls(
+            url=row.get('URL'),
+            title=row.get('タイトル'),
+            content=row.get('本文'),
+            date=row.get('公開日'),
+            price=row.get('価格'),
+            purchase_status=row.get('購入状況'),
+            number=_number(row.get('番号'))
+        )
+    
+    def to_row(self, number: int) -> Dict[str, any]:
+        """CSVの1行（日本語の列名）に変換"""
+        return {
+            '番号': number,
+            '公開日': self.date,
+            'タイトル': self.title,
+            '本文': self.content,
+            '価格': str(self.price),
+            '購入状況': str(self.purchase_status),
+            'URL': self.url
+        }
+    
+    def to_dict(self) -> Dict[str, any]:
+        """JSON化できる辞書に変換"""
+        data = {name: str(getattr(self, name)) for name in self.FIELDS}
+        if self.number is not None:
+            data['number'] = self.number
+        return data
+    
+    @property
+    def is_error(self) -> bool:
+        """スクレイピングエラーで作られた記事か"""
+        return self.title.startswith(ERROR_TITLE_PREFIX)
+    
+    def get(self, name: str, default=None):
+        return getattr(self, name, default) if name in self.__slots__ else default
+    
+    def __getitem__(self, name: str):
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Article):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.FIELDS)
+    
+    def __repr__(self) -> str:
+        return f"Article(url={self.url!r}, title={self.title[:30]!r}, date={self.date!r})"
+
+
+def _number(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _text(value) -> str:
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return str(value)
@@ -0,0 +1,226 @@
+"""
+記事ストアモジュール
+正規化URLを主キーとするSQLiteデータベースを記事データの正本として管理
+"""
+
+import csv
+import hashlib
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Union
+
+import pandas as pd
+
+from .article import Article
+from .exporter import CSV_COLUMNS, row_to_article
+from .manifest import CSVManifest
+from .url_differ import URLDiffer
+
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS articles (
+        url_key TEXT PRIMARY KEY,
+        url TEXT NOT NULL DEFAULT '',
+        published_at TEXT NOT NULL DEFAULT '',
+        title TEXT NOT NULL DEFAULT '',
+        content TEXT NOT NULL DEFAULT '',
+        price TEXT NOT NULL DEFAULT '',
+        purchase_status TEXT NOT NULL DEFAULT '',
+        content_hash TEXT NOT NULL DEFAULT '',
+        updated_at TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_articles_published_at ON articles(published_at)",
+    "CREATE INDEX IF NOT EXISTS idx_articles_content_hash ON articles(content_hash)",
+    # 既存CSVと同じ列構成のビュー（番号は公開日の古い順、公開日なしは末尾）
+    """
+    CREATE VIEW IF NOT EXISTS articles_csv AS
+    SELECT
+        ROW_NUMBER() OVER (ORDER BY published_at = '', published_at, rowid) AS "番号",
+        published_at AS "公開日",
+        title AS "タイトル",
+        content AS "本文",
+        price AS "価格",
+        purchase_status AS "購入状況",
+        url AS "URL"
+    FROM articles
+    """
+]
+
+UPSERT_SQL = """
+    INSERT INTO articles (url_key, url, published_at, title, content, price,
+                          purchase_status, content_hash, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(url_key) DO UPDATE SET
+        url = excluded.url,
+        published_at = excluded.published_at,
+        title = excluded.title,
+        content = excluded.content,
+        price = excluded.price,
+        purchase_status = excluded.purchase_status,
+        content_hash = excluded.content_hash,
+        updated_at = excluded.updated_at
+    WHERE articles.content_hash != excluded.content_hash
+       OR articles.published_at != excluded.published_at
+       OR articles.title != excluded.title
+       OR articles.price != excluded.price
+       OR articles.purchase_status != excluded.purchase_status
+"""
+
+
+def content_hash(content: str) -> str:
+    """本文のハッシュ値（変更検知用）"""
+    return hashlib.blake2b((content or '').encode('utf-8'), digest_size=16).hexdigest()
+
+
+class ArticleStore:
+    """記事データをSQLite（WALモード）で管理するクラス
+    
+    更新時は新規記事のupsertのみで済み、CSVは articles_csv ビューから書き出す。
+    """
+    
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.url_differ = URLDiffer()
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        with self.conn:
+            for statement in SCHEMA:
+                self.conn.execute(statement)
+    
+    def __enter__(self) -> 'ArticleStore':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def close(self):
+        """データベースを閉じる"""
+        self.conn.close()
+    
+    def count(self) -> int:
+        """記事数"""
+        return self.conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+    
+    def existing_urls(self) -> Set[str]:
+        """保存済みの記事URL一覧"""
+        return {row[0] for row in self.conn.execute("SELECT url FROM articles WHERE url != ''")}
+    
+    def contains(self, url: str) -> bool:
+        """記事URLが保存済みか（正規化URLの主キー検索）"""
+        key = self.url_differ._normalize_url(url)
+        return self.conn.execute(
+            'SELECT 1 FROM articles WHERE url_key = ?', (key,)
+        ).fetchone() is not None
+    
+    def filter_new_urls(self, urls: List[str]) -> List[str]:
+        """ストアにないURLのみを返す（正規化したURLで照合し、渡されたURLのまま順序保持・重複除去）"""
+        new_urls = []
+        seen = set()
+        for url in urls:
+            key = self.url_differ._normalize_url(url)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            if self.conn.execute('SELECT 1 FROM articles WHERE url_key = ?', (key,)).fetchone() is None:
+                new_urls.append(url)
+        return new_urls
+    
+    def date_range(self) -> Dict[str, Optional[str]]:
+        """公開日の最古・最新"""
+        row = self.conn.execute(
+            "SELECT MIN(published_at), MAX(published_at) FROM articles WHERE published_at != ''"
+        ).fetchone()
+        return {'min_date': row[0], 'max_date': row[1]}
+    
+    def upsert_articles(self, articles: List[Union[Article, Dict]]) -> Dict[str, int]:
+        """記事を追加・更新（URLが同じで内容が変わらない記事は書き換えない）"""
+        now = datetime.now().isoformat(timespec='seconds')
+        rows = [self._article_to_record(article, now) for article in articles]
+        
+        before = self.count()
+        with self.conn:
+            changes_before = self.conn.total_changes
+            self.conn.executemany(UPSERT_SQL, rows)
+            changed = self.conn.total_changes - changes_before
+        inserted = self.count() - before
+        
+        return {
+            'inserted': inserted,
+            'updated': changed - inserted,
+            'unchanged': len(rows) - changed
+        }
+    
+    def import_csv(self, csv_path: str, chunksize: int = 5000) -> Dict[str, int]:
+        """既存CSVをストアに取り込む"""
+        totals = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        for chunk in pd.read_csv(csv_path, encoding='utf-8-sig', dtype=str,
+                                 keep_default_na=False, chunksize=chunksize):
+            articles = [row_to_article(row) for row in chunk.to_dict('records')]
+            result = self.upsert_articles(articles)
+            for key in totals:
+                totals[key] += result[key]
+        
+        print(f"✅ CSV取り込み完了: {csv_path}")
+        print(f"📊 追加: {totals['inserted']} / 更新: {totals['updated']} / 変更なし: {totals['unchanged']}")
+        return totals
+    
+    def export_csv(self, output_path: str) -> Dict[str, any]:
+        """articles_csv ビューを既存CSVと同じ形式で書き出す（最新記事が上）"""
+        temp_path = f"{output_path}.tmp"
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        cursor = self.conn.execute(
+            """SELECT * FROM articles_csv
+               ORDER BY "公開日" = '', "公開日" DESC, "番号" DESC"""
+        )
+        row_count = 0
+        with open(temp_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator=os.linesep)
+            writer.writerow(CSV_COLUMNS)
+            for row in cursor:
+                writer.writerow(row)
+                row_count += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, output_path)
+        CSVManifest(output_path).build()
+        
+        file_size_mb = os.path.getsize(output_path) / (1024 * 1024)
+        return {
+            'success': True,
+            'filename': output_path,
+            'total_articles_count': row_count,
+            'file_size_mb': round(file_size_mb, 1)
+        }
+    
+    def _article_to_record(self, article: Union[Article, Dict], updated_at: str) -> tuple:
+        """記事情報をarticlesテーブルの1行に変換"""
+        article = Article.coerce(article)
+        url = article.url
+        content = article.content
+        digest = content_hash(content)
+        # URL列のない古いCSVの行は本文ハッシュをキーにする
+        url_key = self.url_differ._normalize_url(url) if url else f"hash:{digest}"
+        
+        return (
+            url_key,
+            url,
+            article.date,
+            article.title,
+            content,
+            str(article.price),
+            str(article.purchase_status),
+            digest,
+            updated_at
+        )
@@ -0,0 +1,177 @@
+"""
+本文ブロックモジュール
+本文を出力形式に依存しないブロック列として表現
+"""
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+
+class Block:
+    """本文ブロックの基底クラス"""
+    
+    __slots__ = ()
+    kind = ''
+    
+    def to_dict(self) -> Dict[str, any]:
+        """JSON化できる辞書に変換"""
+        data = {'type': self.kind}
+        for name in self.__slots__:
+            data[name] = getattr(self, name)
+        return data
+    
+    def __eq__(self, other) -> bool:
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class TextBlock(Block):
+    """本文直下のテキスト"""
+    
+    __slots__ = ('text',)
+    kind = 'text'
+    
+    def __init__(self, text: str):
+        self.text = text
+
+
+class ParagraphBlock(Block):
+    """パラグラフ
+    
+    spans はインライン要素のタプル列:
+    ('text', 文字列) / ('strong', 文字列) / ('em', 文字列) / ('link', 文字列, href) / ('br',)
+    """
+    
+    __slots__ = ('spans',)
+    kind = 'paragraph'
+    
+    def __init__(self, spans: Tuple[tuple, ...]):
+        self.spans = tuple(spans)
+    
+    def to_dict(self) -> Dict[str, any]:
+        return {'type': self.kind, 'spans': [list(span) for span in self.spans]}
+
+
+class HeadingBlock(Block):
+    """見出し"""
+    
+    __slots__ = ('text', 'level')
+    kind = 'heading'
+    
+    def __init__(self, text: str, level: int = 2):
+        self.text = text
+        self.level = level
+
+
+class QuoteBlock(Block):
+    """引用"""
+    
+    __slots__ = ('text',)
+    kind = 'quote'
+    
+    def __init__(self, text: str):
+        self.text = text
+
+
+class RuleBlock(Block):
+    """区切り線"""
+    
+    __slots__ = ()
+    kind = 'rule'
+
+
+class ImageBlock(Block):
+    """画像（caption は figcaption がない場合 None）"""
+    
+    __slots__ = ('src', 'alt', 'caption')
+    kind = 'image'
+    
+    def __init__(self, src: str, alt: str = '画像', caption: Optional[str] = None):
+        self.src = src
+        self.alt = alt
+        self.caption = caption
+
+
+class BannerBlock(Block):
+    """リンク・バナー（label は「バナー」「画像バナー」「リンク」など）"""
+    
+    __slots__ = ('label', 'href', 'title', 'desc')
+    kind = 'banner'
+    
+    def __init__(self, label: str, href: str, title: str = '', desc: str = ''):
+        self.label = label
+        self.href = href
+        self.title = title
+        self.desc = desc
+
+
+class EmbedBlock(Block):
+    """外部サービスの埋め込み（banner がある場合はそれを包む）"""
+    
+    __slots__ = ('label', 'url', 'banner')
+    kind = 'embed'
+    
+    def __init__(self, label: str, url: str = '', banner: Optional[BannerBlock] = None):
+        self.label = label
+        self.url = url
+        self.banner = banner
+    
+    def to_dict(self) -> Dict[str, any]:
+        return {
+            'type': self.kind,
+            'label': self.label,
+            'url': self.url,
+            'banner': self.banner.to_dict() if self.banner else None
+        }
+
+
+class ListBlock(Block):
+    """箇条書き・番号付きリスト"""
+    
+    __slots__ = ('items', 'ordered')
+    kind = 'list'
+    
+    def __init__(self, items: List[str], ordered: bool = False):
+        self.items = tuple(items)
+        self.ordered = ordered
+    
+    def to_dict(self) -> Dict[str, any]:
+        return {'type': self.kind, 'items': list(self.items), 'ordered': self.ordered}
+
+
+BLOCK_TYPES = {
+    block_class.kind: block_class
+    for block_class in (TextBlock, ParagraphBlock, HeadingBlock, QuoteBlock, RuleBlock,
+                        ImageBlock, BannerBlock, EmbedBlock, ListBlock)
+}
+
+
+def block_from_dict(data: Dict[str, any]) -> Block:
+    """辞書からブロックを復元"""
+    fields = dict(data)
+    kind = fields.pop('type', None)
+    block_class = BLOCK_TYPES.get(kind)
+    if block_class is None:
+        raise ValueError(f"不明なブロック種別です: {kind}")
+    
+    if block_class is ParagraphBlock:
+        fields['spans'] = [tuple(span) for span in fields['spans']]
+    elif block_class is EmbedBlock and fields.get('banner'):
+        fields['banner'] = block_from_dict(fields['banner'])
+    
+    return block_class(**fields)
+
+
+def blocks_to_json(blocks: List[Block]) -> str:
+    """ブロック列をJSON文字列に変換（キャッシュ保存用）"""
+    return json.dumps([block.to_dict() for block in blocks], ensure_ascii=False)
+
+
+def blocks_from_json(text: str) -> List[Block]:
+    """JSON文字列からブロック列を復元"""
+    return [block_from_dict(data) for data in json.loads(text)]
@@ -3,17 +3,80 @@
 """
 
 import asyncio
-from typing import Optional
+import time
+from typing import Awaitable, Callable, Dict, Optional
 from playwright.async_api import async_playwright, Page, Browser
 
 
+class PlaywrightRuntime:
+    """プロセス内で共有する Playwright ランタイム（ドライバーのプロセス）
+    
+    acquire した数を数え、最後の release でドライバーを停止する。
+    BrowserManager をいくつ作っても、同時に動くドライバーは1つだけになる。
+    """
+    
+    _playwright = None
+    _refcount = 0
+    _lock: Optional[asyncio.Lock] = None
+    _loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    @classmethod
+    def _get_lock(cls) -> asyncio.Lock:
+        # ランタイムはイベントループごと（asyncio.run を繰り返す場合は作り直す）
+        loop = asyncio.get_running_loop()
+        if cls._lock is None or cls._loop is not loop:
+            cls._lock = asyncio.Lock()
+            cls._loop = loop
+            cls._playwright = None
+            cls._refcount = 0
+        return cls._lock
+    
+    @classmethod
+    async def acquire(cls):
+        """ランタイムを取得（最初の1回だけドライバーを起動）"""
+        async with cls._get_lock():
+            if cls._playwright is None:
+                cls._playwright = await async_playwright().start()
+            cls._refcount += 1
+            return cls._playwright
+    
+    @classmethod
+    async def release(cls):
+        """acquire と対で呼ぶ（最後の1つでドライバーを停止）"""
+        async with cls._get_lock():
+            if cls._refcount == 0:
+                return
+            cls._refcount -= 1
+            if cls._refcount == 0:
+                playwright, cls._playwright = cls._playwright, None
+                await playwright.stop()
+    
+    @classmethod
+    def refcount(cls) -> int:
+        """現在の利用数"""
+        return cls._refcount
+
+
 class BrowserManager:
     """ブラウザ操作を管理するクラス"""
     
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, max_recoveries: int = 5, storage_state_every: int = 20):
         self.headless = headless
+        self.playwright = None
         self.browser: Optional[Browser] = None
+        self.context = None
         self.page: Optional[Page] = None
+        # 直近の起動にかかった秒数
+        self.startup_seconds = 0.0
+        # クラッシュからの復旧（最後に開いたURLと、再起動時に戻すCookieなどの保存状態）
+        self.max_recoveries = max_recoveries
+        self.current_url: Optional[str] = None
+        self.storage_state: Optional[Dict[str, any]] = None
+        # 保存状態はログイン後と storage_state_every 回のページ移動ごとに控え直す（毎回は重いため）
+        self.storage_state_every = storage_state_every
+        self._navigations_since_save = 0
+        self.crash_count = 0
+        self.recovery_seconds = 0.0
         
     def _show_manual_instructions(self):
         """手動作業の指示を表示"""
@@ -26,12 +89,18 @@ class BrowserManager:
         print("=" * 70)
         print()
     
-    async def initialize(self):
-        """ブラウザを初期化（タイムアウト無効化）"""
+    async def initialize(self, storage_state: Optional[Dict[str, any]] = None,
+                         show_instructions: bool = True):
+        """ブラウザを初期化（タイムアウト無効化、storage_state があればCookieなどを復元）"""
         # 必須指示を表示
-        self._show_manual_instructions()
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(
+        if show_instructions:
+            self._show_manual_instructions()
+        if self.playwright is not None:
+            # 初期化済みなら前のブラウザを閉じてから起動し直す
+            await self.close()
+        started = time.perf_counter()
+        self.playwright = await PlaywrightRuntime.acquire()
+        self.browser = await self.playwright.chromium.launch(
             headless=self.headless,
             args=[
                 '--no-sandbox',
@@ -45,34 +114,109 @@ class BrowserManager:
         # タイムアウト完全無効化
         context = await self.browser.new_context(
             viewport={'width': 1280, 'height': 720},
-            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+            storage_state=storage_state
         )
         context.set_default_timeout(0)  # タイムアウト無し
+        self.context = context
         
         self.page = await context.new_page()
         self.page.set_default_timeout(0)  # タイムアウト無し
+        self.startup_seconds = time.perf_counter() - started
         
     async def navigate_to_article_list(self, profile_url: str):
         """記事一覧ページに移動"""
         article_list_url = profile_url.rstrip('/') + '/all'
-        await self.page.goto(article_list_url, wait_until="domcontentloaded", timeout=0)
-        await self.page.wait_for_timeout(3000)
+        await self._goto(article_list_url, wait_ms=3000)
         return article_list_url
         
     async def navigate_to_article(self, url: str):
         """個別記事ページに移動"""
-        await self.page.goto(url, wait_until="domcontentloaded", timeout=0)
-        await self.page.wait_for_timeout(2000)
+        await self._goto(url, wait_ms=2000)
         
     async def get_page_content(self) -> str:
         """現在のページのHTMLコンテンツを取得"""
-        return await self.page.content()
+        return await self._with_recovery(lambda: self.page.content())
         
     async def get_page_title(self) -> str:
         """現在のページのタイトルを取得"""
-        return await self.page.title()
+        return await self._with_recovery(lambda: self.page.title())
+    
+    def is_alive(self) -> bool:
+        """ブラウザが接続中でページが開いているか"""
+        return (self.browser is not None and self.browser.is_connected()
+                and self.page is not None and not self.page.is_closed())
+    
+    async def recover_if_crashed(self) -> bool:
+        """ブラウザ・ページが落ちていれば起動し直して保存状態（Cookieなど）を戻す（起動し直したら True）"""
+        if self.page is None or self.is_alive() or self.crash_count >= self.max_recoveries:
+            return False
+        
+        started = time.perf_counter()
+        self.crash_count += 1
+        print(f"💥 ブラウザが応答しません。再起動します（{self.crash_count}回目）")
+        # ドライバーは止めずにブラウザだけを起動し直す
+        await PlaywrightRuntime.acquire()
+        try:
+            await self.close()
+            await self.initialize(storage_state=self.storage_state, show_instructions=False)
+        finally:
+            await PlaywrightRuntime.release()
+        self.recovery_seconds += time.perf_counter() - started
+        print(f"🔁 ブラウザを再起動しました（{time.perf_counter() - started:.1f}秒）")
+        return True
+    
+    def recovery_stats(self) -> Dict[str, any]:
+        """クラッシュ回数と復旧にかかった時間"""
+        return {
+            'crash_count': self.crash_count,
+            'recovery_seconds': round(self.recovery_seconds, 1)
+        }
+    
+    async def _goto(self, url: str, wait_ms: int = 0):
+        """ページを開いて wait_ms ミリ秒待つ（待機中に落ちた場合も再起動して開き直す）"""
+        self.current_url = url
+        
+        async def open_page():
+            await self.page.goto(url, wait_until="domcontentloaded", timeout=0)
+            if wait_ms:
+                await self.page.wait_for_timeout(wait_ms)
+        
+        await self._with_recovery(open_page, reopen=False)
+        self._navigations_since_save += 1
+        if self.storage_state is None or self._navigations_since_save >= self.storage_state_every:
+            await self.save_storage_state()
+    
+    async def _with_recovery(self, operation: Callable[[], Awaitable], reopen: bool = True):
+        """ページ操作を実行し、ブラウザが落ちていた場合は再起動して処理中のURLを開き直してからやり直す"""
+        try:
+            return await operation()
+        except Exception:
+            if not await self.recover_if_crashed():
+                raise
+        if reopen and self.current_url:
+            await self.page.goto(self.current_url, wait_until="domcontentloaded", timeout=0)
+        return await operation()
+    
+    async def save_storage_state(self):
+        """再起動時に戻せるよう、現在のCookieなどを控えておく（ログイン後に呼ぶ）"""
+        try:
+            self.storage_state = await self.context.storage_state()
+            self._navigations_since_save = 0
+        except Exception:
+            pass
         
     async def close(self):
-        """ブラウザを閉じる"""
-        if self.browser:
-            await self.browser.close()
\ No newline at end of file
+        """ブラウザを閉じる（閉じた後は page が None になる）"""
+        try:
+            if self.browser:
+                await self.browser.close()
+        except Exception as e:
+            print(f"⚠️  ブラウザ終了エラー: {e}")
+        finally:
+            if self.playwright:
+                await PlaywrightRuntime.release()
+            self.playwright = None
+            self.browser = None
+            self.context = None
+            self.page = None
\ No newline at end of file
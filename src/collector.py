@@ -3,10 +3,35 @@
 """
 
 import re
-from typing import List, Dict
+from datetime import datetime
+from typing import List, Dict, Optional
 from urllib.parse import urljoin
+from zoneinfo import ZoneInfo
 from bs4 import BeautifulSoup
 
+from .article import Price, PurchaseStatus
+
+
+# カードの公開日は日本時間の日付として扱う
+JST = ZoneInfo('Asia/Tokyo')
+
+# 一覧ページの記事リンクと、それを含むカードの公開日・スキ数・本文（価格表示の判定用）を1回で取得するスクリプト
+CARDS_SCRIPT = """elements => elements.map(element => {
+    const card = element.closest('article, li, [class*="card" i]') || element.parentElement;
+    const time = card ? card.querySelector('time') : null;
+    const like = card ? card.querySelector('[class*="like" i], [aria-label*="スキ"]') : null;
+    return {
+        href: element.getAttribute('href'),
+        datetime: time ? (time.getAttribute('datetime') || time.textContent) : '',
+        likes: like ? like.textContent : '',
+        text: card ? card.innerText.slice(0, 500) : ''
+    };
+})"""
+
+# カードの有料表示（￥500 など。タイトル中の「円」と区別するため記号付きの金額のみ）
+CARD_PRICE_PATTERN = re.compile(r'[￥¥]\s*[\d,]+')
+CARD_DATE_PATTERN = re.compile(r'(\d{4})年(\d{1,2})月(\d{1,2})日')
+
 
 class ArticleCollector:
     """記事情報を収集するクラス"""
@@ -16,26 +41,67 @@ class ArticleCollector:
         
     async def collect_article_links(self, page) -> List[str]:
         """ページから記事リンクを収集"""
-        articles = []
+        return [card['url'] for card in await self.collect_article_cards(page)]
+        
+    async def collect_article_cards(self, page) -> List[Dict[str, any]]:
+        """一覧ページの記事カードからURLと公開日・価格・スキ数をまとめて収集（記事ページは開かない）"""
+        cards = []
+        seen = set()
         
-        # 記事リンクを収集
-        all_links = await page.query_selector_all('a[href*="/n/"]')
+        for raw in await page.eval_on_selector_all('a[href*="/n/"]', CARDS_SCRIPT):
+            href = raw.get('href')
+            if href and self._is_valid_article_link(href):
+                card = self.parse_card(raw)
+                
+                # 重複チェック（画像とタイトルなど同じカード内の複数リンク）
+                if card['url'] not in seen:
+                    seen.add(card['url'])
+                    cards.append(card)
         
-        for link in all_links:
-            try:
-                href = await link.get_attribute('href')
-                if href and self._is_valid_article_link(href):
-                    full_url = urljoin(self.base_url, href)
-                    full_url = full_url.split('?')[0].split('#')[0]
+        return cards
+    
+    def parse_card(self, raw: Dict[str, str]) -> Dict[str, any]:
+        """CARDS_SCRIPT の1件分を記事カードのメタデータに変換（date は YYYY-MM-DD、不明なら空欄）"""
+        full_url = urljoin(self.base_url, raw['href'])
+        likes = re.sub(r'[^\d]', '', raw.get('likes') or '')
+        return {
+            'url': full_url.split('?')[0].split('#')[0],
+            'date': self._card_date(raw.get('datetime') or ''),
+            'price': Price.PAID if CARD_PRICE_PATTERN.search(raw.get('text') or '') else Price.FREE,
+            'like_count': int(likes) if likes else None
+        }
+    
+    def _card_date(self, value: str) -> str:
+        value = value.strip()
+        try:
+            published = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            pass
+        else:
+            # タイムゾーン付きの日時は日本時間の日付にする（UTCの日付だと前日になる場合がある）
+            if published.tzinfo is not None:
+                published = published.astimezone(JST)
+            return published.date().isoformat()
+        match = CARD_DATE_PATTERN.search(value)
+        if match:
+            year, month, day = (int(part) for part in match.groups())
+            return f"{year:04d}-{month:02d}-{day:02d}"
+        return ''
                     
-                    # 重複チェック
-                    if full_url not in articles:
-                        articles.append(full_url)
+    def filter_cards(self, cards: List[Dict[str, any]], since: Optional[str] = None,
+                     until: Optional[str] = None, price: Optional[Price] = None) -> List[Dict[str, any]]:
+        """公開日（since〜until、YYYY-MM-DD、両端を含む）と価格で記事カードを絞り込む
                         
-            except Exception:
+        カードから公開日が読み取れない記事は期間外と断定できないため残す。
+        """
+        filtered = []
+        for card in cards:
+            if price is not None and card['price'] != price:
                 continue
-        
-        return articles
+            if card['date'] and ((since and card['date'] < since) or (until and card['date'] > until)):
+                continue
+            filtered.append(card)
+        return filtered
     
     def _is_valid_article_link(self, href: str) -> bool:
         """有効な記事リンクかチェック"""
@@ -44,12 +110,12 @@ class ArticleCollector:
                 return '/info/n/' not in href
         return False
     
-    def extract_article_metadata(self, soup: BeautifulSoup) -> Dict[str, str]:
+    def extract_article_metadata(self, soup: BeautifulSoup) -> Dict[str, any]:
         """記事のメタデータを抽出"""
         metadata = {
             'date': '',
-            'price': '無料',
-            'purchase_status': '無料'
+            'price': Price.FREE,
+            'purchase_status': PurchaseStatus.FREE
         }
         
         # 公開日取得
@@ -60,7 +126,7 @@ class ArticleCollector:
         # 価格情報取得
         price_element = soup.find('span', string=re.compile(r'￥|円'))
         if price_element:
-            metadata['price'] = '有料'
-            metadata['purchase_status'] = '購入済み or 無料'
+            metadata['price'] = Price.PAID
+            metadata['purchase_status'] = PurchaseStatus.PURCHASED_OR_FREE
         
         return metadata
\ No newline at end of file
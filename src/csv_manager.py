@@ -3,25 +3,91 @@ CSV管理モジュール
 既存CSVの読み込み、新規データの追加、保存を管理
 """
 
+import csv
 import os
-from typing import List, Dict, Optional, Set
+from importlib.util import find_spec
+from typing import Iterator, List, Dict, Optional, Set, Union
 import pandas as pd
 from datetime import datetime
 
+from .article import Article
+from .dtypes import STRING_DTYPE, apply_article_dtypes, frame_for_csv, memory_usage_by_column
+from .exporter import CSV_COLUMNS, article_to_row, row_to_article
+from .manifest import CSVManifest
+from .csv_merge import SortedCSVMerger
+from .csv_validator import CSVValidator
+from .url_index import URLIndex
+
 
 class CSVManager:
     """CSV読み書きを管理するクラス"""
     
     def __init__(self):
-        self.column_order = ['番号', '公開日', 'タイトル', '本文', '価格', '購入状況', 'URL']
+        self.column_order = list(CSV_COLUMNS)
+        # 列を絞った統計用の読み込みには pyarrow エンジンを使う（未インストールなら標準エンジン）
+        self.fast_engine = 'pyarrow' if find_spec('pyarrow') else 'c'
+        # 公開日の集計結果（CSVのパス・サイズ・更新時刻ごと）
+        self._date_cache: Dict[tuple, Dict[str, Optional[str]]] = {}
+    
+    def read_csv(self, csv_path: str, columns: Optional[List[str]] = None,
+                 chunksize: Optional[int] = None, engine: str = 'c',
+                 typed: bool = False) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """CSVを読み込む
+        
+        columns を指定するとその列のみ読み込む（存在しない列は無視）。
+        chunksize を指定すると DataFrame のイテレータを返す（標準エンジンのみ対応）。
+        engine='pyarrow' は pyarrow のCSVリーダーで読む（空欄は NaN ではなく None になる）。
+        typed=True なら列を省メモリな型に変換する（dtypes.apply_article_dtypes）。
+        """
+        header = pd.read_csv(csv_path, encoding='utf-8-sig', nrows=0).columns
+        usecols = None
+        if columns is not None:
+            usecols = [column for column in header if column in columns]
+        
+        if chunksize is not None:
+            chunks = pd.read_csv(csv_path, encoding='utf-8-sig', usecols=usecols, chunksize=chunksize)
+            return (apply_article_dtypes(chunk) for chunk in chunks) if typed else chunks
+        if engine == 'pyarrow':
+            df = self._read_csv_pyarrow(csv_path, usecols if usecols is not None else list(header), typed)
+        else:
+            df = pd.read_csv(csv_path, encoding='utf-8-sig', usecols=usecols, engine=engine)
+        return apply_article_dtypes(df) if typed else df
+    
+    def _read_csv_pyarrow(self, csv_path: str, columns: List[str], typed: bool = False) -> pd.DataFrame:
+        """pyarrow のCSVリーダーで読み込む（本文の改行に対応、番号以外は文字列のまま）"""
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+        
+        # pandas の engine='pyarrow' は改行を含む値に対応しておらず、公開日も日時型に変換してしまう
+        # ブロック単位のストリーミング読み込みで、読み込まない列（本文など）をメモリに溜めない
+        reader = pa_csv.open_csv(
+            csv_path,
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=columns,
+                column_types={column: pa.string() for column in columns if column != '番号'},
+                strings_can_be_null=True
+            )
+        )
+        if typed:
+            # 文字列列をPythonオブジェクトにせず、Arrowのまま DataFrame にする
+            return reader.read_all().to_pandas(types_mapper={pa.string(): STRING_DTYPE}.get)
+        return reader.read_all().to_pandas()
     
-    def load_existing_csv(self, csv_path: str) -> Dict[str, any]:
-        """既存CSVを読み込み、データと統計情報を返す"""
+    def load_existing_csv(self, csv_path: str, columns: Optional[List[str]] = None,
+                          engine: Optional[str] = None, typed: bool = True) -> Dict[str, any]:
+        """既存CSVを読み込み、データと統計情報を返す
+        
+        columns で読み込む列を絞れる。typed=True（既定）なら省メモリな列型で保持する
+        （engine 未指定時は、typed なら pyarrow エンジン、そうでなければ標準エンジン）。
+        """
         if not os.path.exists(csv_path):
             raise FileNotFoundError(f"CSVファイルが見つかりません: {csv_path}")
+        if engine is None:
+            engine = self.fast_engine if typed else 'c'
         
         try:
-            df = pd.read_csv(csv_path, encoding='utf-8-sig')
+            df = self.read_csv(csv_path, columns=columns, engine=engine, typed=typed)
             
             # 統計情報
             if 'URL' in df.columns:
@@ -29,10 +95,11 @@ class CSVManager:
             else:
                 existing_urls = set()  # URL列がない場合は空のset
             
+            date_stats = self._get_date_stats(df, self._cache_key(csv_path))
             stats = {
                 'total_articles': len(df),
-                'date_range': self._get_date_range(df),
-                'latest_date': self._get_latest_date(df),
+                'date_range': date_stats['date_range'],
+                'latest_date': date_stats['latest_date'],
                 'existing_urls': existing_urls,
                 'has_url_column': 'URL' in df.columns
             }
@@ -45,22 +112,51 @@ class CSVManager:
                 'dataframe': df,
                 'stats': stats
             }
-            
+        
         except Exception as e:
             raise Exception(f"CSV読み込みエラー: {e}")
     
+    def load_stats(self, csv_path: str) -> Dict[str, any]:
+        """本文を読まずに統計情報のみ取得（公開日・URL列のみ読み込む）"""
+        return self.load_existing_csv(csv_path, columns=['公開日', 'URL'], engine=self.fast_engine)['stats']
+    
+    def get_csv_stats(self, csv_path: str) -> Dict[str, any]:
+        """既存CSVの統計情報をマニフェストから取得（本文は読まない）"""
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(f"CSVファイルが見つかりません: {csv_path}")
+        
+        stats = CSVManifest(csv_path).stats()
+        print(f"✅ 既存CSV情報取得: {csv_path}")
+        print(f"📊 記事数: {stats['total_articles']}")
+        print(f"📅 期間: {stats['date_range']}")
+        return stats
+    
     def extract_existing_urls(self, csv_path: str) -> Set[str]:
-        """既存CSVからURL一覧を抽出"""
-        data = self.load_existing_csv(csv_path)
-        return data['stats']['existing_urls']
+        """既存CSVからURL一覧を抽出（マニフェストを使用）"""
+        return self.get_csv_stats(csv_path)['existing_urls']
+    
+    def url_index(self, csv_path: str) -> URLIndex:
+        """既存CSVのURL索引（<csv>.urls.npz、CSVが変わっていればマニフェストから作り直す）"""
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(f"CSVファイルが見つかりません: {csv_path}")
+        
+        manifest = CSVManifest(csv_path)
+        index_path = f"{csv_path}.urls.npz"
+        index = URLIndex.load(index_path)
+        if index is None or index.source != manifest._source_info():
+            print(f"🗂️  URL索引を作成しています: {index_path}")
+            index = URLIndex.build(manifest.load_or_build()['urls'], manifest._source_info())
+            index.save(index_path)
+        
+        print(f"✅ URL索引: {len(index)}件 ({index.nbytes / (1024 * 1024):.1f} MB)")
+        return index
     
-    def merge_and_save(self, existing_csv_path: str, new_articles: List[Dict], 
+    def merge_and_save(self, existing_csv_path: str, new_articles: List[Article], 
                       output_path: Optional[str] = None) -> Dict[str, any]:
         """既存データと新規記事をマージして保存"""
         
-        # 既存データ読み込み
-        existing_data = self.load_existing_csv(existing_csv_path)
-        existing_df = existing_data['dataframe']
+        if not os.path.exists(existing_csv_path):
+            raise FileNotFoundError(f"CSVファイルが見つかりません: {existing_csv_path}")
         
         if not new_articles:
             print("📝 新規記事がありません。既存データをそのまま保持します。")
@@ -68,31 +164,10 @@ class CSVManager:
                 'success': True,
                 'filename': existing_csv_path,
                 'new_articles_count': 0,
-                'total_articles_count': len(existing_df)
+                'total_articles_count': CSVManifest(existing_csv_path).stats()['total_articles'],
+                'file_size_mb': round(os.path.getsize(existing_csv_path) / (1024 * 1024), 1)
             }
         
-        # 新規記事をDataFrameに変換
-        new_df = self._create_dataframe_from_articles(new_articles, 
-                                                     start_number=len(existing_df) + 1)
-        
-        # 既存DFにURL列がない場合は追加
-        if 'URL' not in existing_df.columns:
-            existing_df['URL'] = ''
-            print("ℹ️  既存データにURL列を追加しました")
-        
-        # データをマージ
-        merged_df = pd.concat([existing_df, new_df], ignore_index=True)
-        
-        # 公開日順でソート（昇順：古い順で番号付け）
-        merged_df_sorted = merged_df.sort_values('公開日', ascending=True)
-        
-        # 番号を再振り（最古記事=1番、最新記事=最大番号）
-        merged_df_sorted['番号'] = range(1, len(merged_df_sorted) + 1)
-        
-        # 表示用に降順ソート（最新記事が上に表示）
-        merged_df = merged_df_sorted.sort_values('公開日', ascending=False)
-        merged_df = merged_df.reset_index(drop=True)
-        
         # 出力パス決定
         if output_path is None:
             # outputフォルダ作成（存在しない場合）
@@ -102,8 +177,14 @@ class CSVManager:
             base_name = os.path.splitext(os.path.basename(existing_csv_path))[0]
             output_path = f"output/{base_name}_updated_{timestamp}.csv"
         
-        # 保存
-        merged_df.to_csv(output_path, index=False, encoding='utf-8-sig', quoting=1)
+        # 既存CSV（公開日の新しい順）をソート済みランとして新規記事と1パスでマージし、
+        # 番号を振りながら一時ファイルに書き出して置き換える（全件をメモリに載せない）
+        existing_dates = self._existing_dates(existing_csv_path)
+        merge_result = SortedCSVMerger().merge(
+            existing_csv_path, new_articles, output_path, existing_dates=existing_dates
+        )
+        if merge_result['added_url_column']:
+            print("ℹ️  既存データにURL列を追加しました")
         
         # 結果情報
         file_size = os.path.getsize(output_path)
@@ -113,7 +194,7 @@ class CSVManager:
             'success': True,
             'filename': output_path,
             'new_articles_count': len(new_articles),
-            'total_articles_count': len(merged_df),
+            'total_articles_count': merge_result['row_count'],
             'file_size_mb': round(file_size_mb, 1)
         }
         
@@ -125,64 +206,226 @@ class CSVManager:
         
         return result
     
-    def _create_dataframe_from_articles(self, articles: List[Dict], start_number: int = 1) -> pd.DataFrame:
+    def load_parquet(self, parquet_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Parquetデータセットを読み込む（columns で必要な列のみ読める）"""
+        from .parquet_store import ParquetCorpus
+        
+        return apply_article_dtypes(ParquetCorpus(parquet_path).read(columns=columns))
+    
+    def update_in_place(self, csv_path: str, new_articles: List[Article]) -> Dict[str, any]:
+        """既存CSVそのものを更新（別ファイルに全件を複製しない）
+        
+        既存の番号が変わらない場合は新規記事を先頭に差し込むだけで済ませ、
+        並べ替え・番号の振り直しが必要な場合は一時ファイル経由でアトミックに書き直す。
+        """
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(f"CSVファイルが見つかりません: {csv_path}")
+        
+        if not new_articles:
+            print("📝 新規記事がありません。既存データをそのまま保持します。")
+            return {
+                'success': True,
+                'filename': csv_path,
+                'new_articles_count': 0,
+                'total_articles_count': CSVManifest(csv_path).stats()['total_articles'],
+                'file_size_mb': round(os.path.getsize(csv_path) / (1024 * 1024), 1)
+            }
+        
+        merger = SortedCSVMerger()
+        manifest_data = CSVManifest(csv_path).load_or_build()
+        merge_result = merger.prepend(csv_path, new_articles, manifest_data)
+        if merge_result is not None:
+            print(f"⚡ 新規記事 {len(new_articles)}件を先頭に追加しました（既存行はそのまま）")
+        else:
+            print("ℹ️  番号の振り直しが必要なため、CSV全体を書き直します")
+            merge_result = merger.merge(
+                csv_path, new_articles, csv_path,
+                existing_dates=pd.Series(manifest_data['dates'], dtype=object)
+            )
+        
+        file_size_mb = os.path.getsize(csv_path) / (1024 * 1024)
+        result = {
+            'success': True,
+            'filename': csv_path,
+            'new_articles_count': len(new_articles),
+            'total_articles_count': merge_result['row_count'],
+            'file_size_mb': round(file_size_mb, 1)
+        }
+        
+        print(f"✅ 上書き更新完了: {csv_path}")
+        print(f"📈 新規記事: {result['new_articles_count']}")
+        print(f"📊 総記事数: {result['total_articles_count']}")
+        return result
+    
+    def export_parquet(self, csv_path: str, parquet_path: str) -> Dict[str, any]:
+        """既存CSVをParquetデータセットに変換"""
+        from .parquet_store import ParquetCorpus
+        
+        df = self.load_existing_csv(csv_path)['dataframe']
+        result = ParquetCorpus(parquet_path).write(df)
+        print(f"✅ Parquet出力完了: {parquet_path} ({result['file_size_mb']} MB)")
+        return result
+    
+    def append_to_parquet(self, parquet_path: str, new_articles: List[Article]) -> Dict[str, any]:
+        """新規記事をParquetデータセットに追記（既存ファイルは書き換えない）"""
+        from .parquet_store import ParquetCorpus
+        
+        new_df = self._create_dataframe_from_articles(new_articles)
+        result = ParquetCorpus(parquet_path).append(new_df)
+        print(f"✅ Parquet追記完了: {result['written_count']}件 (総記事数: {result['total_articles_count']})")
+        return result
+    
+    def export_archive(self, csv_path: str, archive_path: str,
+                       frame_size: int = 256, chunksize: int = 5000) -> Dict[str, any]:
+        """既存CSVを圧縮アーカイブ（zstd JSONLフレーム＋URL索引）に変換"""
+        from .archive import ArticleArchiveWriter
+        
+        with ArticleArchiveWriter(archive_path, frame_size=frame_size) as writer:
+            for chunk in pd.read_csv(csv_path, encoding='utf-8-sig', dtype=str,
+                                     keep_default_na=False, chunksize=chunksize):
+                for row in chunk.to_dict('records'):
+                    writer.add(row_to_article(row))
+        result = writer.close()
+        
+        print(f"✅ アーカイブ出力完了: {archive_path}")
+        print(f"📊 記事数: {result['article_count']} / フレーム数: {result['frame_count']}")
+        print(f"💾 ファイルサイズ: {result['file_size_mb']} MB")
+        return result
+    
+    def import_archive(self, archive_path: str, output_path: str) -> Dict[str, any]:
+        """圧縮アーカイブをCSVに戻す（アーカイブ内の順序・番号のまま）"""
+        from .archive import ArticleArchive
+        
+        temp_path = f"{output_path}.tmp"
+        with ArticleArchive(archive_path) as archive, \
+                open(temp_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator=os.linesep)
+            writer.writerow(self.column_order)
+            for i, article in enumerate(archive, 1):
+                row = article_to_row(article, article.number or i)
+                writer.writerow([row[column] for column in self.column_order])
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, output_path)
+        data = CSVManifest(output_path).build()
+        
+        print(f"✅ アーカイブからCSVを復元: {output_path} ({data['row_count']}記事)")
+        return {
+            'success': True,
+            'filename': output_path,
+            'total_articles_count': data['row_count']
+        }
+    
+    def _create_dataframe_from_articles(self, articles: List[Article], start_number: int = 1) -> pd.DataFrame:
         """記事リストからDataFrameを作成"""
-        df_data = []
-        for i, article in enumerate(articles):
-            df_data.append({
-                '番号': start_number + i,
-                '公開日': article.get('date', ''),
-                'タイトル': article.get('title', ''),
-                '本文': article.get('content', ''),
-                '価格': article.get('price', ''),
-                '購入状況': article.get('purchase_status', ''),
-                'URL': article.get('url', '')
-            })
-        
-        return pd.DataFrame(df_data)
+        df_data = [article_to_row(article, start_number + i) for i, article in enumerate(articles)]
+        
+        return pd.DataFrame(df_data, columns=self.column_order)
     
-    def _get_date_range(self, df: pd.DataFrame) -> str:
-        """データの日付範囲を取得"""
-        if '公開日' not in df.columns:
-            return "不明"
+    def _write_csv_atomic(self, df: pd.DataFrame, output_path: str):
+        """一時ファイル経由でCSVをアトミックに保存（型を変換した列は元の表記に戻す）"""
+        df = frame_for_csv(df)
+        temp_path = f"{output_path}.tmp"
+        df.to_csv(temp_path, index=False, encoding='utf-8-sig', quoting=1)
+        with open(temp_path, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(temp_path, output_path)
+        CSVManifest(output_path).write_for_dataframe(df)
+    
+    def health_report(self, csv_path: str, sample_size: int = 20) -> Dict[str, any]:
+        """CSVの内容を検査して健全性レポートを返す（URL形式・URL重複・公開日・エラー記事・空の本文）"""
+        if not os.path.exists(csv_path):
+            raise FileNotFoundError(f"CSVファイルが見つかりません: {csv_path}")
+        
+        # 値は文字列のまま読む（pyarrow があれば本文もArrow文字列のまま検査する）
+        header = list(pd.read_csv(csv_path, encoding='utf-8-sig', nrows=0).columns)
+        if self.fast_engine == 'pyarrow':
+            df = self._read_csv_pyarrow(csv_path, header, typed=True)
+        else:
+            df = pd.read_csv(csv_path, encoding='utf-8-sig', dtype=str, keep_default_na=False)
         
-        dates = pd.to_datetime(df['公開日'], errors='coerce').dropna()
-        if len(dates) == 0:
-            return "不明"
+        report = CSVValidator(sample_size=sample_size).validate(df)
+        report['filename'] = csv_path
         
-        min_date = dates.min().strftime('%Y-%m-%d')
-        max_date = dates.max().strftime('%Y-%m-%d')
-        return f"{min_date} 〜 {max_date}"
+        print(f"🩺 CSV健全性チェック: {csv_path} ({report['row_count']}記事)")
+        for line in CSVValidator.describe(report):
+            print(f"   ⚠️  {line}")
+        print("✅ 問題は見つかりませんでした" if report['valid'] else "❌ 問題が見つかりました")
+        return report
     
-    def _get_latest_date(self, df: pd.DataFrame) -> Optional[str]:
-        """最新の記事日付を取得"""
-        if '公開日' not in df.columns:
-            return None
+    def memory_report(self, df: pd.DataFrame) -> Dict[str, any]:
+        """読み込んだDataFrameの列ごとのメモリ使用量を表示して返す"""
+        usage = memory_usage_by_column(df)
+        total = sum(usage.values())
         
-        dates = pd.to_datetime(df['公開日'], errors='coerce').dropna()
-        if len(dates) == 0:
-            return None
+        print(f"🧠 メモリ使用量: {total / (1024 * 1024):.1f} MB ({len(df)}行)")
+        for column, size in usage.items():
+            print(f"   {column}: {size / (1024 * 1024):.1f} MB ({df[column].dtype})")
         
-        return dates.max().strftime('%Y-%m-%d %H:%M:%S')
+        return {
+            'row_count': len(df),
+            'total_mb': round(total / (1024 * 1024), 1),
+            'columns': {
+                column: {'dtype': str(df[column].dtype), 'bytes': size}
+                for column, size in usage.items()
+            }
+        }
+    
+    def _existing_dates(self, csv_path: str) -> pd.Series:
+        """既存CSVの公開日列（マニフェストが最新ならそこから取り、CSVは読まない）"""
+        manifest_data = CSVManifest(csv_path).load()
+        if manifest_data is not None:
+            return pd.Series(manifest_data['dates'], dtype=object)
+        return self.read_csv(csv_path, columns=['公開日'], engine=self.fast_engine)['公開日']
+    
+    def _cache_key(self, csv_path: str) -> tuple:
+        stat = os.stat(csv_path)
+        return (os.path.abspath(csv_path), stat.st_size, stat.st_mtime_ns)
+    
+    def _get_date_stats(self, df: pd.DataFrame, cache_key: Optional[tuple] = None) -> Dict[str, Optional[str]]:
+        """公開日を1回だけ解析して日付範囲と最新日付を求める（cache_key があれば結果を再利用）"""
+        if cache_key is not None and cache_key in self._date_cache:
+            return self._date_cache[cache_key]
+        
+        date_stats = {'date_range': "不明", 'latest_date': None}
+        if '公開日' in df.columns:
+            dates = pd.to_datetime(df['公開日'], errors='coerce').dropna()
+            if len(dates) > 0:
+                min_date, max_date = dates.min(), dates.max()
+                date_stats = {
+                    'date_range': f"{min_date.strftime('%Y-%m-%d')} 〜 {max_date.strftime('%Y-%m-%d')}",
+                    'latest_date': max_date.strftime('%Y-%m-%d %H:%M:%S')
+                }
+        
+        # 公開日列を読んでいない場合の「不明」は、同じファイルを全列で読んだときに使わないよう保存しない
+        if cache_key is not None and '公開日' in df.columns:
+            self._date_cache[cache_key] = date_stats
+        return date_stats
+    
+    def _get_date_range(self, df: pd.DataFrame) -> str:
+        """データの日付範囲を取得"""
+        return self._get_date_stats(df)['date_range']
+    
+    def _get_latest_date(self, df: pd.DataFrame) -> Optional[str]:
+        """最新の記事日付を取得"""
+        return self._get_date_stats(df)['latest_date']
     
     def validate_csv_format(self, csv_path: str) -> bool:
         """CSVファイルの形式を検証"""
         try:
-            df = pd.read_csv(csv_path, encoding='utf-8-sig')
+            # マニフェストが最新ならCSV本体は読まない（古ければ読み込んで作り直す）
+            stats = CSVManifest(csv_path).stats()
             
             # URL列の有効性確認
-            if 'URL' in df.columns:
-                valid_urls = df['URL'].dropna()
-                non_empty_urls = [url for url in valid_urls if url.strip()]
-                
-                if len(non_empty_urls) == 0:
+            if stats['has_url_column']:
+                if len(stats['existing_urls']) == 0:
                     print("ℹ️  URLが空です（全記事を新規として扱います）")
             else:
                 print("ℹ️  URL列がありません（全記事を新規として扱います）")
             
-            print(f"✅ CSV形式検証: 正常 ({len(df)}記事)")
+            print(f"✅ CSV形式検証: 正常 ({stats['total_articles']}記事)")
             return True
-            
+        
         except Exception as e:
             print(f"❌ CSV検証エラー: {e}")
             return False
\ No newline at end of file
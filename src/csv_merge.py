@@ -0,0 +1,229 @@
+"""
+ソート済みマージモジュール
+公開日順（新しい順）に並んだ既存CSVと新規記事を、全件をメモリに載せずに1パスでマージする
+"""
+
+import csv
+import heapq
+import io
+import os
+import shutil
+import tempfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .article import Article
+from .exporter import CSV_COLUMNS, article_to_row
+from .manifest import CSVManifest
+
+
+def publish_key(date: str) -> Tuple[bool, str]:
+    """並び順のキー（降順で並べると公開日の新しい順、公開日なしは末尾）"""
+    return (date != '', date)
+
+
+class SortedCSVMerger:
+    """既存CSVを1本のソート済みランとして扱い、新規記事とストリーミングでマージするクラス
+    
+    既存CSVが公開日の降順に並んでいない場合は、run_size 行ずつソートした一時ランを作り
+    それらをマージする外部ソートに切り替える（メモリ使用量は run_size 行分で一定）。
+    番号は公開日の古い順に1から振る（公開日なしの記事はその後ろ）。
+    """
+    
+    def __init__(self, run_size: int = 50000, batch_size: int = 5000):
+        self.run_size = run_size
+        self.batch_size = batch_size
+    
+    def merge(self, existing_csv_path: str, new_articles: List[Article], output_path: str,
+              existing_dates: Optional[pd.Series] = None) -> Dict[str, any]:
+        """マージしてoutput_pathにアトミックに書き出す
+        
+        existing_dates は既存CSVの公開日列（なければ読み込む）。
+        """
+        header = self._read_header(existing_csv_path)
+        output_header = header + [column for column in CSV_COLUMNS if column not in header]
+        added_url_column = 'URL' not in header
+        
+        if existing_dates is None:
+            existing_dates = pd.read_csv(existing_csv_path, encoding='utf-8-sig', usecols=['公開日'],
+                                         dtype=str, keep_default_na=False)['公開日']
+        dates = existing_dates.fillna('').astype(str).to_numpy()
+        
+        new_rows = self._new_rows(new_articles, output_header)
+        date_index = output_header.index('公開日')
+        
+        dated_total = int(np.count_nonzero(dates != '')) + sum(1 for row in new_rows if row[date_index])
+        
+        temp_dir = None
+        if self._is_sorted_desc(dates):
+            runs = [self._iter_rows(existing_csv_path, len(output_header))]
+        else:
+            print("ℹ️  既存CSVが公開日順に並んでいないため、外部ソートでマージします")
+            temp_dir = tempfile.mkdtemp(prefix='merge_runs_', dir=os.path.dirname(os.path.abspath(output_path)))
+            runs = self._make_sorted_runs(existing_csv_path, len(output_header), date_index, temp_dir)
+        
+        try:
+            merged = heapq.merge(*runs, new_rows, key=lambda row: publish_key(row[date_index]), reverse=True)
+            row_count = self._write_numbered(merged, output_header, date_index, dated_total, output_path)
+        finally:
+            if temp_dir:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+        
+        return {
+            'row_count': row_count,
+            'added_url_column': added_url_column
+        }
+    
+    def prepend(self, csv_path: str, new_articles: List[Article],
+                manifest_data: Dict[str, any]) -> Optional[Dict[str, any]]:
+        """既存の番号が変わらない場合のみ、新規記事をCSVの先頭に差し込む
+        
+        既存CSVが公開日の降順で公開日なしの行がなく、番号が上から N..1 と振られていて
+        （スクレイパーが取得順に 1 から振ったCSVは対象外）、新規記事がすべて既存の最新記事より
+        新しい場合に限る（条件を満たさなければ None を返す）。
+        既存のデータ行は解析せずバイト列のままコピーする。
+        """
+        header = self._read_header(csv_path)
+        if any(column not in header for column in CSV_COLUMNS):
+            return None
+        
+        dates = np.array(manifest_data['dates'], dtype=object)
+        new_rows = self._new_rows(new_articles, header)
+        date_index = header.index('公開日')
+        number_index = header.index('番号')
+        
+        if not self._is_sorted_desc(dates) or (len(dates) and dates[-1] == ''):
+            return None
+        if not manifest_data.get('numbers_desc'):
+            return None
+        if any(not row[date_index] for row in new_rows):
+            return None
+        if len(dates) and new_rows[-1][date_index] <= dates[0]:
+            return None
+        
+        # 新規記事の番号は既存の最大番号の続き（最新記事が最大番号）
+        total = len(dates) + len(new_rows)
+        for offset, row in enumerate(new_rows):
+            row[number_index] = str(total - offset)
+        
+        temp_path = f"{csv_path}.tmp"
+        with open(csv_path, 'rb') as src, open(temp_path, 'wb') as dst:
+            dst.write(src.readline())  # BOM付きのヘッダー行はそのまま
+            text = io.StringIO()
+            csv.writer(text, quoting=csv.QUOTE_ALL, lineterminator=os.linesep).writerows(new_rows)
+            dst.write(text.getvalue().encode('utf-8'))
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+            dst.flush()
+            os.fsync(dst.fileno())
+        os.replace(temp_path, csv_path)
+        
+        manifest = CSVManifest(csv_path)
+        new_data = manifest.collect([pd.DataFrame(new_rows, columns=header)])
+        data = manifest.save(CSVManifest.concat(new_data, manifest_data))
+        return {
+            'row_count': data['row_count'],
+            'added_url_column': False
+        }
+    
+    def _new_rows(self, new_articles: List[Article], header: List[str]) -> List[List[str]]:
+        """新規記事を出力列の並びの行に変換し、公開日の降順にソート"""
+        new_rows = []
+        for article in new_articles:
+            row = article_to_row(article, 0)
+            new_rows.append([self._text(row.get(column, '')) for column in header])
+        date_index = header.index('公開日')
+        new_rows.sort(key=lambda row: publish_key(row[date_index]), reverse=True)
+        return new_rows
+    
+    def _write_numbered(self, rows: Iterator[List[str]], header: List[str], date_index: int,
+                        dated_total: int, output_path: str) -> int:
+        """番号を振りながら一時ファイルに書き出し、置き換える（マニフェストも同時に作成）"""
+        number_index = header.index('番号')
+        temp_path = f"{output_path}.tmp"
+        
+        def numbered_batches(writer) -> Iterator[pd.DataFrame]:
+            dated_seen = 0
+            undated_seen = 0
+            batch = []
+            for row in rows:
+                if row[date_index]:
+                    row[number_index] = str(dated_total - dated_seen)
+                    dated_seen += 1
+                else:
+                    undated_seen += 1
+                    row[number_index] = str(dated_total + undated_seen)
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    writer.writerows(batch)
+                    yield pd.DataFrame(batch, columns=header)
+                    batch = []
+            if batch:
+                writer.writerows(batch)
+                yield pd.DataFrame(batch, columns=header)
+        
+        with open(temp_path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator=os.linesep)
+            writer.writerow(header)
+            manifest = CSVManifest(output_path)
+            # マニフェストは書き出したバッチから作る（書き出し後にCSVを読み直さない）
+            data = manifest.collect(numbered_batches(writer))
+            f.flush()
+            os.fsync(f.fileno())
+        
+        os.replace(temp_path, output_path)
+        manifest.save(data)
+        return data['row_count']
+    
+    def _make_sorted_runs(self, csv_path: str, output_width: int, date_index: int,
+                          temp_dir: str) -> List[Iterator[List[str]]]:
+        """既存CSVを run_size 行ずつ降順ソートして一時ランファイルに書き出す"""
+        run_paths = []
+        rows = self._iter_rows(csv_path, output_width)
+        while True:
+            chunk = [row for _, row in zip(range(self.run_size), rows)]
+            if not chunk:
+                break
+            chunk.sort(key=lambda row: publish_key(row[date_index]), reverse=True)
+            
+            run_path = os.path.join(temp_dir, f"run_{len(run_paths):05d}.csv")
+            with open(run_path, 'w', encoding='utf-8', newline='') as f:
+                csv.writer(f).writerows(chunk)
+            run_paths.append(run_path)
+        
+        return [self._iter_run(path) for path in run_paths]
+    
+    def _iter_rows(self, csv_path: str, output_width: int) -> Iterator[List[str]]:
+        """既存CSVのデータ行を1行ずつ返す（足りない列は空欄で補う）"""
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) < output_width:
+                    row.extend([''] * (output_width - len(row)))
+                yield row
+    
+    def _iter_run(self, path: str) -> Iterator[List[str]]:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            yield from csv.reader(f)
+    
+    def _read_header(self, csv_path: str) -> List[str]:
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            return next(csv.reader(f), [])
+    
+    def _is_sorted_desc(self, dates: np.ndarray) -> bool:
+        """公開日が降順（公開日なしは末尾）に並んでいるか"""
+        has_date = dates != ''
+        dated_count = int(np.count_nonzero(has_date))
+        if not has_date[:dated_count].all():
+            return False
+        dated = dates[:dated_count]
+        return bool((dated[:-1] >= dated[1:]).all()) if dated_count > 1 else True
+    
+    def _text(self, value) -> str:
+        if value is None or (isinstance(value, float) and pd.isna(value)):
+            return ''
+        return str(value)
@@ -0,0 +1,136 @@
+"""
+ストリーミングCSV出力モジュール
+記事を1件取得するごとにCSVへ追記し、最後にアトミックに確定する
+"""
+
+import asyncio
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import pandas as pd
+
+from .article import Article
+from .exporter import CSV_COLUMNS, article_to_row
+from .manifest import CSVManifest
+
+
+class StreamingCSVWriter:
+    """記事を逐次追記するCSVライター
+    
+    書き込み中は <filename>.partial に追記し、finalize() で本来のファイル名に
+    os.replace する。途中でクラッシュしても取得済みの行は .partial に残る。
+    ディスク書き込みは専用スレッドで行い、イベントループを止めない。
+    """
+    
+    def __init__(self, filename: str, flush_every: int = 1, fsync_every: int = 20,
+                 start_number: int = 1, quoting: int = csv.QUOTE_MINIMAL):
+        self.filename = filename
+        self.partial_path = f"{filename}.partial"
+        self.flush_every = max(1, flush_every)
+        self.fsync_every = max(1, fsync_every)
+        self.quoting = quoting
+        self.next_number = start_number
+        self.rows_written = 0
+        self._file = None
+        self._writer = None
+        # 書き込み順序を保つため1スレッドのみ
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='csv-sink')
+    
+    def open(self, append: bool = False) -> 'StreamingCSVWriter':
+        """.partial ファイルを開く（append=True なら既存の途中ファイルに追記）"""
+        directory = os.path.dirname(self.filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        resume = append and os.path.exists(self.partial_path) and os.path.getsize(self.partial_path) > 0
+        if resume:
+            existing_rows = self._count_rows(self.partial_path)
+            self.next_number += existing_rows
+            self.rows_written = existing_rows
+        
+        self._file = open(self.partial_path, 'a' if resume else 'w', encoding='utf-8-sig', newline='')
+        self._writer = csv.writer(self._file, quoting=self.quoting, lineterminator=os.linesep)
+        if not resume:
+            self._writer.writerow(CSV_COLUMNS)
+            self._file.flush()
+        return self
+    
+    async def write_article(self, article: Article):
+        """記事を1行追記（書き込みはスレッドで実行）"""
+        row = article_to_row(article, self.next_number)
+        self.next_number += 1
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._write_row, row)
+    
+    def _write_row(self, row: Dict):
+        """1行書き込み、一定件数ごとに flush / fsync"""
+        self._writer.writerow([row[column] for column in CSV_COLUMNS])
+        self.rows_written += 1
+        
+        if self.rows_written % self.flush_every == 0:
+            self._file.flush()
+        if self.rows_written % self.fsync_every == 0:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+    
+    async def finalize(self, sort_by_date: bool = False) -> Dict[str, any]:
+        """.partial を確定して本来のファイル名に置き換え"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, self._finalize, sort_by_date)
+        finally:
+            self._executor.shutdown(wait=True)
+    
+    def _finalize(self, sort_by_date: bool) -> Dict[str, any]:
+        self._close_file()
+        
+        if sort_by_date:
+            # 公開日順で番号を振り直し、最新記事を上にして書き出す
+            df = pd.read_csv(self.partial_path, encoding='utf-8-sig')
+            df = df.sort_values('公開日', ascending=True)
+            df['番号'] = range(1, len(df) + 1)
+            df = df.sort_values('公開日', ascending=False)
+            
+            temp_path = f"{self.filename}.tmp"
+            df.to_csv(temp_path, index=False, encoding='utf-8-sig', quoting=self.quoting)
+            self._fsync_path(temp_path)
+            os.replace(temp_path, self.filename)
+            os.remove(self.partial_path)
+            CSVManifest(self.filename).write_for_dataframe(df)
+        else:
+            os.replace(self.partial_path, self.filename)
+            CSVManifest(self.filename).build()
+        
+        file_size = os.path.getsize(self.filename)
+        file_size_mb = file_size / (1024 * 1024)
+        
+        return {
+            'filename': self.filename,
+            'article_count': self.rows_written,
+            'file_size_mb': round(file_size_mb, 1)
+        }
+    
+    async def close(self):
+        """確定せずに閉じる（.partial は再開用に残す）"""
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, self._close_file)
+        finally:
+            self._executor.shutdown(wait=True)
+    
+    def _close_file(self):
+        if self._file is not None and not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+    
+    def _fsync_path(self, path: str):
+        with open(path, 'rb') as f:
+            os.fsync(f.fileno())
+    
+    def _count_rows(self, path: str) -> int:
+        """途中ファイルのデータ行数を数える（本文の改行を考慮してCSVとして読む）"""
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            return max(0, sum(1 for _ in csv.reader(f)) - 1)
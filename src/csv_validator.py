@@ -0,0 +1,114 @@
+"""
+CSV検証モジュール
+記事CSVの内容を列単位（pandas の文字列演算）でまとめて検査し、機械可読なレポートを作る
+"""
+
+from typing import Dict, List
+
+import pandas as pd
+
+from .article import ERROR_TITLE_PREFIX
+from .dtypes import DATE_PATTERN, STRING_DTYPE
+from .exporter import CSV_COLUMNS
+from .url_differ import EXCLUDED_URL_FRAGMENTS, NOTE_ARTICLE_URL_PATTERN, normalize_urls
+
+
+# 検査項目（missing_url は URL列導入前の記事もあるため問題として扱わない）
+CHECKS = ['missing_url', 'invalid_url', 'duplicate_url', 'unparseable_date', 'error_row', 'empty_body']
+WARNING_CHECKS = {'missing_url'}
+
+
+def text_column(values: pd.Series) -> pd.Series:
+    """文字列型の列に変換（欠損値は空欄、Arrow文字列ならそのまま）"""
+    return values.astype(STRING_DTYPE).fillna('')
+
+
+class CSVValidator:
+    """記事CSVの健全性を検査するクラス
+    
+    行ごとのPythonループは使わず、列ごとの文字列演算で判定する。
+    レポートの rows はデータ行の位置（0始まり）で、各項目 sample_size 件まで。
+    """
+    
+    def __init__(self, base_url: str = "https://note.com", sample_size: int = 20):
+        self.base_url = base_url
+        self.sample_size = sample_size
+    
+    def validate(self, df: pd.DataFrame) -> Dict[str, any]:
+        """DataFrame（CSVの列構成）を検査してレポートを返す"""
+        flags = {}
+        row_count = len(df)
+        empty = pd.Series(False, index=df.index)
+        
+        if 'URL' in df.columns:
+            urls = text_column(df['URL'])
+            present = urls.str.strip() != ''
+            normalized = normalize_urls(urls, self.base_url)
+            shaped = normalized.str.match(NOTE_ARTICLE_URL_PATTERN)
+            for fragment in EXCLUDED_URL_FRAGMENTS:
+                shaped &= ~normalized.str.contains(fragment, regex=False)
+            flags['missing_url'] = ~present
+            flags['invalid_url'] = present & ~shaped.astype(bool)
+            flags['duplicate_url'] = present & normalized.where(present).duplicated()
+        else:
+            flags['missing_url'] = pd.Series(True, index=df.index)
+            flags['invalid_url'] = flags['duplicate_url'] = empty
+        
+        flags['unparseable_date'] = self._unparseable_dates(df['公開日']) if '公開日' in df.columns else empty
+        flags['error_row'] = (text_column(df['タイトル']).str.startswith(ERROR_TITLE_PREFIX)
+                              if 'タイトル' in df.columns else empty)
+        flags['empty_body'] = (text_column(df['本文']).str.fullmatch(r'\s*')
+                               if '本文' in df.columns else pd.Series(True, index=df.index))
+        
+        issues = {name: self._summarize(flags[name].astype(bool)) for name in CHECKS}
+        missing_columns = [column for column in CSV_COLUMNS if column not in df.columns]
+        return {
+            'valid': not missing_columns and all(
+                issues[name]['count'] == 0 for name in CHECKS if name not in WARNING_CHECKS
+            ),
+            'row_count': row_count,
+            'missing_columns': missing_columns,
+            'issues': issues
+        }
+    
+    def _unparseable_dates(self, dates: pd.Series) -> pd.Series:
+        """空欄でなく日時として解析できない公開日"""
+        text = text_column(dates)
+        present = text.str.strip() != ''
+        # ISO形式はタイムゾーン部分を形式チェックのみにして一括解析し（オフセット付きの解析は遅い）、
+        # 解析できなかったものだけ形式を推定して解析し直す
+        shaped = text.str.match(DATE_PATTERN.pattern)
+        local = text.where(shaped).str.replace(r'(?:Z|[+-]\d{2}:?\d{2})$', '', regex=True)
+        parsed = pd.to_datetime(local, errors='coerce', format='ISO8601')
+        failed = present & parsed.isna()
+        if failed.any():
+            retried = pd.to_datetime(text[failed], errors='coerce', format='mixed', utc=True)
+            failed.loc[retried.index] = retried.isna()
+        return failed
+    
+    def _summarize(self, flag: pd.Series) -> Dict[str, any]:
+        positions = flag.to_numpy().nonzero()[0]
+        return {
+            'count': int(len(positions)),
+            'rows': positions[:self.sample_size].tolist()
+        }
+    
+    @staticmethod
+    def describe(report: Dict[str, any]) -> List[str]:
+        """レポートを表示用の行に変換"""
+        labels = {
+            'missing_url': 'URLなし',
+            'invalid_url': '記事URLの形式ではない',
+            'duplicate_url': 'URL重複',
+            'unparseable_date': '公開日を解析できない',
+            'error_row': 'エラー記事',
+            'empty_body': '本文が空'
+        }
+        lines = []
+        if report['missing_columns']:
+            lines.append(f"列がありません: {', '.join(report['missing_columns'])}")
+        for name in CHECKS:
+            issue = report['issues'][name]
+            if issue['count']:
+                lines.append(f"{labels[name]}: {issue['count']}件 (行: {issue['rows'][:5]})")
+        return lines
@@ -0,0 +1,139 @@
+"""
+列型モジュール
+読み込んだ記事データの列を省メモリな型（カテゴリ・日時・int32・Arrow文字列）に変換し、CSVに戻す
+"""
+
+import re
+import warnings
+from importlib.util import find_spec
+from typing import Dict, Optional
+
+import pandas as pd
+
+
+# pyarrow があれば Arrow 形式の文字列（1値ごとのPythonオブジェクトを作らない）
+STRING_DTYPE = pd.StringDtype('pyarrow' if find_spec('pyarrow') else 'python')
+
+STRING_COLUMNS = ['タイトル', '本文', 'URL']
+CATEGORY_COLUMNS = ['価格', '購入状況']
+
+# 公開日の表記（日付・区切り文字・秒・小数秒・タイムゾーン）
+DATE_PATTERN = re.compile(
+    r'^\d{4}-\d{2}-\d{2}(?:(?P<sep>[T ])\d{2}:\d{2}(?P<seconds>:\d{2})?'
+    r'(?:\.(?P<fraction>\d{3}|\d{6}))?(?P<tz>Z|[+-]\d{2}:?\d{2})?)?$'
+)
+
+
+class DateFormat:
+    """公開日の文字列表記（日時型にした列を元と同じ文字列に戻すために使う）"""
+    
+    __slots__ = ('strftime', 'fraction_digits', 'tz')
+    
+    def __init__(self, strftime: str, fraction_digits: int = 0, tz: str = ''):
+        self.strftime = strftime
+        self.fraction_digits = fraction_digits
+        self.tz = tz
+    
+    @classmethod
+    def detect(cls, sample: str) -> Optional['DateFormat']:
+        """1件の公開日から表記を推定（対応していない表記なら None）"""
+        match = DATE_PATTERN.match(sample)
+        if match is None:
+            return None
+        
+        strftime = '%Y-%m-%d'
+        if match.group('sep'):
+            strftime += match.group('sep') + '%H:%M'
+            if match.group('seconds'):
+                strftime += ':%S'
+        
+        tz = match.group('tz') or ''
+        if tz and tz != 'Z':
+            tz = ':' if ':' in tz else '%z'
+        return cls(strftime, len(match.group('fraction') or ''), tz)
+    
+    def format(self, dates: pd.Series) -> pd.Series:
+        """日時型の列を文字列に変換（NaT は空欄）"""
+        text = dates.dt.strftime(self.strftime)
+        if self.fraction_digits:
+            fraction = (dates.dt.microsecond // 10 ** (6 - self.fraction_digits)).astype('Int64')
+            text = text + '.' + fraction.astype(str).str.zfill(self.fraction_digits)
+        if self.tz == 'Z':
+            text = text + 'Z'
+        elif self.tz:
+            offset = dates.dt.strftime('%z')
+            text = text + (offset.str[:3] + ':' + offset.str[3:] if self.tz == ':' else offset)
+        return text.where(dates.notna(), '').astype(object)
+
+
+def parse_dates(values: pd.Series) -> Optional[pd.Series]:
+    """公開日の文字列を日時型に変換
+    
+    全件が同じ表記で、文字列に戻したときに元の値と一致する場合のみ変換する
+    （一致しない・タイムゾーンが混在する場合は None）。
+    変換後の列の attrs['date_format'] に表記を記録する。
+    """
+    text = values.astype(object).where(values.notna(), '').astype(str)
+    present = text != ''
+    if not present.any():
+        return None
+    
+    date_format = DateFormat.detect(text[present].iloc[0])
+    if date_format is None:
+        return None
+    try:
+        with warnings.catch_warnings():
+            # タイムゾーンが混在する場合の FutureWarning は変換しないので不要
+            warnings.simplefilter('ignore', FutureWarning)
+            dates = pd.to_datetime(text.where(present), format='ISO8601')
+    except (ValueError, TypeError):
+        return None
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        return None
+    if not (date_format.format(dates) == text).all():
+        return None
+    
+    dates.attrs['date_format'] = date_format
+    return dates
+
+
+def apply_article_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """記事データの列を省メモリな型に変換（存在する列のみ）
+    
+    価格・購入状況はカテゴリ、公開日は日時型（元の表記に戻せない場合は文字列）、
+    番号は int32（欠損があれば Int32）、タイトル・本文・URLは文字列型にする。
+    """
+    columns = {}
+    if '番号' in df.columns:
+        numbers = pd.to_numeric(df['番号'], errors='coerce')
+        columns['番号'] = numbers.astype('int32' if numbers.notna().all() else 'Int32')
+    if '公開日' in df.columns:
+        dates = df['公開日']
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            dates = parse_dates(dates)
+        columns['公開日'] = dates if dates is not None else df['公開日'].astype(STRING_DTYPE)
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            columns[column] = df[column].astype('category')
+    for column in STRING_COLUMNS:
+        if column in df.columns:
+            columns[column] = df[column].astype(STRING_DTYPE)
+    
+    typed = df.assign(**columns)
+    if '公開日' in columns and 'date_format' in columns['公開日'].attrs:
+        typed.attrs['date_format'] = columns['公開日'].attrs['date_format']
+    return typed
+
+
+def frame_for_csv(df: pd.DataFrame) -> pd.DataFrame:
+    """型を変換したDataFrameをCSVに書き出せる形に戻す（公開日は読み込み時と同じ表記）"""
+    if '公開日' not in df.columns or not pd.api.types.is_datetime64_any_dtype(df['公開日']):
+        return df
+    date_format = df.attrs.get('date_format') or DateFormat('%Y-%m-%d %H:%M:%S')
+    return df.assign(公開日=date_format.format(df['公開日']))
+
+
+def memory_usage_by_column(df: pd.DataFrame) -> Dict[str, int]:
+    """列ごとのメモリ使用量（バイト、文字列の中身を含む）"""
+    usage = df.memory_usage(index=False, deep=True)
+    return {column: int(usage[column]) for column in df.columns}
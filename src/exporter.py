@@ -3,30 +3,38 @@ CSV出力モジュール
 """
 
 import os
-from typing import List, Dict
+from typing import List, Dict, Union
 import pandas as pd
 
+from .article import Article
+from .manifest import CSVManifest
+
+
+# CSVの列順（既存データと共通）
+CSV_COLUMNS = ['番号', '公開日', 'タイトル', '本文', '価格', '購入状況', 'URL']
+
+
+def article_to_row(article: Union[Article, Dict], number: int) -> Dict[str, any]:
+    """記事情報をCSVの1行に変換"""
+    return Article.coerce(article).to_row(number)
+
+
+def row_to_article(row: Dict[str, any]) -> Article:
+    """CSVの1行を記事情報に戻す（article_to_row の逆変換、番号は number に入れる）"""
+    return Article.from_row(row)
+
 
 class CSVExporter:
     """CSV出力を処理するクラス"""
     
-    def save_to_csv(self, articles: List[Dict], filename: str) -> Dict[str, any]:
+    def save_to_csv(self, articles: List[Article], filename: str) -> Dict[str, any]:
         """CSVファイルに保存"""
         # DataFrameに変換
-        df_data = []
-        for i, article in enumerate(articles, 1):
-            df_data.append({
-                '番号': i,
-                '公開日': article.get('date', ''),
-                'タイトル': article.get('title', ''),
-                '本文': article.get('content', ''),
-                '価格': article.get('price', ''),
-                '購入状況': article.get('purchase_status', ''),
-                'URL': article.get('url', '')
-            })
+        df_data = [article_to_row(article, i) for i, article in enumerate(articles, 1)]
         
-        df = pd.DataFrame(df_data)
+        df = pd.DataFrame(df_data, columns=CSV_COLUMNS)
         df.to_csv(filename, index=False, encoding='utf-8-sig')
+        CSVManifest(filename).write_for_dataframe(df)
         
         # ファイル情報を返す
         file_size = os.path.getsize(filename)
@@ -36,4 +44,18 @@ class CSVExporter:
             'filename': filename,
             'article_count': len(articles),
             'file_size_mb': round(file_size_mb, 1)
-        }
\ No newline at end of file
+        }
+    
+    def save_to_parquet(self, articles: List[Article], path: str) -> Dict[str, any]:
+        """Parquetデータセットに保存（pyarrow が必要）"""
+        from .parquet_store import ParquetCorpus
+        
+        df_data = [article_to_row(article, i) for i, article in enumerate(articles, 1)]
+        df = pd.DataFrame(df_data, columns=CSV_COLUMNS)
+        return ParquetCorpus(path).write(df)
+    
+    def open_stream(self, filename: str, resume: bool = False, **options):
+        """記事を1件ずつ追記するストリーミング出力を開く（StreamingCSVWriter）"""
+        from .csv_sink import StreamingCSVWriter
+        
+        return StreamingCSVWriter(filename, **options).open(append=resume)
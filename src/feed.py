@@ -0,0 +1,127 @@
+"""
+RSSフィードモジュール
+クリエイターのRSS（<プロフィールURL>/rss）を条件付きGETで取得し、ブラウザを使わずに新規記事を特定する
+"""
+
+import asyncio
+import json
+import os
+import urllib.error
+import urllib.request
+import xml.etree.ElementTree as ET
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from .listing import known_flags
+from .url_differ import URLDiffer
+from .url_index import URLIndex
+
+
+FEED_STATE_VERSION = 1
+
+
+async def fetch_conditional(url: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+    """条件付きGET（ステータス・レスポンスヘッダー・本文を返す。304 は本文なし）"""
+    def fetch():
+        request = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0', **headers})
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, dict(response.headers), response.read()
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return 304, dict(e.headers), b''
+            raise
+    return await asyncio.to_thread(fetch)
+
+
+def parse_feed(xml_bytes: bytes) -> List[Dict[str, str]]:
+    """RSS 2.0 の item を新しい順のまま取り出す（url・title・date）"""
+    root = ET.fromstring(xml_bytes)
+    return [
+        {
+            'url': (item.findtext('link') or '').strip(),
+            'title': (item.findtext('title') or '').strip(),
+            'date': (item.findtext('pubDate') or '').strip()
+        }
+        for item in root.iter('item')
+    ]
+
+
+class RSSFeed:
+    """クリエイターのRSSフィード
+    
+    ETag / Last-Modified と前回の item を状態ファイル（既定では既存CSVの横の <csv>.rss.json）に保存し、
+    次回は条件付きGETで取得する（304 なら前回の item をそのまま使う）。
+    """
+    
+    def __init__(self, profile_url: str, state_path: Optional[str] = None,
+                 fetch: Callable[[str, Dict[str, str]], Awaitable[Tuple[int, Dict[str, str], bytes]]] = fetch_conditional,
+                 base_url: str = "https://note.com"):
+        self.feed_url = f"{profile_url.rstrip('/')}/rss"
+        self.state_path = state_path
+        self.fetch = fetch
+        self.url_differ = URLDiffer(base_url)
+    
+    async def items(self) -> Dict[str, any]:
+        """フィードの item を取得（not_modified=True なら前回保存した item）"""
+        state = self._load_state()
+        headers = {}
+        if state.get('etag'):
+            headers['If-None-Match'] = state['etag']
+        if state.get('last_modified'):
+            headers['If-Modified-Since'] = state['last_modified']
+        
+        status, response_headers, body = await self.fetch(self.feed_url, headers)
+        if status == 304 and 'items' in state:
+            return {'items': state['items'], 'not_modified': True}
+        
+        items = parse_feed(body)
+        response_headers = {key.lower(): value for key, value in response_headers.items()}
+        self._save_state({
+            'version': FEED_STATE_VERSION,
+            'feed_url': self.feed_url,
+            'etag': response_headers.get('etag'),
+            'last_modified': response_headers.get('last-modified'),
+            'items': items
+        })
+        return {'items': items, 'not_modified': False}
+    
+    async def check(self, existing_urls: Union[Set[str], URLIndex]) -> Dict[str, any]:
+        """フィードだけで新規記事を特定できるか判定
+        
+        フィードは最新の一部の記事しか含まないため、最も古い item が既知の場合だけ
+        「フィードより前に未取得の記事はない」とみなして covered=True にする。
+        """
+        fetched = await self.items()
+        urls = []
+        for item in fetched['items']:
+            url = self.url_differ._normalize_url(item['url'])
+            if self.url_differ._is_valid_note_article_url(url) and url not in urls:
+                urls.append(url)
+        
+        known = known_flags(existing_urls, urls)
+        return {
+            'new_urls': [url for url, is_known in zip(urls, known) if not is_known],
+            'item_count': len(urls),
+            'covered': bool(known) and known[-1],
+            'not_modified': fetched['not_modified']
+        }
+    
+    def _load_state(self) -> Dict[str, any]:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if state.get('version') != FEED_STATE_VERSION or state.get('feed_url') != self.feed_url:
+            return {}
+        return state
+    
+    def _save_state(self, state: Dict[str, any]):
+        if not self.state_path:
+            return
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(temp_path, self.state_path)
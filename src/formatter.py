@@ -3,72 +3,191 @@
 完成データ品質の本文フォーマットを実装
 """
 
-from typing import List
+from typing import List, Optional
 from bs4 import BeautifulSoup
+from bs4.element import NavigableString, Tag
 from urllib.parse import urlparse
 
+from .blocks import (
+    Block, TextBlock, ParagraphBlock, HeadingBlock, QuoteBlock, RuleBlock,
+    ImageBlock, BannerBlock, EmbedBlock, ListBlock
+)
+from .renderers import MarkdownRenderer, get_renderer
+
+
+# 高速パスで扱える単純タグ（これ以外を含む本文は汎用パスで処理）
+SIMPLE_TAGS = frozenset(['p', 'br', 'strong', 'b', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+HEADING_TAGS = frozenset(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+
+
+class _NotSimpleContent(Exception):
+    """高速パスの対象外の要素を検出した場合の内部例外"""
+
 
 class ContentFormatter:
-    """コンテンツをフォーマットするクラス"""
+    """コンテンツをフォーマットするクラス
+    
+    本文はまずブロック列（src.blocks）に抽出し、レンダラーで各形式に変換する。
+    CSVの本文列は MarkdownRenderer の出力。
+    """
+    
+    def __init__(self, fast_path: bool = True):
+        # p/br/strong/見出しのみの本文を専用変換で処理する高速パス
+        self.fast_path = fast_path
+        self.renderer = MarkdownRenderer()
     
     def extract_formatted_content(self, soup: BeautifulSoup) -> str:
         """完成データ品質の本文フォーマット抽出"""
-        content_parts = []
-        
+        return self.renderer.render(self.extract_blocks(soup))
+    
+    def extract_blocks(self, soup: BeautifulSoup) -> List[Block]:
+        """本文をブロック列として抽出"""
         # メインの記事コンテンツを取得
         article_body = soup.find('div', class_='note-common-styles__textnote-body')
         if not article_body:
             article_body = soup.find('div', class_='note-common-styles__textnote-body-container')
         
-        if article_body:
-            content_parts = self._process_content_elements(article_body)
+        if not article_body:
+            return []
+        
+        simple_blocks = self._process_simple_content(article_body) if self.fast_path else None
+        if simple_blocks is not None:
+            return simple_blocks
+        return self._process_content_elements(article_body)
+    
+    def render_blocks(self, blocks: List[Block], output_format: str = 'markdown') -> str:
+        """ブロック列を指定形式（markdown/text/html/json）に変換"""
+        if output_format == 'markdown':
+            return self.renderer.render(blocks)
+        return get_renderer(output_format).render(blocks)
+    
+    def _process_simple_content(self, element) -> Optional[List[Block]]:
+        """単純タグのみの本文を文字列操作で変換（対象外ならNoneで汎用パスへ）
         
-        # 改行で結合（普通の改行）
-        return '\n'.join(content_parts)
+        判定は変換と同じ1回の走査で行い、単純タグ以外の要素やコメントを
+        見つけた時点で打ち切る。出力は汎用パスと完全に一致する。
+        """
+        try:
+            return self._convert_simple_elements(element)
+        except _NotSimpleContent:
+            return None
     
-    def _process_content_elements(self, element) -> List[str]:
-        """コンテンツ要素を処理して完成データ形式に変換"""
-        parts = []
+    def _convert_simple_elements(self, element) -> List[Block]:
+        """単純タグのみの本文を変換（_process_content_elements と同じ出力）"""
+        blocks = []
+        append = blocks.append
+        
+        for child in element.contents:
+            child_type = type(child)
+            if child_type is NavigableString:
+                text = child.strip()
+                if text:
+                    append(TextBlock(text))
+                continue
+            if child_type is not Tag:
+                raise _NotSimpleContent()
+            
+            name = child.name
+            if name == 'p':
+                spans = []
+                for node in child.contents:
+                    node_type = type(node)
+                    if node_type is NavigableString:
+                        text = node.strip()
+                        if text:
+                            spans.append(('text', text))
+                        continue
+                    if node_type is not Tag:
+                        raise _NotSimpleContent()
+                    
+                    node_name = node.name
+                    if node_name == 'br':
+                        if node.contents:
+                            raise _NotSimpleContent()
+                        spans.append(('br',))
+                    elif node_name == 'strong' or node_name == 'b':
+                        text = self._simple_text(node)
+                        if text:
+                            spans.append(('strong', text))
+                    elif node_name in SIMPLE_TAGS:
+                        text = self._simple_text(node)
+                        if text:
+                            spans.append(('text', text))
+                    else:
+                        raise _NotSimpleContent()
+                
+                if spans:
+                    append(ParagraphBlock(spans))
+            
+            elif name in HEADING_TAGS:
+                heading_text = self._simple_text(child)
+                if heading_text:
+                    append(HeadingBlock(heading_text, int(name[1])))
+            
+            elif name in SIMPLE_TAGS:
+                # 直下のbr/strongは汎用パスでも出力されない（中身の検査のみ）
+                self._simple_text(child)
+            
+            else:
+                raise _NotSimpleContent()
+        
+        return blocks
+    
+    def _simple_text(self, element) -> str:
+        """単純タグのみの要素のテキストを取得（get_text(strip=True) 相当）"""
+        texts = []
+        for node in element.contents:
+            node_type = type(node)
+            if node_type is NavigableString:
+                text = node.strip()
+                if text:
+                    texts.append(text)
+            elif node_type is Tag and node.name in SIMPLE_TAGS:
+                text = self._simple_text(node)
+                if text:
+                    texts.append(text)
+            else:
+                raise _NotSimpleContent()
+        return ''.join(texts)
+    
+    def _process_content_elements(self, element) -> List[Block]:
+        """コンテンツ要素を処理してブロック列に変換"""
+        blocks = []
         
         for child in element.children:
             if child.name is None:  # テキストノード
                 text = child.strip()
                 if text:
-                    parts.append(text)
+                    blocks.append(TextBlock(text))
             
             elif child.name == 'p':
                 # パラグラフ
-                p_content = self._process_paragraph(child)
-                if p_content:
-                    parts.append(p_content)
-                    parts.append('')  # 空行
+                spans = self._paragraph_spans(child)
+                if spans:
+                    blocks.append(ParagraphBlock(spans))
             
             elif child.name in ['h1', 'h2', 'h3', 'h4', 'h5', 'h6']:
                 # 見出し
                 heading_text = child.get_text(strip=True)
                 if heading_text:
-                    parts.append(f"**{heading_text}**")
-                    parts.append('')
+                    blocks.append(HeadingBlock(heading_text, int(child.name[1])))
             
             elif child.name == 'blockquote':
                 # 引用
                 quote_text = child.get_text(strip=True)
                 if quote_text:
-                    parts.append(f"> {quote_text}")
-                    parts.append('')
+                    blocks.append(QuoteBlock(quote_text))
             
             elif child.name == 'hr':
                 # 区切り線
-                parts.append('====')
-                parts.append('')
+                blocks.append(RuleBlock())
             
             elif child.name == 'img':
                 # 画像
                 img_src = child.get('src', '')
                 img_alt = child.get('alt', '画像')
                 if img_src:
-                    parts.append(f"![{img_alt}]({img_src})")
-                    parts.append('')
+                    blocks.append(ImageBlock(img_src, img_alt))
             
             elif child.name == 'figure':
                 # 図表（画像含む）または埋め込みバナー
@@ -78,10 +197,9 @@ class ContentFormatter:
                     # Noteの外部記事埋め込み（バナー）
                     embed_container = child.find('div', attrs={'data-name': 'embedContainer'})
                     if embed_container:
-                        banner_content = self._process_embed_content(embed_container)
-                        if banner_content:
-                            parts.append(banner_content)
-                            parts.append('')
+                        banner_block = self._process_embed_content(embed_container)
+                        if banner_block:
+                            blocks.append(banner_block)
                             continue
                 
                 # 通常の画像処理
@@ -92,85 +210,75 @@ class ContentFormatter:
                     img_src = img.get('src', '')
                     img_alt = img.get('alt', '画像')
                     if img_src:
-                        parts.append(f"![{img_alt}]({img_src})")
-                        if figcaption:
-                            caption_text = figcaption.get_text(strip=True)
-                            parts.append(f"*{caption_text}*")
-                        parts.append('')
+                        caption_text = figcaption.get_text(strip=True) if figcaption else None
+                        blocks.append(ImageBlock(img_src, img_alt, caption_text))
             
             elif child.name == 'div':
                 # 埋め込みコンテンツ・バナー
-                embed_content = self._process_embed_content(child)
-                if embed_content:
-                    parts.append(embed_content)
-                    parts.append('')
+                embed_block = self._process_embed_content(child)
+                if embed_block:
+                    blocks.append(embed_block)
             
             elif child.name == 'a':
                 # 直接のリンク・バナー
-                link_content = self._process_link_banner(child)
-                if link_content:
-                    parts.append(link_content)
-                    parts.append('')
+                link_block = self._process_link_banner(child)
+                if link_block:
+                    blocks.append(link_block)
             
             elif child.name == 'ul' or child.name == 'ol':
                 # リスト
                 list_items = child.find_all('li')
-                for li in list_items:
-                    li_text = li.get_text(strip=True)
-                    if li_text:
-                        prefix = '- ' if child.name == 'ul' else '1. '
-                        parts.append(f"{prefix}{li_text}")
-                parts.append('')
+                items = [li.get_text(strip=True) for li in list_items]
+                blocks.append(ListBlock([item for item in items if item], ordered=child.name == 'ol'))
         
-        return parts
+        return blocks
     
     def _process_paragraph(self, p_element) -> str:
         """パラグラフを処理"""
-        text_parts = []
+        return self.renderer.render_spans(self._paragraph_spans(p_element))
+    
+    def _paragraph_spans(self, p_element) -> List[tuple]:
+        """パラグラフをインライン要素のタプル列に変換"""
+        spans = []
         
         for child in p_element.children:
             if child.name is None:  # テキストノード
                 text = child.strip()
                 if text:
-                    text_parts.append(text)
+                    spans.append(('text', text))
             
             elif child.name == 'strong' or child.name == 'b':
                 # 太字
                 strong_text = child.get_text(strip=True)
                 if strong_text:
-                    text_parts.append(f"**{strong_text}**")
+                    spans.append(('strong', strong_text))
             
             elif child.name == 'em' or child.name == 'i':
                 # 斜体
                 em_text = child.get_text(strip=True)
                 if em_text:
-                    text_parts.append(f"*{em_text}*")
+                    spans.append(('em', em_text))
             
             elif child.name == 'a':
                 # リンク
                 link_text = child.get_text(strip=True)
                 link_href = child.get('href', '')
-                if link_text and link_href:
-                    text_parts.append(f"[{link_text}]({link_href})")
-                elif link_href:
-                    text_parts.append(f"[{link_href}]({link_href})")
+                if link_href:
+                    spans.append(('link', link_text, link_href))
             
             elif child.name == 'br':
                 # 改行
-                text_parts.append('')
+                spans.append(('br',))
             
             else:
                 # その他の要素
                 other_text = child.get_text(strip=True)
                 if other_text:
-                    text_parts.append(other_text)
+                    spans.append(('text', other_text))
         
-        result = ''.join(text_parts)
-        # 「→」記号を除去
-        result = result.replace('→', '')
-        return result
+        return spans
     
-    def _process_embed_content(self, div_element) -> str:
+    def _process_embed_content(self, div_element) -> Optional[Block]:
         """埋め込みコンテンツ・バナーを処理"""
         # 複数のパターンでバナー・埋め込みを検出
         
@@ -203,7 +311,7 @@ class ContentFormatter:
                 if service == 'external-article':
                     return banner_info
                 else:
-                    return f"[{service}埋め込み: {banner_info}]"
+                    return EmbedBlock(f"{service}埋め込み", banner=banner_info)
         
         # パターン4: リンク付きdiv（一般）
         embed_link = div_element.find('a')
@@ -216,20 +324,20 @@ class ContentFormatter:
             iframe_src = iframe.get('src', '')
             if iframe_src:
                 if 'youtube.com' in iframe_src or 'youtu.be' in iframe_src:
-                    return f"[YouTube埋め込み]({iframe_src})"
+                    return EmbedBlock("YouTube埋め込み", iframe_src)
                 elif 'twitter.com' in iframe_src or 'x.com' in iframe_src:
-                    return f"[Twitter埋め込み]({iframe_src})"
+                    return EmbedBlock("Twitter埋め込み", iframe_src)
                 else:
-                    return f"[埋め込みコンテンツ]({iframe_src})"
+                    return EmbedBlock("埋め込みコンテンツ", iframe_src)
         
         # パターン3: data属性付きdiv（特殊埋め込み）
         if div_element.get('data-href') or div_element.get('data-url'):
             data_url = div_element.get('data-href') or div_element.get('data-url')
             text_content = div_element.get_text(strip=True)
             if text_content:
-                return f"[バナー: {text_content}]({data_url})"
+                return BannerBlock("バナー", data_url, text_content)
             else:
-                return f"[埋め込みリンク]({data_url})"
+                return BannerBlock("埋め込みリンク", data_url)
         
         # パターン4: 画像付きdiv（バナーの可能性）
         img = div_element.find('img')
@@ -244,32 +352,32 @@ class ContentFormatter:
                 link_href = parent_link.get('href', '')
                 if link_href:
                     if text_content:
-                        return f"[バナー: {text_content}]({link_href})"
+                        return BannerBlock("バナー", link_href, text_content)
                     elif img_alt:
-                        return f"[画像バナー: {img_alt}]({link_href})"
+                        return BannerBlock("画像バナー", link_href, img_alt)
                     else:
-                        return f"[画像バナー]({link_href})"
+                        return BannerBlock("画像バナー", link_href)
             
             # 画像のみの場合
             if img_src:
                 if text_content:
-                    return f"[画像: {text_content}]({img_src})"
+                    return BannerBlock("画像", img_src, text_content)
                 elif img_alt:
-                    return f"[画像: {img_alt}]({img_src})"
+                    return BannerBlock("画像", img_src, img_alt)
                 else:
-                    return f"[画像]({img_src})"
+                    return BannerBlock("画像", img_src)
         
-        return ''
+        return None
     
-    def _process_link_banner(self, a_element) -> str:
+    def _process_link_banner(self, a_element) -> Optional[BannerBlock]:
         """直接のリンク・バナーを処理"""
         return self._extract_banner_info(a_element)
     
-    def _extract_banner_info(self, link_element) -> str:
+    def _extract_banner_info(self, link_element) -> Optional[BannerBlock]:
         """リンク要素からバナー情報を抽出"""
         href = link_element.get('href', '')
         if not href:
-            return ''
+            return None
         
         # タイトル取得（優先順位順）
         title_elem = (link_element.find('h3') or 
@@ -299,31 +407,28 @@ class ContentFormatter:
         if img_elem and (title or img_alt):
             # 画像付きバナー
             banner_title = title or img_alt
-            if desc:
-                return f"[画像バナー: {banner_title} - {desc}]({href})"
-            else:
-                return f"[画像バナー: {banner_title}]({href})"
+            return BannerBlock("画像バナー", href, banner_title, desc)
         
         elif title and desc:
             # 完全なバナー情報
-            return f"[バナー: {title} - {desc}]({href})"
+            return BannerBlock("バナー", href, title, desc)
         
         elif title:
             # タイトルのみ
-            return f"[バナー: {title}]({href})"
+            return BannerBlock("バナー", href, title)
         
         elif img_alt:
             # 画像のみ
-            return f"[画像バナー: {img_alt}]({href})"
+            return BannerBlock("画像バナー", href, img_alt)
         
         elif domain:
             # ドメインのみ
             full_text = link_element.get_text(strip=True)
             if full_text and len(full_text) < 100:  # 短いテキストの場合
-                return f"[リンク: {full_text}]({href})"
+                return BannerBlock("リンク", href, full_text)
             else:
-                return f"[リンク: {domain}]({href})"
+                return BannerBlock("リンク", href, domain)
         
         else:
             # 最低限の情報
-            return f"[リンク]({href})"
\ No newline at end of file
+            return BannerBlock("リンク", href)
\ No newline at end of file
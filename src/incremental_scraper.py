@@ -4,76 +4,190 @@
 """
 
 import asyncio
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Optional, Union
 from bs4 import BeautifulSoup
 
+from .article import Article
 from .browser import BrowserManager
 from .collector import ArticleCollector
 from .formatter import ContentFormatter
+from .journal import CheckpointJournal
+from .listing import BrowserListing, KnownBoundary, NoteAPIListing
+from .prefetch import ArticlePrefetcher, RateLimiter, sequential_interval
+from .url_index import URLIndex
 
 
 class IncrementalScraper:
     """新規記事のみを効率的にスクレイピングするクラス"""
     
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, prefetch_depth: int = 0):
         self.browser_manager = BrowserManager(headless)
+        # 1以上なら次の記事を prefetch_depth 件先まで別タブで開いておく
+        self.prefetch_depth = prefetch_depth
         self.collector = ArticleCollector()
         self.formatter = ContentFormatter()
+        # ブラウザセッション（async with の間は各処理で同じブラウザを使い続ける）
+        self._session_depth = 0
+        self.launch_count = 0
+        self.reuse_count = 0
+        self.startup_seconds = 0.0
+    
+    async def __aenter__(self) -> 'IncrementalScraper':
+        self.begin_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.end_session()
+    
+    def begin_session(self):
+        """ブラウザセッションを開始（ブラウザは最初に必要になった処理で起動する）"""
+        if self._session_depth == 0:
+            self.launch_count = self.reuse_count = 0
+            self.startup_seconds = 0.0
+            self.browser_manager.crash_count = 0
+            self.browser_manager.recovery_seconds = 0.0
+        self._session_depth += 1
+    
+    async def end_session(self) -> Dict[str, any]:
+        """ブラウザセッションを終了してブラウザを閉じ、起動回数を返す"""
+        self._session_depth = max(0, self._session_depth - 1)
+        stats = self.session_stats()
+        if self._session_depth == 0:
+            await self.browser_manager.close()
+            if self.launch_count:
+                print(f"🧭 ブラウザ起動: {stats['launch_count']}回（再利用 {stats['reuse_count']}回、"
+                      f"起動時間 約{stats['saved_seconds']}秒を節約）")
+            if stats['crash_count']:
+                print(f"💥 ブラウザのクラッシュ: {stats['crash_count']}回（復旧 {stats['recovery_seconds']}秒）")
+        return stats
+    
+    def session_stats(self) -> Dict[str, any]:
+        """起動回数・再利用回数と、再利用で省いた起動時間の見積もり（起動1回の平均 × 再利用回数）、クラッシュからの復旧"""
+        average = self.startup_seconds / self.launch_count if self.launch_count else 0.0
+        return {
+            'launch_count': self.launch_count,
+            'reuse_count': self.reuse_count,
+            'startup_seconds': round(self.startup_seconds, 1),
+            'saved_seconds': round(average * self.reuse_count, 1),
+            **self.browser_manager.recovery_stats()
+        }
+    
+    async def open_browser(self) -> bool:
+        """処理の開始時にブラウザを用意（起動済みなら再利用。処理の終了時に閉じるべきなら True）"""
+        if self.browser_manager.page is not None:
+            self.reuse_count += 1
+            return False
+        try:
+            await self.browser_manager.initialize()
+        except BaseException:
+            # 起動途中で失敗しても Playwright ランタイムの参照を残さない
+            await self.browser_manager.close()
+            raise
+        self.launch_count += 1
+        self.startup_seconds += self.browser_manager.startup_seconds
+        return self._session_depth == 0
+    
+    async def release_browser(self, owns_browser: bool):
+        """open_browser で起動したブラウザを閉じる（セッション中は閉じない）"""
+        if owns_browser:
+            await self.browser_manager.close()
         
-    async def scrape_new_articles_only(self, new_urls: List[str]) -> List[Dict]:
-        """新規記事URLのみをスクレイピング"""
+    async def scrape_new_articles_only(self, new_urls: List[str],
+                                       journal: Optional[CheckpointJournal] = None) -> List[Article]:
+        """新規記事URLのみをスクレイピング（journal があれば取得済み記事を再利用・記録）"""
         if not new_urls:
             print("📝 新規記事がありません")
             return []
         
+        completed = journal.completed if journal else {}
+        pending_count = sum(1 for url in new_urls if url not in completed)
         print(f"🚀 新規記事のスクレイピング開始: {len(new_urls)}件")
+        if completed:
+            print(f"♻️  取得済み {len(new_urls) - pending_count}件はジャーナルから再利用します")
+        
+        if pending_count == 0:
+            return [completed[url] for url in new_urls]
         
+        # ブラウザを用意（セッション中なら起動済みのものを使う）
+        owns_browser = await self.open_browser()
+        prefetcher = self.create_prefetcher([url for url in new_urls if url not in completed])
         try:
-            # ブラウザ初期化
-            await self.browser_manager.initialize()
-            
             articles = []
+            pending_index = 0
             for i, url in enumerate(new_urls, 1):
+                if url in completed:
+                    articles.append(completed[url])
+                    continue
+                
                 print(f"📄 新規記事 {i}/{len(new_urls)}: {url}")
                 
                 try:
-                    article = await self._scrape_single_article(url)
+                    if prefetcher:
+                        pending_index += 1
+                        article = await self.scrape_prefetched_article(prefetcher, pending_index - 1, url)
+                    else:
+                        article = await self._scrape_single_article(url)
                     articles.append(article)
+                    if journal:
+                        journal.record(article)
                     
                     # 進捗表示
-                    if article.get('title'):
-                        print(f"✅ '{article['title'][:50]}...' を取得完了")
+                    if article.title:
+                        print(f"✅ '{article.title[:50]}...' を取得完了")
                     else:
                         print(f"✅ 記事取得完了（タイトル取得失敗）")
                     
-                    # サーバー負荷軽減
-                    await asyncio.sleep(1.5)
+                    # サーバー負荷軽減（先読み中はレート制限でページを開く間隔をあける）
+                    if not prefetcher:
+                        await asyncio.sleep(1.5)
                     
                 except Exception as e:
                     print(f"❌ スクレイピングエラー: {url} - {e}")
                     # エラーでも空のデータで継続
-                    articles.append({
-                        'url': url,
-                        'title': f"エラー: {e}",
-                        'content': f"エラーが発生しました: {e}",
-                        'date': '',
-                        'price': '',
-                        'purchase_status': ''
-                    })
+                    error_article = Article.error(url, e)
+                    articles.append(error_article)
+                    if journal:
+                        journal.record(error_article)
             
             print(f"🎉 新規記事スクレイピング完了: {len(articles)}件")
+            if prefetcher:
+                prefetcher.print_stats()
             return articles
             
         finally:
-            await self.browser_manager.close()
+            if prefetcher:
+                await prefetcher.close()
+            await self.release_browser(owns_browser)
+    
+    def create_prefetcher(self, urls: List[str]) -> Optional[ArticlePrefetcher]:
+        """urls を順に先読みする ArticlePrefetcher（prefetch_depth が 0 なら None）"""
+        if self.prefetch_depth <= 0 or not urls:
+            return None
+        print(f"⏩ 先読み: {self.prefetch_depth}件先まで別タブで開きます")
+        return ArticlePrefetcher(lambda: self.browser_manager.context, urls,
+                                 self.prefetch_depth, RateLimiter(sequential_interval()))
     
-    async def _scrape_single_article(self, url: str) -> Dict:
+    async def scrape_prefetched_article(self, prefetcher: ArticlePrefetcher, index: int, url: str) -> Article:
+        """先読みしたタブから記事を取得（先読みに失敗した場合は通常どおり開く）"""
+        fetched = await prefetcher.read(index)
+        if fetched is None:
+            return await self._scrape_single_article(url)
+        # 解析・整形は別スレッドで行い、その間も先読み中のタブの読み込みを進める
+        return await asyncio.to_thread(self._build_article, url, *fetched)
+    
+    async def _scrape_single_article(self, url: str) -> Article:
         """単一記事をスクレイピング"""
         # ページに移動
         await self.browser_manager.navigate_to_article(url)
+        page_title = await self.browser_manager.get_page_title()
         
+        # ページ内容を取得してパース
+        content = await self.browser_manager.get_page_content()
+        return self._build_article(url, page_title, content)
+    
+    def _build_article(self, url: str, page_title: str, content: str) -> Article:
+        """ページのタイトルとHTMLから記事情報を作成"""
         # タイトル取得（改良版）
-        page_title = await self.browser_manager.get_page_title()
         title = ''
         if page_title:
             # noteの様々なタイトル形式に対応
@@ -88,8 +202,6 @@ class IncrementalScraper:
             else:
                 title = page_title.strip()
         
-        # ページ内容を取得してパース
-        content = await self.browser_manager.get_page_content()
         soup = BeautifulSoup(content, 'html.parser')
         
         # 本文とメタデータ取得
@@ -101,14 +213,14 @@ class IncrementalScraper:
             print(f"🔍 バナー検出: {url}")
         
         # 記事情報を作成
-        return {
-            'url': url,
-            'title': title,
-            'content': formatted_content,
-            'date': metadata['date'],
-            'price': metadata['price'],
-            'purchase_status': metadata['purchase_status']
-        }
+        return Article(
+            url=url,
+            title=title,
+            content=formatted_content,
+            date=metadata['date'],
+            price=metadata['price'],
+            purchase_status=metadata['purchase_status']
+        )
     
     async def quick_validate_urls(self, urls: List[str]) -> List[str]:
         """URLの有効性を素早くチェック"""
@@ -116,9 +228,8 @@ class IncrementalScraper:
         
         valid_urls = []
         
+        owns_browser = await self.open_browser()
         try:
-            await self.browser_manager.initialize()
-            
             for i, url in enumerate(urls):
                 try:
                     # 軽量チェック（ページタイトルのみ取得）
@@ -138,7 +249,7 @@ class IncrementalScraper:
                     continue
         
         finally:
-            await self.browser_manager.close()
+            await self.release_browser(owns_browser)
         
         print(f"✅ URL有効性チェック完了: {len(urls)}件 → {len(valid_urls)}件（有効）")
         return valid_urls
@@ -149,12 +260,9 @@ class IncrementalScraper:
         print(f"🌐 記事一覧からURL取得開始: {profile_url}")
         
         # 外部でブラウザが既に初期化されている場合はそれを使用
-        browser_initialized_externally = self.browser_manager.page is not None
+        owns_browser = await self.open_browser()
         
         try:
-            if not browser_initialized_externally:
-                await self.browser_manager.initialize()
-            
             # 記事一覧ページに移動
             article_list_url = await self.browser_manager.navigate_to_article_list(profile_url)
             print(f"📄 記事一覧に移動: {article_list_url}")
@@ -170,11 +278,45 @@ class IncrementalScraper:
             
         finally:
             # 外部でブラウザが管理されている場合は閉じない
-            if not browser_initialized_externally:
-                await self.browser_manager.close()
+            await self.release_browser(owns_browser)
+    
+    async def get_new_article_urls(self, profile_url: str, existing_urls: Union[Set[str], URLIndex],
+                                   stop_after: int = 5, source: str = 'browser',
+                                   manual_setup: bool = True) -> Dict[str, any]:
+        """記事一覧の先頭（新しい順）から新規URLを取得し、既知の記事が stop_after 件続いたら打ち切る
+        
+        source='browser' は記事一覧ページの「もっとみる」を必要な分だけ自動で押し、
+        source='api' は記事一覧API（JSON）を必要なページまで取得する（ブラウザ不要）。
+        """
+        print(f"🌐 記事一覧から新規URLを取得（既知の記事が{stop_after}件続いたら終了）: {profile_url}")
+        boundary = KnownBoundary(existing_urls, stop_after)
+        
+        if source == 'api':
+            new_urls = await NoteAPIListing(profile_url).collect(boundary)
+        else:
+            owns_browser = await self.open_browser()
+            try:
+                article_list_url = await self.browser_manager.navigate_to_article_list(profile_url)
+                print(f"📄 記事一覧に移動: {article_list_url}")
+                
+                if manual_setup:
+                    await self._wait_for_manual_setup(expand_all=False)
+                
+                new_urls = await BrowserListing(self.browser_manager.page).collect(boundary)
+            finally:
+                await self.release_browser(owns_browser)
+        
+        if not boundary.reached:
+            print("ℹ️  一覧の最後まで確認しました（既知の記事が続く位置が見つかりませんでした）")
+        print(f"✅ 新規URL: {len(new_urls)}件")
+        return {
+            'new_urls': new_urls,
+            'checked_count': boundary.seen_count,
+            'reached_known': boundary.reached
+        }
     
-    async def _wait_for_manual_setup(self):
-        """手動セットアップ待機"""
+    async def _wait_for_manual_setup(self, expand_all: bool = True):
+        """手動セットアップ待機（expand_all=False なら「もっとみる」は自動で展開する）"""
         import os
         
         print("\n" + "="*70)
@@ -182,7 +324,10 @@ class IncrementalScraper:
         print("="*70)
         print("📋 手順:")
         print("1. 📝 ログインしてください（必要に応じて）")
-        print("2. 🔄 「もっとみる」ボタンをクリックして全記事を表示してください")
+        if expand_all:
+            print("2. 🔄 「もっとみる」ボタンをクリックして全記事を表示してください")
+        else:
+            print("2. 🔄 「もっとみる」は必要な分だけ自動でクリックします（操作不要）")
         print("3. ✅ 完了したら setup_done.txt ファイルを作成してください")
         print()
         
@@ -217,19 +362,20 @@ class IncrementalScraper:
             
             await asyncio.sleep(3)
         
+        # ログイン後のCookieなどをクラッシュからの復旧用に控えておく
+        await self.browser_manager.save_storage_state()
         print("✅ 手動準備完了！URL収集を開始します")
         print("🔄 記事収集フェーズに移行します...")
     
-    async def batch_scrape_with_progress(self, urls: List[str], batch_size: int = 5) -> List[Dict]:
+    async def batch_scrape_with_progress(self, urls: List[str], batch_size: int = 5) -> List[Article]:
         """バッチ処理で進捗表示付きスクレイピング"""
         if not urls:
             return []
         
         print(f"📦 バッチスクレイピング開始: {len(urls)}件 ({batch_size}件/バッチ)")
         
+        owns_browser = await self.open_browser()
         try:
-            await self.browser_manager.initialize()
-            
             all_articles = []
             
             # バッチに分割
@@ -249,21 +395,14 @@ class IncrementalScraper:
                         article = await self._scrape_single_article(url)
                         batch_articles.append(article)
                         
-                        if article.get('title'):
-                            print(f"✅ '{article['title'][:50]}...' を取得完了")
+                        if article.title:
+                            print(f"✅ '{article.title[:50]}...' を取得完了")
                         
                         await asyncio.sleep(1.5)
                         
                     except Exception as e:
                         print(f"❌ エラー: {e}")
-                        batch_articles.append({
-                            'url': url,
-                            'title': f"エラー: {e}",
-                            'content': f"エラーが発生しました: {e}",
-                            'date': '',
-                            'price': '',
-                            'purchase_status': ''
-                        })
+                        batch_articles.append(Article.error(url, e))
                 
                 all_articles.extend(batch_articles)
                 print(f"✅ バッチ {batch_index} 完了 ({len(batch_articles)}件)")
@@ -272,4 +411,4 @@ class IncrementalScraper:
             return all_articles
             
         finally:
-            await self.browser_manager.close()
\ No newline at end of file
+            await self.release_browser(owns_browser)
\ No newline at end of file
@@ -0,0 +1,162 @@
+"""
+チェックポイントジャーナルモジュール
+取得完了した記事を追記型のJSONLに記録し、中断後の再開に使う
+"""
+
+import asyncio
+import json
+import os
+import signal
+from datetime import datetime
+from typing import Dict, Optional, Union
+
+from .article import Article
+
+
+class CheckpointJournal:
+    """取得完了した記事を1行ずつ記録するジャーナル
+    
+    1行目は実行情報（出力ファイル名など）、2行目以降は記事ごとの結果。
+    途中で落ちた場合の末尾の壊れた行は読み込み時に無視する。
+    エラー行は完了扱いにせず、再開時に再取得する。
+    """
+    
+    def __init__(self, path: str, fsync_every: int = 5):
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self.metadata: Dict[str, any] = {}
+        self.completed: Dict[str, Article] = {}
+        self._file = None
+        self._unsynced = 0
+    
+    @staticmethod
+    def default_path(name: str, kind: str) -> str:
+        """ジャーナルの既定パス（output/.journal/<name>_<kind>.jsonl）"""
+        return os.path.join('output', '.journal', f"{name}_{kind}.jsonl")
+    
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+    
+    def start(self, metadata: Optional[Dict[str, any]] = None):
+        """新しいジャーナルを開始（既存の内容は破棄）"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self.metadata = dict(metadata or {})
+        self.metadata.setdefault('started_at', datetime.now().isoformat(timespec='seconds'))
+        self.completed = {}
+        
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._write_line({'type': 'run', **self.metadata})
+        self.flush(sync=True)
+    
+    def resume(self, metadata: Optional[Dict[str, any]] = None) -> Dict[str, Article]:
+        """既存のジャーナルを読み込んで追記を再開（なければ新規開始）"""
+        if not self.exists():
+            print(f"ℹ️  再開用のジャーナルがありません。新規に開始します: {self.path}")
+            self.start(metadata)
+            return self.completed
+        
+        self.metadata = {}
+        self.completed = {}
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # 書き込み途中で中断された行
+                
+                if entry.get('type') == 'run':
+                    self.metadata.update({k: v for k, v in entry.items() if k != 'type'})
+                elif entry.get('type') == 'article':
+                    if entry.get('status') == 'ok':
+                        self.completed[entry['url']] = Article.from_dict(entry['article'])
+                    else:
+                        self.completed.pop(entry['url'], None)
+        
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if not self._ends_with_newline():
+            self._file.write('\n')  # 途中で切れた行の後ろから書き始めない
+        print(f"♻️  ジャーナルから再開: 取得済み {len(self.completed)}件 ({self.path})")
+        return self.completed
+    
+    def update_metadata(self, **fields):
+        """実行情報を追記（再開時は後の行の値が優先される）"""
+        self.metadata.update(fields)
+        self._write_line({'type': 'run', **fields})
+        self.flush(sync=True)
+    
+    def record(self, article: Union[Article, Dict]):
+        """記事の取得結果を記録"""
+        article = Article.coerce(article)
+        status = 'error' if article.is_error else 'ok'
+        self._write_line({
+            'type': 'article',
+            'url': article.url,
+            'status': status,
+            'article': article.to_dict()
+        })
+        if status == 'ok':
+            self.completed[article.url] = article
+        
+        self._unsynced += 1
+        self.flush(sync=self._unsynced >= self.fsync_every)
+    
+    def flush(self, sync: bool = False):
+        """OSへ書き出し（sync=True ならディスクまで同期）"""
+        if self._file is None or self._file.closed:
+            return
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+            self._unsynced = 0
+    
+    def close(self):
+        """ジャーナルを閉じる（内容は残す）"""
+        if self._file is not None and not self._file.closed:
+            self.flush(sync=True)
+            self._file.close()
+    
+    def discard(self):
+        """正常終了時にジャーナルを削除"""
+        self.close()
+        if self.exists():
+            os.remove(self.path)
+    
+    @staticmethod
+    def is_error_article(article: Union[Article, Dict]) -> bool:
+        """スクレイピングエラーで作られた記事か"""
+        return Article.coerce(article).is_error
+    
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+    
+    def _write_line(self, entry: Dict[str, any]):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+def install_graceful_interrupt(task: Optional[asyncio.Task] = None):
+    """Ctrl-C (SIGINT) で実行中タスクをキャンセルし、保存処理を走らせてから終了させる
+    
+    1回目のCtrl-Cでタスクをキャンセル（finally節でジャーナル・CSVを保存）、
+    2回目は通常どおり KeyboardInterrupt で即時終了する。
+    """
+    loop = asyncio.get_running_loop()
+    task = task or asyncio.current_task()
+    
+    def on_interrupt():
+        print("\n⏹️  中断を受け付けました。取得済みの記事を保存して終了します（再度 Ctrl-C で強制終了）")
+        loop.remove_signal_handler(signal.SIGINT)
+        task.cancel()
+    
+    try:
+        loop.add_signal_handler(signal.SIGINT, on_interrupt)
+    except (NotImplementedError, RuntimeError):
+        # Windowsなど add_signal_handler 非対応の環境では既定の動作のまま
+        pass
@@ -0,0 +1,213 @@
+"""
+記事一覧取得モジュール
+新しい順に並んだ記事一覧を、既知の記事が続いた時点で打ち切る増分取得（ブラウザ・JSON API）
+"""
+
+import asyncio
+import json
+import urllib.request
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Union
+from urllib.parse import urlparse
+
+import numpy as np
+
+from .collector import ArticleCollector
+from .url_differ import URLDiffer
+from .url_index import URLIndex
+
+
+# 「もっとみる」ボタン（表記ゆれを含む）
+MORE_BUTTON_SELECTORS = [
+    'button:has-text("もっとみる")',
+    'button:has-text("もっと見る")',
+    'a:has-text("もっとみる")',
+    'a:has-text("もっと見る")'
+]
+
+# 記事リンクの追加を MutationObserver で記録し始めるスクリプト（表示済みのリンクも先に記録する）
+OBSERVE_SCRIPT = """() => {
+    if (window.__noteListing) return;
+    const state = window.__noteListing = {queue: []};
+    const take = node => {
+        if (node.matches('a[href*="/n/"]')) state.queue.push(node);
+        state.queue.push(...node.querySelectorAll('a[href*="/n/"]'));
+    };
+    take(document.body);
+    state.observer = new MutationObserver(mutations => {
+        for (const mutation of mutations) {
+            for (const node of mutation.addedNodes) {
+                if (node.nodeType === Node.ELEMENT_NODE) take(node);
+            }
+        }
+    });
+    state.observer.observe(document.body, {childList: true, subtree: true});
+}"""
+
+# 前回以降に追加された記事リンクを追加順に取り出し、removeCards なら読み終えたカードをDOMから外す
+DRAIN_SCRIPT = """removeCards => {
+    const links = window.__noteListing.queue.splice(0);
+    const hrefs = links.map(link => link.getAttribute('href'));
+    if (removeCards) {
+        for (const link of links) {
+            const card = link.closest('article, li, [class*="card" i]');
+            if (card && card.isConnected) card.remove();
+        }
+    }
+    return {hrefs: hrefs, nodeCount: document.getElementsByTagName('*').length};
+}"""
+
+STOP_OBSERVING_SCRIPT = """() => {
+    if (window.__noteListing) window.__noteListing.observer.disconnect();
+    delete window.__noteListing;
+}"""
+
+# クリエイターの記事一覧API（1ページ分のJSON）
+NOTE_CONTENTS_API = "https://note.com/api/v2/creators/{urlname}/contents?kind=note&page={page}"
+
+
+def known_flags(existing_urls: Union[Set[str], URLIndex], urls: List[str]) -> List[bool]:
+    """正規化済みURLそれぞれが既知か（URL索引ならまとめて照合）"""
+    if isinstance(existing_urls, URLIndex):
+        return existing_urls.contains(np.array(urls, dtype=object)).tolist()
+    return [url in existing_urls for url in urls]
+
+
+class KnownBoundary:
+    """新しい順の記事一覧を先頭から読み、既知の記事が stop_after 件続いたら打ち切る判定
+    
+    固定表示の記事などで既知の記事が先頭に少し混ざっても止まらないよう、
+    1件ではなく連続件数で判定する。
+    """
+    
+    def __init__(self, existing_urls: Union[Set[str], URLIndex], stop_after: int = 5,
+                 base_url: str = "https://note.com"):
+        self.existing_urls = existing_urls
+        self.stop_after = max(1, stop_after)
+        self.url_differ = URLDiffer(base_url)
+        self.new_urls: List[str] = []
+        self.seen_count = 0
+        self.known_run = 0
+        self.reached = False
+        self._seen: Set[str] = set()
+    
+    def feed(self, urls: List[str]) -> bool:
+        """一覧の続きのURLを渡す（境界に達したら True、以降のURLは無視）"""
+        if self.reached:
+            return True
+        
+        normalized = []
+        for url in urls:
+            key = self.url_differ._normalize_url(url)
+            if key and key not in self._seen:
+                self._seen.add(key)
+                normalized.append(key)
+        
+        for key, known in zip(normalized, known_flags(self.existing_urls, normalized)):
+            self.seen_count += 1
+            if known:
+                self.known_run += 1
+                if self.known_run >= self.stop_after:
+                    self.reached = True
+                    return True
+            else:
+                self.known_run = 0
+                self.new_urls.append(key)
+        return False
+
+
+class BrowserListing:
+    """記事一覧ページの「もっとみる」を自動で押しながらURLを集める（境界に達したら展開をやめる）
+    
+    新しく表示されたリンクだけを MutationObserver で受け取り、virtualize=True なら読み終えたカードを
+    DOMから外す。展開するほどDOMが大きくなって1回ごとのクリック・取得が遅くなるのを防ぐ。
+    """
+    
+    def __init__(self, page, max_clicks: int = 200, wait_ms: int = 2000, virtualize: bool = True):
+        self.page = page
+        self.max_clicks = max_clicks
+        self.wait_ms = wait_ms
+        self.virtualize = virtualize
+        self.collector = ArticleCollector()
+        self.click_count = 0
+        self.node_count = 0
+    
+    async def collect(self, boundary: KnownBoundary) -> List[str]:
+        """境界に達するか一覧の最後まで展開して、新規URLを返す"""
+        await self.page.evaluate(OBSERVE_SCRIPT)
+        try:
+            while True:
+                drained = await self.page.evaluate(DRAIN_SCRIPT, self.virtualize)
+                self.node_count = drained['nodeCount']
+                hrefs = [href for href in drained['hrefs'] if href and self.collector._is_valid_article_link(href)]
+                if boundary.feed(hrefs):
+                    break
+                
+                if self.click_count >= self.max_clicks or not await self._click_more():
+                    break
+        finally:
+            await self.page.evaluate(STOP_OBSERVING_SCRIPT)
+        
+        print(f"✅ 一覧展開: 「もっとみる」{self.click_count}回 / {boundary.seen_count}件を確認"
+              f"{'（既知の記事に到達）' if boundary.reached else ''}（DOM要素数: {self.node_count}）")
+        return boundary.new_urls
+    
+    async def _click_more(self) -> bool:
+        for selector in MORE_BUTTON_SELECTORS:
+            button = await self.page.query_selector(selector)
+            if button:
+                await button.scroll_into_view_if_needed()
+                await button.click()
+                self.click_count += 1
+                await self.page.wait_for_timeout(self.wait_ms)
+                return True
+        return False
+
+
+async def fetch_json(url: str) -> Dict[str, any]:
+    """JSONを取得（標準ライブラリのHTTPクライアントを別スレッドで実行）"""
+    def fetch():
+        request = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0', 'Accept': 'application/json'})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return json.loads(response.read().decode('utf-8'))
+    return await asyncio.to_thread(fetch)
+
+
+class NoteAPIListing:
+    """noteの記事一覧API（新しい順のJSONページ）からURLを集める（境界に達したら以降のページは取得しない）"""
+    
+    def __init__(self, profile_url: str,
+                 fetch: Callable[[str], Awaitable[Dict[str, any]]] = fetch_json,
+                 max_pages: Optional[int] = None, interval: float = 1.0):
+        self.urlname = urlparse(profile_url).path.strip('/').split('/')[0]
+        self.fetch = fetch
+        self.max_pages = max_pages
+        self.interval = interval
+        self.request_count = 0
+    
+    async def collect(self, boundary: KnownBoundary) -> List[str]:
+        """境界に達するか最終ページまで取得して、新規URLを返す"""
+        page = 1
+        while self.max_pages is None or page <= self.max_pages:
+            data = (await self._fetch_page(page)).get('data') or {}
+            urls = [content.get('noteUrl') for content in data.get('contents') or []]
+            if boundary.feed([url for url in urls if url]) or data.get('isLastPage', True):
+                break
+            page += 1
+            await asyncio.sleep(self.interval)
+        
+        print(f"✅ 一覧API: {self.request_count}リクエスト / {boundary.seen_count}件を確認"
+              f"{'（既知の記事に到達）' if boundary.reached else ''}")
+        return boundary.new_urls
+    
+    async def probe(self) -> Dict[str, any]:
+        """1ページ目だけを取得して総記事数と最新記事のURLを返す（変更の有無の事前確認用）"""
+        data = (await self._fetch_page(1)).get('data') or {}
+        contents = data.get('contents') or []
+        return {
+            'total_count': data.get('totalCount'),
+            'newest_url': contents[0].get('noteUrl') if contents else None
+        }
+    
+    async def _fetch_page(self, page: int) -> Dict[str, any]:
+        self.request_count += 1
+        return await self.fetch(NOTE_CONTENTS_API.format(urlname=self.urlname, page=page))
@@ -0,0 +1,68 @@
+"""
+記事一覧キャッシュモジュール
+全件展開した記事一覧をプロフィールごとに保存し、有効期限内は別のコマンドからも再利用する
+"""
+
+import json
+import os
+import time
+from typing import List, Optional
+
+
+CACHE_VERSION = 1
+
+# 既定の有効期限（秒）
+DEFAULT_LISTING_TTL = 3600
+
+
+class ListingCache:
+    """記事一覧のスナップショット（既定では output/.listing/<プロフィール名>.json）
+    
+    保存時刻から ttl 秒を過ぎたもの、別のプロフィールのものは使わない（ttl=0 なら常に取得し直す）。
+    """
+    
+    def __init__(self, profile_url: str, ttl: int = DEFAULT_LISTING_TTL, path: Optional[str] = None):
+        self.profile_url = profile_url.rstrip('/')
+        self.ttl = ttl
+        self.path = path or self.default_path(self.profile_url)
+    
+    @staticmethod
+    def default_path(profile_url: str) -> str:
+        """スナップショットの既定パス"""
+        name = profile_url.rstrip('/').split('/')[-1]
+        return os.path.join('output', '.listing', f"{name}.json")
+    
+    def load(self) -> Optional[List[str]]:
+        """有効期限内の記事URL一覧（ない・期限切れなら None）"""
+        if self.ttl <= 0 or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if data.get('version') != CACHE_VERSION or data.get('profile_url') != self.profile_url:
+            return None
+        age = time.time() - data.get('saved_at', 0)
+        if not 0 <= age < self.ttl:
+            return None
+        
+        print(f"♻️  保存済みの記事一覧を使用します: {len(data['urls'])}件（{int(age // 60)}分前に取得）")
+        return data['urls']
+    
+    def save(self, urls: List[str]):
+        """記事URL一覧を現在時刻で保存"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            'version': CACHE_VERSION,
+            'profile_url': self.profile_url,
+            'saved_at': time.time(),
+            'urls': urls
+        }
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
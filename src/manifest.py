@@ -0,0 +1,181 @@
+"""
+CSVマニフェストモジュール
+出力CSVの横に URL一覧・日付範囲・行ハッシュなどを保存し、本文を読まずに事前チェックできるようにする
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from .url_differ import URLDiffer
+
+
+MANIFEST_VERSION = 3
+
+# 行ハッシュの対象列（番号は振り直しで変わるため含めない）
+HASHED_COLUMNS = ['公開日', 'タイトル', '本文', '価格', '購入状況']
+
+
+def row_hash(values) -> str:
+    """1行分の値からハッシュ値を計算"""
+    joined = '\x1f'.join('' if pd.isna(value) else str(value) for value in values)
+    return hashlib.blake2b(joined.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class CSVManifest:
+    """CSVのサイドカーマニフェスト（<csv>.manifest.json）
+    
+    元CSVのサイズと更新時刻を記録し、一致しない場合は古いものとして作り直す。
+    """
+    
+    def __init__(self, csv_path: str):
+        self.csv_path = str(csv_path)
+        self.path = f"{self.csv_path}.manifest.json"
+        self.url_differ = URLDiffer()
+    
+    def load(self) -> Optional[Dict[str, any]]:
+        """最新のマニフェストを読み込む（ない・古い場合は None）"""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if data.get('version') != MANIFEST_VERSION or data.get('source') != self._source_info():
+            return None
+        return data
+    
+    def load_or_build(self) -> Dict[str, any]:
+        """マニフェストを取得（古ければCSVを読み直して作り直す）"""
+        data = self.load()
+        if data is None:
+            print(f"🧾 マニフェストを作成しています: {self.path}")
+            data = self.build()
+        return data
+    
+    def build(self, chunksize: int = 5000) -> Dict[str, any]:
+        """CSVをチャンクごとに読み込んでマニフェストを作成・保存（メモリ使用量を抑える）"""
+        chunks = pd.read_csv(self.csv_path, encoding='utf-8-sig', dtype=str,
+                             keep_default_na=False, chunksize=chunksize)
+        return self.save(self.collect(chunks))
+    
+    def write_for_dataframe(self, df: pd.DataFrame) -> Dict[str, any]:
+        """保存済みCSVと同じ内容のDataFrameからマニフェストを作成・保存"""
+        return self.save(self.collect([df]))
+    
+    def collect(self, frames) -> Dict[str, any]:
+        """CSVの内容（DataFrameの列）からマニフェストの内容を作成（保存はしない）"""
+        has_url_column = None
+        urls = []
+        row_hashes = []
+        raw_dates = []
+        min_date = max_date = None
+        # 番号が上の行から1ずつ減っているか（最後の行が1なら「新しい記事ほど大きい番号」の並び）
+        numbers_desc = True
+        last_number = None
+        
+        for df in frames:
+            if has_url_column is None:
+                has_url_column = 'URL' in df.columns
+            if has_url_column:
+                urls.extend(self.url_differ._normalize_url(url) if isinstance(url, str) else '' for url in df['URL'])
+            else:
+                urls.extend([''] * len(df))
+            
+            if '番号' in df.columns:
+                numbers = pd.to_numeric(df['番号'], errors='coerce').to_numpy()
+                if len(numbers):
+                    if last_number is not None:
+                        numbers = [last_number, *numbers]
+                    numbers_desc = numbers_desc and bool((np.diff(numbers) == -1).all())
+                    last_number = numbers[-1]
+            elif len(df):
+                numbers_desc = False
+            
+            hashed = df.reindex(columns=HASHED_COLUMNS)
+            row_hashes.extend(row_hash(values) for values in hashed.itertuples(index=False, name=None))
+            
+            if '公開日' in df.columns:
+                raw_dates.extend('' if pd.isna(date) else str(date) for date in df['公開日'])
+                dates = pd.to_datetime(df['公開日'], errors='coerce', format='mixed').dropna()
+                if len(dates) > 0:
+                    min_date = dates.min() if min_date is None else min(min_date, dates.min())
+                    max_date = dates.max() if max_date is None else max(max_date, dates.max())
+        
+        data = {
+            'version': MANIFEST_VERSION,
+            'source': self._source_info(),
+            'row_count': len(row_hashes),
+            'has_url_column': bool(has_url_column),
+            'numbers_desc': bool(numbers_desc and (last_number is None or last_number == 1)),
+            'min_date': min_date.strftime('%Y-%m-%d %H:%M:%S') if min_date is not None else None,
+            'max_date': max_date.strftime('%Y-%m-%d %H:%M:%S') if max_date is not None else None,
+            'urls': urls,
+            'row_hashes': row_hashes,
+            'dates': raw_dates if len(raw_dates) == len(row_hashes) else [''] * len(row_hashes)
+        }
+        return data
+    
+    @staticmethod
+    def concat(first: Dict[str, any], second: Dict[str, any]) -> Dict[str, any]:
+        """先頭に行を追加したCSVのマニフェスト内容（first の行が上）
+        
+        first は second の番号の続きを振った行とみなし、番号の並びは second のものを引き継ぐ。
+        """
+        min_dates = [date for date in (first['min_date'], second['min_date']) if date]
+        max_dates = [date for date in (first['max_date'], second['max_date']) if date]
+        return {
+            'version': MANIFEST_VERSION,
+            'source': None,
+            'row_count': first['row_count'] + second['row_count'],
+            'has_url_column': first['has_url_column'] and second['has_url_column'],
+            'numbers_desc': second['numbers_desc'],
+            'min_date': min(min_dates) if min_dates else None,
+            'max_date': max(max_dates) if max_dates else None,
+            'urls': first['urls'] + second['urls'],
+            'row_hashes': first['row_hashes'] + second['row_hashes'],
+            'dates': first['dates'] + second['dates']
+        }
+    
+    def existing_urls(self) -> Set[str]:
+        """正規化済みの記事URL一覧"""
+        return {url for url in self.load_or_build()['urls'] if url}
+    
+    def stats(self) -> Dict[str, any]:
+        """CSVManager.load_existing_csv と同じ形式の統計情報"""
+        data = self.load_or_build()
+        
+        if data['min_date']:
+            date_range = f"{data['min_date'][:10]} 〜 {data['max_date'][:10]}"
+        else:
+            date_range = "不明"
+        
+        return {
+            'total_articles': data['row_count'],
+            'date_range': date_range,
+            'latest_date': data['max_date'],
+            'existing_urls': {url for url in data['urls'] if url},
+            'has_url_column': data['has_url_column']
+        }
+    
+    def _source_info(self) -> Optional[Dict[str, int]]:
+        try:
+            stat = os.stat(self.csv_path)
+        except OSError:
+            return None
+        return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    
+    def save(self, data: Dict[str, any]) -> Dict[str, any]:
+        """CSVを書き終えた後に保存（その時点のCSVのサイズ・更新時刻を記録）"""
+        data['source'] = self._source_info()
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temp_path, self.path)
+        return data
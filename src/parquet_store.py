@@ -0,0 +1,191 @@
+"""
+Parquet出力モジュール
+記事データを列指向のParquet（zstd圧縮）で保存・読み込み（pyarrow が必要）
+"""
+
+import os
+import shutil
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .exporter import CSV_COLUMNS
+from .url_differ import normalize_urls
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow は任意依存
+    pa = None
+    pq = None
+
+
+# 値の種類が少ない列（辞書エンコード）
+DICTIONARY_COLUMNS = ['価格', '購入状況']
+
+# 公開日はこのタイムゾーンの日時として保存する（タイムゾーンのない値も日本時間とみなす）
+DATE_TIMEZONE = 'Asia/Tokyo'
+
+TZ_SUFFIX_PATTERN = r'(?:Z|[+-]\d{2}:?\d{2})$'
+
+
+def require_pyarrow():
+    """pyarrow がなければ分かりやすいエラーにする"""
+    if pa is None:
+        raise ImportError("Parquet形式を使うには pyarrow が必要です（pip install pyarrow）")
+
+
+def article_schema() -> 'pa.Schema':
+    """記事データのスキーマ（公開日はタイムスタンプ型）"""
+    require_pyarrow()
+    return pa.schema([
+        ('番号', pa.int64()),
+        ('公開日', pa.timestamp('ms', tz=DATE_TIMEZONE)),
+        ('タイトル', pa.string()),
+        ('本文', pa.string()),
+        ('価格', pa.dictionary(pa.int32(), pa.string())),
+        ('購入状況', pa.dictionary(pa.int32(), pa.string())),
+        ('URL', pa.string())
+    ])
+
+
+def parse_publish_dates(values: pd.Series) -> pd.Series:
+    """公開日を日本時間の日時型に変換（ISO形式・スラッシュ区切りなどの表記が混在していてもよい）
+    
+    タイムゾーン付きの値は日本時間に換算し、タイムゾーンのない値は日本時間とみなす。
+    空欄は NaT にし、空欄でない値が解析できなければ ValueError（黙って欠損にしない）。
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        if values.dt.tz is None:
+            return values.dt.tz_localize(DATE_TIMEZONE)
+        return values.dt.tz_convert(DATE_TIMEZONE)
+    
+    text = values.astype(object).where(values.notna(), '').astype(str).str.strip()
+    present = text != ''
+    aware = present & text.str.contains(TZ_SUFFIX_PATTERN)
+    naive = present & ~aware
+    
+    dates = pd.Series(pd.NaT, index=values.index, dtype=f'datetime64[ns, {DATE_TIMEZONE}]')
+    if aware.any():
+        dates[aware] = pd.to_datetime(text[aware], format='mixed', utc=True, errors='coerce').dt.tz_convert(DATE_TIMEZONE)
+    if naive.any():
+        dates[naive] = pd.to_datetime(text[naive], format='mixed', errors='coerce').dt.tz_localize(DATE_TIMEZONE)
+    
+    invalid = present & dates.isna()
+    if invalid.any():
+        samples = ', '.join(text[invalid].head(3))
+        raise ValueError(f"公開日を解析できない記事があります（{int(invalid.sum())}件）: {samples}")
+    return dates
+
+
+def dataframe_to_table(df: pd.DataFrame) -> 'pa.Table':
+    """CSVと同じ列構成のDataFrameをArrowテーブルに変換"""
+    require_pyarrow()
+    df = df.reindex(columns=CSV_COLUMNS)
+    
+    columns = {
+        '番号': pd.to_numeric(df['番号'], errors='coerce').astype('Int64'),
+        '公開日': parse_publish_dates(df['公開日']),
+    }
+    for column in ['タイトル', '本文', '価格', '購入状況', 'URL']:
+        columns[column] = df[column].astype('string')
+    
+    return pa.Table.from_pandas(pd.DataFrame(columns), schema=article_schema(), preserve_index=False)
+
+
+class ParquetCorpus:
+    """記事データのParquetデータセット
+    
+    path はディレクトリで、part-00000.parquet から順に保存する。
+    追記時は既存ファイルを書き換えず、新しいパートファイル（行グループ）を足す。
+    """
+    
+    def __init__(self, path: str, compression: str = 'zstd', row_group_size: int = 10000):
+        require_pyarrow()
+        self.path = path
+        self.compression = compression
+        self.row_group_size = row_group_size
+    
+    def exists(self) -> bool:
+        return bool(self.part_files())
+    
+    def part_files(self) -> List[str]:
+        """パートファイル一覧（書き込み順）"""
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(
+            os.path.join(self.path, name) for name in os.listdir(self.path)
+            if name.startswith('part-') and name.endswith('.parquet')
+        )
+    
+    def count(self) -> int:
+        """記事数（フッターのメタデータのみ読む）"""
+        return sum(pq.read_metadata(part).num_rows for part in self.part_files())
+    
+    def write(self, df: pd.DataFrame) -> Dict[str, any]:
+        """データセットを作り直して保存"""
+        temp_dir = f"{self.path}.tmp"
+        if os.path.exists(temp_dir):
+            shutil.rmtree(temp_dir)
+        os.makedirs(temp_dir)
+        
+        self._write_part(dataframe_to_table(df), os.path.join(temp_dir, 'part-00000.parquet'))
+        
+        if os.path.exists(self.path):
+            shutil.rmtree(self.path)
+        os.replace(temp_dir, self.path)
+        return self._result(len(df))
+    
+    def append(self, df: pd.DataFrame) -> Dict[str, any]:
+        """新しいパートファイルとして追記（保存済みURLの記事は除き、番号は続きから振る）
+        
+        URLは正規化して照合し（クエリ・末尾のスラッシュ違いも同じ記事）、
+        番号は公開日の古い順に振る（公開日なしの記事はその後ろ）。
+        """
+        if not self.exists():
+            return self.write(df)
+        
+        existing_urls = set(normalize_urls(self.read(columns=['URL'])['URL']))
+        new_urls = normalize_urls(df['URL'])
+        df = df[~new_urls.isin(existing_urls).to_numpy() & ~new_urls.duplicated().to_numpy()]
+        if df.empty:
+            return self._result(0)
+        
+        # 番号は既存記事の続きから、公開日の古い順に振る
+        order = parse_publish_dates(df['公開日']).reset_index(drop=True).sort_values(kind='stable').index
+        df = df.iloc[order].copy()
+        df['番号'] = range(self.count() + 1, self.count() + len(df) + 1)
+        
+        part_path = os.path.join(self.path, f"part-{len(self.part_files()):05d}.parquet")
+        temp_path = f"{part_path}.tmp"
+        self._write_part(dataframe_to_table(df), temp_path)
+        os.replace(temp_path, part_path)
+        return self._result(len(df))
+    
+    def read(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """指定した列のみ読み込む（columns=None なら全列）"""
+        parts = self.part_files()
+        if not parts:
+            raise FileNotFoundError(f"Parquetデータが見つかりません: {self.path}")
+        
+        tables = [pq.read_table(part, columns=columns) for part in parts]
+        # 文字列列はPythonオブジェクトにせずArrow文字列のまま（辞書エンコード列はカテゴリになる）
+        return pa.concat_tables(tables).to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+    
+    def _write_part(self, table: 'pa.Table', path: str):
+        pq.write_table(
+            table, path,
+            compression=self.compression,
+            use_dictionary=DICTIONARY_COLUMNS,
+            row_group_size=self.row_group_size
+        )
+    
+    def _result(self, written: int) -> Dict[str, any]:
+        total_size = sum(os.path.getsize(part) for part in self.part_files())
+        return {
+            'success': True,
+            'filename': self.path,
+            'written_count': written,
+            'total_articles_count': self.count(),
+            'file_size_mb': round(total_size / (1024 * 1024), 1)
+        }
@@ -0,0 +1,128 @@
+"""
+先読みモジュール
+記事の解析・整形をしている間に、次の記事を別タブで開いておく（ページを開く間隔はレート制限に従う）
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# 逐次取得で記事を開いた後の読み込み待ち（BrowserManager.navigate_to_article）と記事間の待機（秒）
+PAGE_WAIT_MS = 2000
+REQUEST_DELAY = 1.5
+
+
+def sequential_interval(wait_ms: int = PAGE_WAIT_MS) -> float:
+    """逐次取得でページを開く最小間隔（読み込み待ち＋記事間の待機、秒）
+    
+    先読みでもこの間隔より短くページを開かない（リクエストの頻度は逐次取得と同じ以下）。
+    """
+    return wait_ms / 1000 + REQUEST_DELAY
+
+
+class RateLimiter:
+    """ページを開き始める間隔を interval 秒以上あける（複数のタブで共有）"""
+    
+    def __init__(self, interval: float = sequential_interval()):
+        self.interval = interval
+        self._next_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+    
+    async def wait(self):
+        """次にページを開いてよい時刻まで待つ"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            if start_at > now:
+                await asyncio.sleep(start_at - now)
+            self._next_at = start_at + self.interval
+
+
+class ArticlePrefetcher:
+    """記事URLの一覧を順に、depth 件先まで別タブで開いておく
+    
+    take(i) で i 番目の記事を開いたタブを受け取ると、i+1〜i+depth 番目の先読みを始める。
+    タブは呼び出し側で読み終えたら閉じる。context_getter はブラウザが再起動された場合に
+    新しいコンテキストで先読みを続けるために毎回呼ぶ。
+    """
+    
+    def __init__(self, context_getter: Callable, urls: List[str], depth: int = 1,
+                 limiter: Optional[RateLimiter] = None, wait_ms: int = PAGE_WAIT_MS):
+        self.context_getter = context_getter
+        self.urls = list(urls)
+        self.depth = max(1, depth)
+        self.limiter = limiter or RateLimiter(sequential_interval(wait_ms))
+        self.wait_ms = wait_ms
+        self.hit_count = 0
+        self.miss_count = 0
+        self._tasks: Dict[int, asyncio.Task] = {}
+    
+    async def take(self, index: int):
+        """index 番目の記事を開いたタブ（先読みに失敗した場合は None）"""
+        for ahead in range(index, min(index + self.depth + 1, len(self.urls))):
+            if ahead not in self._tasks:
+                self._tasks[ahead] = asyncio.ensure_future(self._open(self.urls[ahead]))
+        
+        task = self._tasks.pop(index)
+        # 待たずに受け取れた（解析中に読み込みが終わっていた）ものを先読みの効果として数える
+        ready = task.done()
+        try:
+            page = await task
+        except Exception as e:
+            self.miss_count += 1
+            print(f"⚠️  先読みに失敗しました（通常どおり開きます）: {self.urls[index]} - {e}")
+            return None
+        if ready:
+            self.hit_count += 1
+        return page
+    
+    async def read(self, index: int) -> Optional[Tuple[str, str]]:
+        """index 番目の記事のタイトルとHTMLを先読みしたタブから読んでタブを閉じる
+        
+        先読みに失敗した場合はレート制限の順番を待ってから None を返す（呼び出し側で通常どおり開く）。
+        """
+        page = await self.take(index)
+        if page is not None:
+            try:
+                return await page.title(), await page.content()
+            except Exception as e:
+                print(f"⚠️  先読みしたタブを読めませんでした（通常どおり開きます）: {e}")
+            finally:
+                await self.close_page(page)
+        await self.limiter.wait()
+        return None
+    
+    def print_stats(self):
+        """先読みの効果（待たずに受け取れた件数・失敗した件数）を表示"""
+        print(f"⏩ 先読み: 待たずに取得 {self.hit_count}件 / 失敗 {self.miss_count}件")
+    
+    async def close(self):
+        """残っている先読みを止めてタブを閉じる"""
+        tasks, self._tasks = list(self._tasks.values()), {}
+        for task in tasks:
+            task.cancel()
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if not isinstance(result, BaseException):
+                await self.close_page(result)
+    
+    async def _open(self, url: str):
+        page = await self.context_getter().new_page()
+        try:
+            await self.limiter.wait()
+            await page.goto(url, wait_until="domcontentloaded", timeout=0)
+            await page.wait_for_timeout(self.wait_ms)
+            return page
+        except BaseException:
+            await self.close_page(page)
+            raise
+    
+    @staticmethod
+    async def close_page(page):
+        """タブを閉じる（ブラウザが落ちていても例外にしない）"""
+        try:
+            await page.close()
+        except Exception:
+            pass
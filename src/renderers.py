@@ -0,0 +1,225 @@
+"""
+本文レンダラーモジュール
+ブロック列から各出力形式（CSV用テキスト・プレーンテキスト・HTML・JSON）を生成
+"""
+
+import html
+from typing import Dict, List, Type
+
+from .blocks import (
+    Block, TextBlock, ParagraphBlock, HeadingBlock, QuoteBlock, RuleBlock,
+    ImageBlock, BannerBlock, EmbedBlock, ListBlock, blocks_to_json
+)
+
+
+class BlockRenderer:
+    """レンダラーの基底クラス（ブロック種別ごとに render_<kind> を実装）"""
+    
+    def render(self, blocks: List[Block]) -> str:
+        """ブロック列を文字列に変換"""
+        lines = []
+        handlers = {}
+        for block in blocks:
+            handler = handlers.get(block.kind)
+            if handler is None:
+                handler = handlers[block.kind] = getattr(self, f"render_{block.kind}")
+            lines.extend(handler(block))
+        return '\n'.join(lines)
+
+
+class MarkdownRenderer(BlockRenderer):
+    """CSVの本文列と同じMarkdown風テキストを出力"""
+    
+    def render_text(self, block: TextBlock) -> List[str]:
+        return [block.text]
+    
+    def render_paragraph(self, block: ParagraphBlock) -> List[str]:
+        text = self.render_spans(block.spans)
+        return [text, ''] if text else []
+    
+    def render_spans(self, spans) -> str:
+        """インライン要素を結合"""
+        text_parts = []
+        for span in spans:
+            kind = span[0]
+            if kind == 'text':
+                text_parts.append(span[1])
+            elif kind == 'strong':
+                text_parts.append(f"**{span[1]}**")
+            elif kind == 'em':
+                text_parts.append(f"*{span[1]}*")
+            elif kind == 'link':
+                text_parts.append(f"[{span[1] or span[2]}]({span[2]})")
+            elif kind == 'br':
+                text_parts.append('')
+        
+        # 「→」記号を除去
+        return ''.join(text_parts).replace('→', '')
+    
+    def render_heading(self, block: HeadingBlock) -> List[str]:
+        return [f"**{block.text}**", '']
+    
+    def render_quote(self, block: QuoteBlock) -> List[str]:
+        return [f"> {block.text}", '']
+    
+    def render_rule(self, block: RuleBlock) -> List[str]:
+        return ['====', '']
+    
+    def render_image(self, block: ImageBlock) -> List[str]:
+        lines = [f"![{block.alt}]({block.src})"]
+        if block.caption is not None:
+            lines.append(f"*{block.caption}*")
+        lines.append('')
+        return lines
+    
+    def render_banner(self, block: BannerBlock) -> List[str]:
+        return [self.banner_text(block), '']
+    
+    def banner_text(self, block: BannerBlock) -> str:
+        """バナーを [ラベル: タイトル - 説明](URL) 形式に変換"""
+        label = block.label
+        if block.title:
+            label += f": {block.title}"
+            if block.desc:
+                label += f" - {block.desc}"
+        return f"[{label}]({block.href})"
+    
+    def render_embed(self, block: EmbedBlock) -> List[str]:
+        if block.banner is not None:
+            return [f"[{block.label}: {self.banner_text(block.banner)}]", '']
+        if not block.url:
+            # リンク先を取得できなかったサービス埋め込み
+            return [f"[{block.label}: ]", '']
+        return [f"[{block.label}]({block.url})", '']
+    
+    def render_list(self, block: ListBlock) -> List[str]:
+        prefix = '1. ' if block.ordered else '- '
+        return [f"{prefix}{item}" for item in block.items] + ['']
+
+
+class PlainTextRenderer(MarkdownRenderer):
+    """装飾記号やURLを含まないプレーンテキストを出力"""
+    
+    def render_spans(self, spans) -> str:
+        text_parts = []
+        for span in spans:
+            if span[0] == 'link':
+                text_parts.append(span[1] or span[2])
+            elif span[0] == 'br':
+                text_parts.append('\n')
+            else:
+                text_parts.append(span[1])
+        return ''.join(text_parts).replace('→', '')
+    
+    def render_heading(self, block: HeadingBlock) -> List[str]:
+        return [block.text, '']
+    
+    def render_quote(self, block: QuoteBlock) -> List[str]:
+        return [block.text, '']
+    
+    def render_rule(self, block: RuleBlock) -> List[str]:
+        return ['']
+    
+    def render_image(self, block: ImageBlock) -> List[str]:
+        return [block.caption, ''] if block.caption else []
+    
+    def banner_text(self, block: BannerBlock) -> str:
+        return block.title or block.label
+    
+    def render_embed(self, block: EmbedBlock) -> List[str]:
+        if block.banner is not None:
+            return [self.banner_text(block.banner), '']
+        return [block.label, '']
+    
+    def render_list(self, block: ListBlock) -> List[str]:
+        return list(block.items) + ['']
+
+
+class HTMLRenderer(BlockRenderer):
+    """シンプルなHTML断片を出力"""
+    
+    def render_text(self, block: TextBlock) -> List[str]:
+        return [html.escape(block.text)]
+    
+    def render_paragraph(self, block: ParagraphBlock) -> List[str]:
+        inner_parts = []
+        for span in block.spans:
+            kind = span[0]
+            if kind == 'strong':
+                inner_parts.append(f"<strong>{html.escape(span[1])}</strong>")
+            elif kind == 'em':
+                inner_parts.append(f"<em>{html.escape(span[1])}</em>")
+            elif kind == 'link':
+                inner_parts.append(
+                    f'<a href="{html.escape(span[2])}">{html.escape(span[1] or span[2])}</a>'
+                )
+            elif kind == 'br':
+                inner_parts.append('<br>')
+            else:
+                inner_parts.append(html.escape(span[1]))
+        
+        inner = ''.join(inner_parts).replace('→', '')
+        return [f"<p>{inner}</p>"] if inner else []
+    
+    def render_heading(self, block: HeadingBlock) -> List[str]:
+        return [f"<h{block.level}>{html.escape(block.text)}</h{block.level}>"]
+    
+    def render_quote(self, block: QuoteBlock) -> List[str]:
+        return [f"<blockquote>{html.escape(block.text)}</blockquote>"]
+    
+    def render_rule(self, block: RuleBlock) -> List[str]:
+        return ['<hr>']
+    
+    def render_image(self, block: ImageBlock) -> List[str]:
+        img = f'<img src="{html.escape(block.src)}" alt="{html.escape(block.alt)}">'
+        if block.caption is not None:
+            return [f"<figure>{img}<figcaption>{html.escape(block.caption)}</figcaption></figure>"]
+        return [f"<figure>{img}</figure>"]
+    
+    def render_banner(self, block: BannerBlock) -> List[str]:
+        return [f'<p class="banner">{self._banner_link(block)}</p>']
+    
+    def _banner_link(self, block: BannerBlock) -> str:
+        text = block.title or block.label
+        if block.desc:
+            text += f" - {block.desc}"
+        return f'<a href="{html.escape(block.href)}">{html.escape(text)}</a>'
+    
+    def render_embed(self, block: EmbedBlock) -> List[str]:
+        if block.banner is not None:
+            return [f'<p class="embed">{self._banner_link(block.banner)}</p>']
+        return [
+            f'<p class="embed"><a href="{html.escape(block.url)}">{html.escape(block.label)}</a></p>'
+        ]
+    
+    def render_list(self, block: ListBlock) -> List[str]:
+        tag = 'ol' if block.ordered else 'ul'
+        items = ''.join(f"<li>{html.escape(item)}</li>" for item in block.items)
+        return [f"<{tag}>{items}</{tag}>"]
+
+
+class JSONRenderer(BlockRenderer):
+    """ブロック列をそのままJSONで出力"""
+    
+    def render(self, blocks: List[Block]) -> str:
+        return blocks_to_json(blocks)
+
+
+RENDERERS: Dict[str, Type[BlockRenderer]] = {
+    'markdown': MarkdownRenderer,
+    'text': PlainTextRenderer,
+    'html': HTMLRenderer,
+    'json': JSONRenderer
+}
+
+
+def register_renderer(name: str, renderer_class: Type[BlockRenderer]):
+    """レンダラーを登録（独自の出力形式を追加する場合）"""
+    RENDERERS[name] = renderer_class
+
+
+def get_renderer(name: str) -> BlockRenderer:
+    """名前からレンダラーを取得"""
+    if name not in RENDERERS:
+        raise ValueError(f"不明な出力形式です: {name}（対応形式: {', '.join(RENDERERS)}）")
+    return RENDERERS[name]()
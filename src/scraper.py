@@ -4,119 +4,187 @@
 
 import asyncio
 import os
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict, Optional
 from bs4 import BeautifulSoup
 from datetime import datetime
 
+from .article import Article, Price
 from .browser import BrowserManager
 from .collector import ArticleCollector
 from .formatter import ContentFormatter
 from .exporter import CSVExporter
+from .journal import CheckpointJournal
+from .prefetch import ArticlePrefetcher
 
 
 class NoteScraper:
     """Noteスクレイパーのメインクラス"""
     
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, prefetch_depth: int = 0):
         self.browser_manager = BrowserManager(headless)
+        # prefetch_depth 件先の記事まで別タブで先読みする（0 なら先読みしない）
+        self.prefetch_depth = prefetch_depth
         self.collector = ArticleCollector()
         self.formatter = ContentFormatter()
         self.exporter = CSVExporter()
         
-    async def run(self, profile_url: str, limit: int = None, manual_login: bool = False) -> Dict[str, any]:
-        """メイン処理"""
+    async def run(self, profile_url: str, limit: int = None, manual_login: bool = False,
+                  resume: bool = False, journal_path: Optional[str] = None,
+                  since: Optional[str] = None, until: Optional[str] = None,
+                  price: Optional[Price] = None) -> Dict[str, any]:
+        """メイン処理（resume=True なら前回中断時のジャーナルから再開）
+        
+        since / until（YYYY-MM-DD）と price を指定すると、一覧のカードの情報で絞り込んでから記事を開く。
+        """
+        profile_name = profile_url.rstrip('/').split('/')[-1]
+        journal = CheckpointJournal(journal_path or CheckpointJournal.default_path(profile_name, 'final'))
+        
         try:
             print("🚀 Note Scraper を開始")
             print(f"📝 対象: {profile_url}")
             
+            # 前回のジャーナルから取得済み記事・記事一覧・出力先を引き継ぐ
+            completed = {}
+            article_urls = None
+            filename = None
+            resumed = resume and journal.exists()
+            if resumed:
+                completed = journal.resume()
+                article_urls = journal.metadata.get('urls')
+                filename = journal.metadata.get('output')
+            elif resume:
+                print(f"ℹ️  再開用のジャーナルがありません。最初から実行します: {journal.path}")
+            
             # ブラウザ初期化
             await self.browser_manager.initialize()
             print("✅ ブラウザ初期化完了")
             
-            # 手動準備フェーズ（manual_loginフラグが有効な場合のみ）
-            if manual_login:
-                await self._manual_setup_phase(profile_url)
+            if article_urls:
+                print(f"♻️  ジャーナルの記事一覧を使用します: {len(article_urls)}件")
             else:
-                # 記事一覧ページに移動のみ
-                article_list_url = await self.browser_manager.navigate_to_article_list(profile_url)
-                print(f"📄 記事一覧に移動: {article_list_url}")
-            
-            # 記事収集
-            article_urls = await self.collector.collect_article_links(self.browser_manager.page)
-            print(f"✅ {len(article_urls)} 記事を発見")
-            
-            # 記事数制限適用
-            if limit and len(article_urls) > limit:
-                article_urls = article_urls[:limit]
-                print(f"⚡ 記事数を {limit} 記事に制限")
-            
-            # デバッグ: 記事数が少ない場合の詳細情報
-            if len(article_urls) < 30:
-                print(f"⚠️  記事数が少ないです ({len(article_urls)}記事)")
-                print("🔍 ページ内の全リンクを調査中...")
-                
-                # 全リンクをデバッグ
-                all_page_links = await self.browser_manager.page.query_selector_all('a')
-                note_links = []
-                for link in all_page_links:
-                    try:
-                        href = await link.get_attribute('href')
-                        if href and '/n/' in href:
-                            note_links.append(href)
-                    except:
-                        continue
-                        
-                print(f"🔍 ページ内の/n/リンク総数: {len(note_links)}")
-                print(f"🔍 最初の10個: {note_links[:10]}")
-                
-                # スクロール状況確認
-                scroll_height = await self.browser_manager.page.evaluate('document.body.scrollHeight')
-                print(f"🔍 ページの高さ: {scroll_height}px")
-                
-                # もっとみるボタンの存在確認
-                more_buttons = await self.browser_manager.page.query_selector_all('button')
-                for button in more_buttons:
-                    try:
-                        text = await button.text_content()
-                        if text and 'もっと' in text:
-                            print(f"🔍 発見したボタン: '{text}'")
-                    except:
-                        continue
+                article_urls = await self._collect_article_urls(profile_url, limit, manual_login,
+                                                                since=since, until=until, price=price)
             
             if not article_urls:
                 print("❌ 記事が見つかりませんでした")
                 return {'success': False, 'error': 'No articles found'}
             
-            # 各記事をスクレイピング
-            articles = await self._scrape_articles(article_urls)
-            
-            # CSV保存
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M")
-            filename = f"output/ihayato_final_{timestamp}.csv"
+            # CSV出力先
+            if not filename:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M")
+                filename = f"output/ihayato_final_{timestamp}.csv"
             
             # outputフォルダ作成（存在しない場合）
             os.makedirs("output", exist_ok=True)
             
-            result = self.exporter.save_to_csv(articles, filename)
+            # 進捗ジャーナル（1件取得するごとに記録）
+            if not resumed:
+                journal.start({'profile_url': profile_url, 'output': filename, 'urls': article_urls})
+            
+            # 各記事をスクレイピングし、取得ごとにCSVへ追記
+            sink = self.exporter.open_stream(filename)
+            try:
+                async for article in self._iter_articles(article_urls, completed):
+                    await sink.write_article(article)
+                    if article.url not in completed:
+                        journal.record(article)
+            except BaseException:
+                await sink.close()
+                journal.close()
+                print(f"💾 取得済みの記事は {journal.path} に記録されています（--resume で再開できます）")
+                raise
+            
+            result = await sink.finalize()
+            journal.discard()
             
             print(f"🎉 スクレイピング完了!")
             print(f"📁 ファイル: {result['filename']}")
             print(f"📊 記事数: {result['article_count']}")
             print(f"💾 サイズ: {result['file_size_mb']} MB")
+            recovery = self.browser_manager.recovery_stats()
+            if recovery['crash_count']:
+                print(f"💥 ブラウザのクラッシュ: {recovery['crash_count']}回（復旧 {recovery['recovery_seconds']}秒）")
             
             return {
                 'success': True,
                 'filename': result['filename'],
                 'article_count': result['article_count'],
-                'file_size_mb': result['file_size_mb']
+                'file_size_mb': result['file_size_mb'],
+                **recovery
             }
             
         except Exception as e:
             print(f"❌ エラー: {e}")
             return {'success': False, 'error': str(e)}
         finally:
+            journal.close()
             await self.browser_manager.close()
     
+    async def _collect_article_urls(self, profile_url: str, limit: int = None,
+                                    manual_login: bool = False, since: Optional[str] = None,
+                                    until: Optional[str] = None, price: Optional[Price] = None) -> List[str]:
+        """記事一覧ページから記事URLを収集"""
+        # 手動準備フェーズ（manual_loginフラグが有効な場合のみ）
+        if manual_login:
+            await self._manual_setup_phase(profile_url)
+        else:
+            # 記事一覧ページに移動のみ
+            article_list_url = await self.browser_manager.navigate_to_article_list(profile_url)
+            print(f"📄 記事一覧に移動: {article_list_url}")
+        
+        # 記事収集（カードの公開日・価格も同時に取得）
+        cards = await self.collector.collect_article_cards(self.browser_manager.page)
+        article_urls = [card['url'] for card in cards]
+        print(f"✅ {len(article_urls)} 記事を発見")
+        
+        # 公開日・価格で絞り込み（記事ページを開く前に適用）
+        if since or until or price is not None:
+            cards = self.collector.filter_cards(cards, since=since, until=until, price=price)
+            undated = sum(1 for card in cards if not card['date'])
+            print(f"🔎 絞り込み: {len(article_urls)}件 → {len(cards)}件"
+                  f"{f'（公開日不明の{undated}件を含む）' if undated else ''}")
+            article_urls = [card['url'] for card in cards]
+        
+        # 記事数制限適用
+        if limit and len(article_urls) > limit:
+            article_urls = article_urls[:limit]
+            print(f"⚡ 記事数を {limit} 記事に制限")
+        
+        # デバッグ: 記事数が少ない場合の詳細情報
+        if len(article_urls) < 30:
+            print(f"⚠️  記事数が少ないです ({len(article_urls)}記事)")
+            print("🔍 ページ内の全リンクを調査中...")
+            
+            # 全リンクをデバッグ
+            all_page_links = await self.browser_manager.page.query_selector_all('a')
+            note_links = []
+            for link in all_page_links:
+                try:
+                    href = await link.get_attribute('href')
+                    if href and '/n/' in href:
+                        note_links.append(href)
+                except:
+                    continue
+                    
+            print(f"🔍 ページ内の/n/リンク総数: {len(note_links)}")
+            print(f"🔍 最初の10個: {note_links[:10]}")
+            
+            # スクロール状況確認
+            scroll_height = await self.browser_manager.page.evaluate('document.body.scrollHeight')
+            print(f"🔍 ページの高さ: {scroll_height}px")
+            
+            # もっとみるボタンの存在確認
+            more_buttons = await self.browser_manager.page.query_selector_all('button')
+            for button in more_buttons:
+                try:
+                    text = await button.text_content()
+                    if text and 'もっと' in text:
+                        print(f"🔍 発見したボタン: '{text}'")
+                except:
+                    continue
+        
+        return article_urls
+    
     async def _manual_setup_phase(self, profile_url: str):
         """手動準備フェーズ"""
         print("\n" + "="*70)
@@ -171,83 +239,110 @@ class NoteScraper:
             
             await asyncio.sleep(3)
         
+        # ログイン後のCookieなどをクラッシュからの復旧用に控えておく
+        await self.browser_manager.save_storage_state()
         print("✅ 手動準備完了！自動処理を開始します")
         print("🔄 記事収集フェーズに移行します...")
     
-    async def _scrape_articles(self, article_urls: List[str]) -> List[Dict]:
+    async def _scrape_articles(self, article_urls: List[str]) -> List[Article]:
         """記事をスクレイピング"""
+        return [article async for article in self._iter_articles(article_urls)]
+    
+    async def _iter_articles(self, article_urls: List[str],
+                             completed: Optional[Dict[str, Article]] = None) -> AsyncIterator[Article]:
+        """記事を1件ずつスクレイピングして順に返す（completed にある記事は再取得しない）"""
+        completed = completed or {}
         print(f"\n📄 {len(article_urls)} 記事のスクレイピングを開始...")
+        if completed:
+            print(f"♻️  取得済み {len(completed)}件はスキップします")
         
-        articles = []
-        for i, url in enumerate(article_urls, 1):
-            try:
-                print(f"📄 記事 {i}/{len(article_urls)}: {url}")
-                
-                # ページに移動
-                await self.browser_manager.navigate_to_article(url)
-                
-                # タイトル取得（デバッグ付き）
-                page_title = await self.browser_manager.get_page_title()
-                print(f"🔍 デバッグ - ページタイトル: '{page_title}'")
-                
-                title = ''
-                if page_title:
-                    # noteの様々なタイトル形式に対応
-                    if '｜イケハヤ' in page_title:
-                        title = page_title.split('｜イケハヤ')[0].strip()
-                    elif '｜note' in page_title:
-                        title = page_title.split('｜note')[0].strip()
-                    elif '|note' in page_title:
-                        title = page_title.split('|note')[0].strip()
-                    elif ' - note' in page_title:
-                        title = page_title.split(' - note')[0].strip()
-                    else:
-                        title = page_title.strip()
-                
-                print(f"🔍 デバッグ - 最終タイトル: '{title}'")
-                
-                # ページ内容を取得してパース
-                content = await self.browser_manager.get_page_content()
-                soup = BeautifulSoup(content, 'html.parser')
-                
-                # 本文とメタデータ取得
-                formatted_content = self.formatter.extract_formatted_content(soup)
-                metadata = self.collector.extract_article_metadata(soup)
-                
-                # デバッグ: バナー検出状況
-                if '[バナー:' in formatted_content or '[画像バナー:' in formatted_content:
-                    print(f"🔍 バナー検出: {url}")
-                
-                # デバッグ: 埋め込み検出状況  
-                if '[埋め込み' in formatted_content or '[YouTube' in formatted_content or '[Twitter' in formatted_content:
-                    print(f"🔍 埋め込み検出: {url}")
-                
-                # 記事情報を作成
-                article = {
-                    'url': url,
-                    'title': title,
-                    'content': formatted_content,
-                    'date': metadata['date'],
-                    'price': metadata['price'],
-                    'purchase_status': metadata['purchase_status']
-                }
+        prefetcher = None
+        if self.prefetch_depth > 0:
+            print(f"⏩ 先読み: {self.prefetch_depth}件先まで別タブで開きます")
+            prefetcher = ArticlePrefetcher(lambda: self.browser_manager.context,
+                                           [url for url in article_urls if url not in completed],
+                                           self.prefetch_depth)
+        pending_index = 0
+        
+        try:
+            for i, url in enumerate(article_urls, 1):
+                if url in completed:
+                    yield completed[url]
+                    continue
                 
-                articles.append(article)
-                print(f"✅ '{title[:50]}...' を取得完了")
+                try:
+                    print(f"📄 記事 {i}/{len(article_urls)}: {url}")
+                    
+                    # 先読みしたタブがあればそこから読む（なければページに移動）
+                    fetched = None
+                    if prefetcher:
+                        pending_index += 1
+                        fetched = await prefetcher.read(pending_index - 1)
+                    if fetched is None:
+                        await self.browser_manager.navigate_to_article(url)
+                        fetched = (await self.browser_manager.get_page_title(),
+                                   await self.browser_manager.get_page_content())
+                    
+                    article = self._build_article(url, *fetched)
+                    print(f"✅ '{article.title[:50]}...' を取得完了")
+                    
+                except Exception as e:
+                    print(f"❌ スクレイピングエラー: {url} - {e}")
+                    # エラーでも処理継続
+                    article = Article.error(url, e)
                 
-                # サーバー負荷軽減
-                await asyncio.sleep(1.5)
+                yield article
                 
-            except Exception as e:
-                print(f"❌ スクレイピングエラー: {url} - {e}")
-                # エラーでも処理継続
-                articles.append({
-                    'url': url,
-                    'title': f"エラー: {e}",
-                    'content': f"エラーが発生しました: {e}",
-                    'date': '',
-                    'price': '',
-                    'purchase_status': ''
-                })
-        
-        return articles
\ No newline at end of file
+                # サーバー負荷軽減（先読み中はレート制限でページを開く間隔をあける）
+                if not prefetcher:
+                    await asyncio.sleep(1.5)
+        finally:
+            if prefetcher:
+                await prefetcher.close()
+                prefetcher.print_stats()
+    
+    def _build_article(self, url: str, page_title: str, content: str) -> Article:
+        """ページのタイトルとHTMLから記事情報を作成"""
+        # タイトル取得（デバッグ付き）
+        print(f"🔍 デバッグ - ページタイトル: '{page_title}'")
+        
+        title = ''
+        if page_title:
+            # noteの様々なタイトル形式に対応
+            if '｜イケハヤ' in page_title:
+                title = page_title.split('｜イケハヤ')[0].strip()
+            elif '｜note' in page_title:
+                title = page_title.split('｜note')[0].strip()
+            elif '|note' in page_title:
+                title = page_title.split('|note')[0].strip()
+            elif ' - note' in page_title:
+                title = page_title.split(' - note')[0].strip()
+            else:
+                title = page_title.strip()
+        
+        print(f"🔍 デバッグ - 最終タイトル: '{title}'")
+        
+        # ページ内容をパース
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # 本文とメタデータ取得
+        formatted_content = self.formatter.extract_formatted_content(soup)
+        metadata = self.collector.extract_article_metadata(soup)
+        
+        # デバッグ: バナー検出状況
+        if '[バナー:' in formatted_content or '[画像バナー:' in formatted_content:
+            print(f"🔍 バナー検出: {url}")
+        
+        # デバッグ: 埋め込み検出状況  
+        if '[埋め込み' in formatted_content or '[YouTube' in formatted_content or '[Twitter' in formatted_content:
+            print(f"🔍 埋め込み検出: {url}")
+        
+        # 記事情報を作成
+        return Article(
+            url=url,
+            title=title,
+            content=formatted_content,
+            date=metadata['date'],
+            price=metadata['price'],
+            purchase_status=metadata['purchase_status']
+        )
\ No newline at end of file
@@ -4,68 +4,205 @@
 """
 
 import asyncio
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Tuple, Union
 from pathlib import Path
 
+from .article import Article
 from .csv_manager import CSVManager
 from .url_differ import URLDiffer
 from .incremental_scraper import IncrementalScraper
+from .journal import CheckpointJournal
+from .listing import NoteAPIListing
+from .listing_cache import DEFAULT_LISTING_TTL, ListingCache
+from .article_store import ArticleStore
+from .feed import RSSFeed
+from .url_index import URLIndex
 
 
 class NoteScrapeUpdater:
     """Note記事の増分更新を管理するクラス"""
     
-    def __init__(self, profile_url: str, headless: bool = False):
+    def __init__(self, profile_url: str, headless: bool = False,
+                 listing: Optional[str] = None, stop_after: int = 5, use_feed: bool = True,
+                 use_probe: bool = True, listing_ttl: int = DEFAULT_LISTING_TTL,
+                 refresh_listing: bool = False, prefetch: int = 0):
         self.profile_url = profile_url
         self.csv_manager = CSVManager()
         self.url_differ = URLDiffer()
-        self.scraper = IncrementalScraper(headless)
+        # prefetch 件先の記事まで別タブで先読みする（0 なら先読みしない）
+        self.scraper = IncrementalScraper(headless, prefetch_depth=prefetch)
+        # 記事一覧の取得方法（None なら全件展開、'browser' / 'api' なら既知の記事が続いた時点で打ち切る）
+        self.listing = listing
+        self.stop_after = stop_after
+        # 先にRSSフィードで新規記事を特定できるか確認する（できなければ記事一覧を取得）
+        self.use_feed = use_feed
+        # 最初に記事数と最新記事だけを確認し、変わっていなければ一覧の取得もしない
+        self.use_probe = use_probe
+        # 直前に確認した記事数と最新記事（保存済みの記事一覧が古くないかの判定に使う）
+        self.last_probe: Optional[Dict[str, any]] = None
+        # 全件展開した記事一覧は listing_ttl 秒のあいだ保存して再利用する（refresh_listing=True なら取得し直す）
+        self.listing_cache = ListingCache(profile_url, listing_ttl)
+        self.refresh_listing = refresh_listing
+    
+    def _open_journal(self, existing_csv_path: str, resume: bool) -> CheckpointJournal:
+        """増分更新用のジャーナルを開く（resume=True なら前回の続きから）"""
+        base_name = Path(existing_csv_path).stem
+        journal = CheckpointJournal(CheckpointJournal.default_path(base_name, 'update'))
+        
+        if resume and journal.exists():
+            journal.resume()
+        else:
+            if resume:
+                print(f"ℹ️  再開用のジャーナルがありません。最初から実行します: {journal.path}")
+            journal.start({'profile_url': self.profile_url, 'existing_csv': existing_csv_path})
+        return journal
+    
+    async def _find_new_urls(self, existing_urls: Union[Set[str], URLIndex], manual_setup: bool,
+                             existing_csv_path: Optional[str] = None,
+                             probe: bool = True) -> Tuple[List[str], int]:
+        """RSSフィードまたは記事一覧から新規URLを特定（新規URLと確認した記事数を返す）"""
+        if probe:
+            unchanged_count = await self._probe_unchanged(existing_urls)
+            if unchanged_count is not None:
+                return [], unchanged_count
+        
+        if self.use_feed:
+            feed = await self._check_feed(existing_urls, existing_csv_path)
+            if feed is not None:
+                return feed['new_urls'], feed['item_count']
+        
+        if self.listing is None:
+            current_urls = await self._get_all_article_urls(manual_setup, self.last_probe)
+            return self.url_differ.calculate_new_urls(existing_urls, current_urls), len(current_urls)
+        
+        result = await self.scraper.get_new_article_urls(
+            self.profile_url, existing_urls,
+            stop_after=self.stop_after, source=self.listing, manual_setup=manual_setup
+        )
+        return result['new_urls'], result['checked_count']
+    
+    async def _get_all_article_urls(self, manual_setup: bool, probe: Optional[Dict[str, any]] = None) -> List[str]:
+        """全記事のURLを取得（有効期限内の保存済み記事一覧があれば展開しない）
+        
+        probe（記事数の確認結果）の総記事数と保存済みの記事一覧の件数が異なる場合は、
+        一覧が古いとみなして取得し直す。
+        """
+        if not self.refresh_listing:
+            cached_urls = self.listing_cache.load()
+            total_count = probe.get('total_count') if probe else None
+            if cached_urls is not None and total_count is not None and len(cached_urls) != total_count:
+                print(f"ℹ️  保存済みの記事一覧（{len(cached_urls)}件）が現在の記事数（{total_count}件）と異なるため取得し直します")
+                cached_urls = None
+            if cached_urls is not None:
+                return cached_urls
+        
+        current_urls = await self.scraper.get_all_article_urls_from_page(
+            self.profile_url, manual_setup=manual_setup
+        )
+        if current_urls:
+            self.listing_cache.save(current_urls)
+            # 取得し直した一覧は同じ実行の後続の処理でも再利用する
+            self.refresh_listing = False
+        return current_urls
+    
+    async def _probe_unchanged(self, existing_urls: Union[Set[str], URLIndex]) -> Optional[int]:
+        """記事一覧APIの総記事数と最新記事だけで変更の有無を確認（変更なしなら記事数、それ以外は None）
+        
+        総記事数が既存CSVの記事数と一致し、最新記事も既知なら新規記事はないとみなす（ブラウザ不要）。
+        """
+        self.last_probe = None
+        if not self.use_probe:
+            return None
+        try:
+            probe = await NoteAPIListing(self.profile_url).probe()
+        except Exception as e:
+            print(f"⚠️  記事数を確認できませんでした（通常どおり更新します）: {e}")
+            return None
+        self.last_probe = probe
+        
+        newest_url = probe['newest_url']
+        if probe['total_count'] != len(existing_urls) or not newest_url or newest_url not in existing_urls:
+            print(f"🔎 記事数の確認: 現在 {probe['total_count']}件 / 既存 {len(existing_urls)}件（更新を続けます）")
+            return None
+        print(f"⚡ 記事数（{probe['total_count']}件）と最新記事が既存CSVと一致しました（記事一覧の取得をスキップ）")
+        return probe['total_count']
+    
+    async def _check_feed(self, existing_urls: Union[Set[str], URLIndex],
+                          existing_csv_path: Optional[str]) -> Optional[Dict[str, any]]:
+        """RSSフィードだけで新規記事を特定できれば結果を返す（フィードと既存記事の間に抜けがあれば None）"""
+        state_path = f"{existing_csv_path}.rss.json" if existing_csv_path else None
+        feed = RSSFeed(self.profile_url, state_path)
+        print(f"📡 RSSフィードを確認: {feed.feed_url}")
+        try:
+            result = await feed.check(existing_urls)
+        except Exception as e:
+            print(f"⚠️  RSSフィードを取得できませんでした（記事一覧を使用します）: {e}")
+            return None
+        
+        if not result['covered']:
+            print("ℹ️  フィードより前に未取得の記事がある可能性があります（記事一覧を使用します）")
+            return None
+        print(f"✅ RSSフィードで新規記事を特定しました: {len(result['new_urls'])}件"
+              f"{'（フィード未更新）' if result['not_modified'] else ''}（記事一覧の取得をスキップ）")
+        return result
+    
+    def _save_new_articles(self, existing_csv_path: str, new_articles: List[Article],
+                           output_path: Optional[str], in_place: bool) -> Dict[str, any]:
+        """新規記事を保存（in_place=True なら既存CSVを直接更新、それ以外は別ファイルに出力）"""
+        if in_place:
+            return self.csv_manager.update_in_place(existing_csv_path, new_articles)
+        return self.csv_manager.merge_and_save(existing_csv_path, new_articles, output_path)
     
     async def update_from_csv(self, existing_csv_path: str, 
                              manual_setup: bool = True,
-                             output_path: Optional[str] = None) -> Dict[str, any]:
-        """既存CSVから増分更新を実行"""
+                             output_path: Optional[str] = None,
+                             resume: bool = False,
+                             in_place: bool = False) -> Dict[str, any]:
+        """既存CSVから増分更新を実行（resume=True なら中断した更新を再開、in_place=True なら既存CSVを直接更新）"""
         
         print("🚀 Note記事の増分更新を開始します")
         print(f"📄 対象プロフィール: {self.profile_url}")
         print(f"📁 既存CSV: {existing_csv_path}")
         print("=" * 70)
         
+        journal = self._open_journal(existing_csv_path, resume)
+        # 一覧取得と記事取得で同じブラウザを使う（ブラウザは必要になった時点で1回だけ起動）
+        self.scraper.begin_session()
+        
         try:
-            # ステップ1: 既存CSVの読み込み
+            # ステップ1: 既存データの確認（マニフェストから作ったURL索引を使い、CSV本体の読み込みはマージ時の1回のみ）
             print("📂 ステップ1: 既存データの読み込み")
-            existing_data = self.csv_manager.load_existing_csv(existing_csv_path)
-            existing_urls = existing_data['stats']['existing_urls']
+            existing_urls = self.csv_manager.url_index(existing_csv_path)
             
-            # ステップ2: 現在の記事一覧を取得
-            print("\n🌐 ステップ2: 現在の記事一覧を取得")
-            current_urls = await self.scraper.get_all_article_urls_from_page(
-                self.profile_url, manual_setup=manual_setup
-            )
-            
-            # ステップ3: 新規URLを計算
-            print("\n🔍 ステップ3: 新規記事の特定")
-            new_urls = self.url_differ.calculate_new_urls(existing_urls, current_urls)
+            if journal.metadata.get('new_urls') is not None:
+                # 前回の中断時点で新規URLは確定済み（記事一覧の再取得は不要）
+                new_urls = journal.metadata['new_urls']
+                current_count = journal.metadata.get('current_count', 0)
+                print(f"\n♻️  ジャーナルの新規URL一覧を使用します: {len(new_urls)}件（ステップ2・3をスキップ）")
+            else:
+                # ステップ2・3: 現在の記事一覧を取得して新規記事を特定
+                print("\n🌐 ステップ2・3: 記事一覧の取得と新規記事の特定")
+                new_urls, current_count = await self._find_new_urls(existing_urls, manual_setup, existing_csv_path)
+                journal.update_metadata(new_urls=new_urls, current_count=current_count)
             
             # ステップ4: 新規記事のスクレイピング
             print(f"\n📝 ステップ4: 新規記事のスクレイピング")
             if new_urls:
-                new_articles = await self.scraper.scrape_new_articles_only(new_urls)
+                new_articles = await self.scraper.scrape_new_articles_only(new_urls, journal)
             else:
                 print("📝 新規記事がありません")
                 new_articles = []
             
             # ステップ5: データのマージと保存
             print(f"\n💾 ステップ5: データのマージと保存")
-            result = self.csv_manager.merge_and_save(
-                existing_csv_path, new_articles, output_path
-            )
+            result = self._save_new_articles(existing_csv_path, new_articles, output_path, in_place)
+            journal.discard()
             
             # 結果サマリー
             print("\n" + "=" * 70)
             print("🎉 更新完了!")
             print(f"📊 既存記事: {len(existing_urls)}件")
-            print(f"📊 現在記事: {len(current_urls)}件")
+            print(f"📊 {'確認した記事' if self.listing or self.use_feed else '現在記事'}: {current_count}件")
             print(f"📊 新規記事: {len(new_urls)}件")
             print(f"📁 出力ファイル: {result['filename']}")
             print(f"💾 ファイルサイズ: {result['file_size_mb']} MB")
@@ -74,7 +211,7 @@ class NoteScrapeUpdater:
             return {
                 'success': True,
                 'existing_count': len(existing_urls),
-                'current_count': len(current_urls),
+                'current_count': current_count,
                 'new_count': len(new_urls),
                 'new_articles': new_articles,
                 'output_file': result['filename'],
@@ -83,30 +220,38 @@ class NoteScrapeUpdater:
             
         except Exception as e:
             print(f"❌ 更新エラー: {e}")
+            print(f"💾 進捗は {journal.path} に記録されています（--resume で再開できます）")
             return {
                 'success': False,
                 'error': str(e)
             }
+        finally:
+            await self.scraper.end_session()
+            journal.close()
     
     async def update_with_validation(self, existing_csv_path: str,
                                    manual_setup: bool = True,
                                    validate_urls: bool = True,
                                    batch_size: int = 5,
-                                   output_path: Optional[str] = None) -> Dict[str, any]:
+                                   output_path: Optional[str] = None,
+                                   resume: bool = False,
+                                   in_place: bool = False) -> Dict[str, any]:
         """URL検証付きの増分更新"""
         
         print("🚀 URL検証付き増分更新を開始します")
         
+        # 更新とURL検証で同じブラウザを使う
+        self.scraper.begin_session()
         try:
             # 基本更新を実行
             update_result = await self.update_from_csv(
-                existing_csv_path, manual_setup, output_path
+                existing_csv_path, manual_setup, output_path, resume=resume, in_place=in_place
             )
             
             if not update_result['success']:
                 return update_result
             
-            new_urls = [article['url'] for article in update_result['new_articles']]
+            new_urls = [article.url for article in update_result['new_articles']]
             
             # URL検証（オプション）
             if validate_urls and new_urls:
@@ -126,91 +271,118 @@ class NoteScrapeUpdater:
                 'success': False,
                 'error': str(e)
             }
+        finally:
+            await self.scraper.end_session()
     
     async def batch_update_with_progress(self, existing_csv_path: str,
                                        manual_setup: bool = True,
                                        batch_size: int = 5,
-                                       output_path: Optional[str] = None) -> Dict[str, any]:
+                                       output_path: Optional[str] = None,
+                                       resume: bool = False,
+                                       in_place: bool = False) -> Dict[str, any]:
         """バッチ処理付きの増分更新（単一ブラウザセッション）"""
         
         print("🚀 バッチ処理付き増分更新を開始します")
         
+        journal = self._open_journal(existing_csv_path, resume)
+        
         try:
-            # ステップ1: 既存データの読み込み
-            existing_data = self.csv_manager.load_existing_csv(existing_csv_path)
-            existing_urls = existing_data['stats']['existing_urls']
+            # ステップ1: 既存データの確認（マニフェストから作ったURL索引を使用）
+            existing_urls = self.csv_manager.url_index(existing_csv_path)
             
-            # ステップ2: 単一ブラウザセッションで全処理を実行
-            await self.scraper.browser_manager.initialize()
+            # 記事数と最新記事が変わっていなければブラウザを起動しない
+            unchanged_count = None
+            if journal.metadata.get('new_urls') is None:
+                unchanged_count = await self._probe_unchanged(existing_urls)
             
-            try:
-                # 記事一覧からURL取得
-                current_urls = await self.scraper.get_all_article_urls_from_page(
-                    self.profile_url, manual_setup=manual_setup
-                )
-                
-                # 新規URL計算
-                new_urls = self.url_differ.calculate_new_urls(existing_urls, current_urls)
+            # ステップ2: 単一ブラウザセッションで全処理を実行（ブラウザは必要になった時点で起動）
+            async with self.scraper:
+                if unchanged_count is not None:
+                    new_urls, current_count = [], unchanged_count
+                elif journal.metadata.get('new_urls') is not None:
+                    # 前回の中断時点で新規URLは確定済み
+                    new_urls = journal.metadata['new_urls']
+                    current_count = journal.metadata.get('current_count', 0)
+                    print(f"♻️  ジャーナルの新規URL一覧を使用します: {len(new_urls)}件")
+                else:
+                    # 記事一覧から新規URLを特定
+                    new_urls, current_count = await self._find_new_urls(existing_urls, manual_setup, existing_csv_path,
+                                                                        probe=False)
+                    journal.update_metadata(new_urls=new_urls, current_count=current_count)
                 
                 # 新規記事のスクレイピング（同一ブラウザセッション内で実行）
                 if new_urls:
                     print(f"\n📝 新規記事のスクレイピング開始: {len(new_urls)}件")
                     new_articles = []
+                    completed = journal.completed
+                    await self.scraper.open_browser()
+                    # バッチの区切りをまたいで先読みする（取得済みの記事は先読みしない）
+                    prefetcher = self.scraper.create_prefetcher([url for url in new_urls if url not in completed])
+                    pending_index = 0
                     
-                    # バッチ処理で新規記事を取得
-                    for batch_num in range(0, len(new_urls), batch_size):
-                        batch_urls = new_urls[batch_num:batch_num + batch_size]
-                        batch_index = batch_num // batch_size + 1
-                        total_batches = (len(new_urls) + batch_size - 1) // batch_size
-                        
-                        print(f"\n📦 バッチ {batch_index}/{total_batches} 処理中 ({len(batch_urls)}件)")
-                        
-                        for i, url in enumerate(batch_urls):
-                            global_index = batch_num + i + 1
-                            print(f"📄 記事 {global_index}/{len(new_urls)}: {url}")
+                    try:
+                        # バッチ処理で新規記事を取得
+                        for batch_num in range(0, len(new_urls), batch_size):
+                            batch_urls = new_urls[batch_num:batch_num + batch_size]
+                            batch_index = batch_num // batch_size + 1
+                            total_batches = (len(new_urls) + batch_size - 1) // batch_size
                             
-                            try:
-                                article = await self.scraper._scrape_single_article(url)
-                                new_articles.append(article)
-                                
-                                if article.get('title'):
-                                    print(f"✅ '{article['title'][:50]}...' を取得完了")
+                            print(f"\n📦 バッチ {batch_index}/{total_batches} 処理中 ({len(batch_urls)}件)")
+                            
+                            for i, url in enumerate(batch_urls):
+                                global_index = batch_num + i + 1
+                                if url in completed:
+                                    print(f"♻️  記事 {global_index}/{len(new_urls)}: 取得済み（スキップ）")
+                                    new_articles.append(completed[url])
+                                    continue
                                 
-                                await asyncio.sleep(1.5)
+                                print(f"📄 記事 {global_index}/{len(new_urls)}: {url}")
                                 
-                            except Exception as e:
-                                print(f"❌ エラー: {e}")
-                                new_articles.append({
-                                    'url': url,
-                                    'title': f"エラー: {e}",
-                                    'content': f"エラーが発生しました: {e}",
-                                    'date': '',
-                                    'price': '',
-                                    'purchase_status': ''
-                                })
-                        
-                        print(f"✅ バッチ {batch_index} 完了")
+                                try:
+                                    if prefetcher:
+                                        pending_index += 1
+                                        article = await self.scraper.scrape_prefetched_article(prefetcher, pending_index - 1,
+                                                                                               url)
+                                    else:
+                                        article = await self.scraper._scrape_single_article(url)
+                                    new_articles.append(article)
+                                    journal.record(article)
+                                    
+                                    if article.title:
+                                        print(f"✅ '{article.title[:50]}...' を取得完了")
+                                    
+                                    # サーバー負荷軽減（先読み中はレート制限でページを開く間隔をあける）
+                                    if not prefetcher:
+                                        await asyncio.sleep(1.5)
+                                    
+                                except Exception as e:
+                                    print(f"❌ エラー: {e}")
+                                    error_article = Article.error(url, e)
+                                    new_articles.append(error_article)
+                                    journal.record(error_article)
+                            
+                            print(f"✅ バッチ {batch_index} 完了")
+                    finally:
+                        if prefetcher:
+                            await prefetcher.close()
+                    if prefetcher:
+                        prefetcher.print_stats()
                     
                     print(f"🎉 全バッチ処理完了: {len(new_articles)}件")
                 else:
                     print("📝 新規記事がありません")
                     new_articles = []
-                
-            finally:
-                # ブラウザを確実に閉じる
-                await self.scraper.browser_manager.close()
             
             # ステップ3: マージと保存
-            result = self.csv_manager.merge_and_save(
-                existing_csv_path, new_articles, output_path
-            )
+            result = self._save_new_articles(existing_csv_path, new_articles, output_path, in_place)
+            journal.discard()
             
             print(f"\n🎉 バッチ更新完了! 新規記事: {len(new_articles)}件")
             
             return {
                 'success': True,
                 'existing_count': len(existing_urls),
-                'current_count': len(current_urls),
+                'current_count': current_count,
                 'new_count': len(new_urls),
                 'new_articles': new_articles,
                 'output_file': result['filename'],
@@ -219,10 +391,74 @@ class NoteScrapeUpdater:
             
         except Exception as e:
             print(f"❌ バッチ更新エラー: {e}")
+            print(f"💾 進捗は {journal.path} に記録されています（--resume で再開できます）")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+        finally:
+            journal.close()
+    
+    async def update_with_store(self, existing_csv_path: str, store_path: str,
+                                manual_setup: bool = True,
+                                output_path: Optional[str] = None) -> Dict[str, any]:
+        """SQLiteストアを正本とした増分更新（既存CSVの全件読み書きを行わない）"""
+        
+        print("🚀 ストアを使った増分更新を開始します")
+        print(f"🗄️  ストア: {store_path}")
+        
+        # 一覧取得と記事取得で同じブラウザを使う
+        self.scraper.begin_session()
+        try:
+            with ArticleStore(store_path) as store:
+                # ステップ1: 初回のみ既存CSVを取り込む
+                if store.count() == 0 and existing_csv_path:
+                    print("📂 ストアが空のため既存CSVを取り込みます（初回のみ）")
+                    store.import_csv(existing_csv_path)
+                existing_count = store.count()
+                print(f"📊 ストアの記事数: {existing_count}件")
+                
+                # ステップ2: 現在の記事一覧を取得
+                current_urls = await self._get_all_article_urls(manual_setup)
+                
+                # ステップ3: 主キー検索で新規URLを特定
+                new_urls = store.filter_new_urls(current_urls)
+                print(f"📊 新規記事: {len(new_urls)}件")
+                
+                # ステップ4: 新規記事のみスクレイピングしてupsert
+                new_articles = await self.scraper.scrape_new_articles_only(new_urls) if new_urls else []
+                upsert_result = store.upsert_articles(new_articles)
+                print(f"✅ ストア更新: 追加 {upsert_result['inserted']}件 / 更新 {upsert_result['updated']}件")
+                
+                # ステップ5: 出力先が指定された場合のみCSVを書き出す
+                output_file = None
+                file_size_mb = 0
+                if output_path:
+                    export_result = store.export_csv(output_path)
+                    output_file = export_result['filename']
+                    file_size_mb = export_result['file_size_mb']
+                    print(f"📁 CSV出力: {output_file}")
+                else:
+                    print("💡 CSVが必要な場合は --output を指定してください")
+                
+                return {
+                    'success': True,
+                    'existing_count': existing_count,
+                    'current_count': len(current_urls),
+                    'new_count': len(new_urls),
+                    'new_articles': new_articles,
+                    'output_file': output_file or store_path,
+                    'file_size_mb': file_size_mb
+                }
+        
+        except Exception as e:
+            print(f"❌ ストア更新エラー: {e}")
             return {
                 'success': False,
                 'error': str(e)
             }
+        finally:
+            await self.scraper.end_session()
     
     def check_csv_compatibility(self, csv_path: str) -> bool:
         """CSVファイルの互換性をチェック"""
@@ -233,11 +469,21 @@ class NoteScrapeUpdater:
             return False
     
     async def get_current_article_count(self, manual_setup: bool = True) -> int:
-        """現在の記事数を取得（更新前の確認用）"""
+        """現在の記事数を取得（更新前の確認用、保存済みの記事一覧・記事一覧APIの総記事数を優先）"""
+        cached_urls = None if self.refresh_listing else self.listing_cache.load()
+        if cached_urls is not None:
+            return len(cached_urls)
+        
+        if self.use_probe:
+            try:
+                total_count = (await NoteAPIListing(self.profile_url).probe())['total_count']
+                if total_count is not None:
+                    return int(total_count)
+            except Exception as e:
+                print(f"⚠️  記事一覧APIから記事数を取得できませんでした（記事一覧ページから数えます）: {e}")
+        
         try:
-            current_urls = await self.scraper.get_all_article_urls_from_page(
-                self.profile_url, manual_setup=manual_setup
-            )
+            current_urls = await self._get_all_article_urls(manual_setup)
             return len(current_urls)
         except Exception as e:
             print(f"❌ 記事数取得エラー: {e}")
@@ -246,8 +492,7 @@ class NoteScrapeUpdater:
     def analyze_update_potential(self, existing_csv_path: str) -> Dict[str, any]:
         """更新の必要性を分析（実際のスクレイピング前の事前チェック）"""
         try:
-            existing_data = self.csv_manager.load_existing_csv(existing_csv_path)
-            stats = existing_data['stats']
+            stats = self.csv_manager.get_csv_stats(existing_csv_path)
             
             analysis = {
                 'existing_articles': stats['total_articles'],
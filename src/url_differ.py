@@ -3,10 +3,52 @@ URL差分計算モジュール
 既存URLと取得URLから新規URLを計算
 """
 
-from typing import List, Set, Dict
+from typing import TYPE_CHECKING, List, Set, Dict, Union
 import re
 from urllib.parse import urljoin, urlparse
 
+import pandas as pd
+
+from .dtypes import STRING_DTYPE
+
+if TYPE_CHECKING:
+    from .url_index import URLIndex
+
+
+# Note記事URLの形式（正規化後のURLに対して使う）
+NOTE_ARTICLE_URL_PATTERN = r'https://note\.com/[^/]+/n/[a-zA-Z0-9_-]+$'
+# 記事URLの形式でも記事ではないパス
+EXCLUDED_URL_FRAGMENTS = ['/info/n/']
+
+
+# 文字列処理だけで URLDiffer._normalize_url と同じ結果になるURL（http(s) の絶対URLか / で始まる相対URLで、
+# パラメータ（;）・ドットセグメント・制御文字を含まないもの）
+SIMPLE_URL_PATTERN = r"^(?:https?://[A-Za-z0-9.-]+(?::\d+)?[^\s;?#]*|/(?:[^/\s;?#][^\s;?#]*)?)(?:[?#].*)?$"
+DOT_SEGMENT_PATTERN = r'/\.{1,2}(?:[/?#]|$)'
+
+
+def normalize_urls(urls: pd.Series, base_url: str = "https://note.com") -> pd.Series:
+    """URLDiffer._normalize_url と同じ正規化を列全体に行う（クエリ・フラグメント除去、絶対URL化）
+    
+    通常の形式のURLは列ごとの文字列処理で、それ以外（// で始まる・パラメータ付きなど）は
+    1件ずつ URLDiffer._normalize_url で正規化する。
+    """
+    text = urls.astype(STRING_DTYPE).fillna('')
+    simple = ((text.str.match(SIMPLE_URL_PATTERN) & ~text.str.contains(DOT_SEGMENT_PATTERN)) | (text == '')).to_numpy(dtype=bool)
+    
+    normalized = text.str.replace(r'[?#].*$', '', regex=True)
+    relative = normalized.str.startswith('/')
+    parsed_base = urlparse(base_url)
+    normalized = normalized.where(~relative, f"{parsed_base.scheme}://{parsed_base.netloc}" + normalized)
+    normalized = normalized.str.rstrip('/')
+    
+    if not simple.all():
+        differ = URLDiffer(base_url)
+        others = text[~simple]
+        normalized[~simple] = pd.Series([differ._normalize_url(url) for url in others], index=others.index,
+                                        dtype=STRING_DTYPE)
+    return normalized
+
 
 class URLDiffer:
     """URL差分を計算するクラス"""
@@ -14,22 +56,31 @@ class URLDiffer:
     def __init__(self, base_url: str = "https://note.com"):
         self.base_url = base_url
     
-    def calculate_new_urls(self, existing_urls: Set[str], current_urls: List[str]) -> List[str]:
-        """新規URLを計算"""
-        # 既存URLを正規化
-        normalized_existing = set(self._normalize_url(url) for url in existing_urls)
-        
-        # 現在のURLを正規化
-        normalized_current = [self._normalize_url(url) for url in current_urls]
-        
-        # 重複除去
-        unique_current = list(dict.fromkeys(normalized_current))  # 順序保持で重複除去
-        
-        # 新規URLを計算
-        new_urls = [url for url in unique_current if url not in normalized_existing]
+    def calculate_new_urls(self, existing_urls: Union[Set[str], 'URLIndex'],
+                           current_urls: List[str]) -> List[str]:
+        """新規URLを計算（existing_urls は既存URLの集合か、正規化済みURLの索引）"""
+        if not isinstance(existing_urls, (set, frozenset)):
+            # URL索引（url_index.URLIndex）は正規化済みなので、現在のURLだけ列ごとに正規化して照合する
+            unique_current = normalize_urls(pd.Series(current_urls, dtype=object), self.base_url)
+            unique_current = unique_current.drop_duplicates().to_numpy(dtype=object)
+            new_urls = unique_current[~existing_urls.contains(unique_current)].tolist()
+            existing_count = len(existing_urls)
+        else:
+            # 既存URLを正規化
+            normalized_existing = set(self._normalize_url(url) for url in existing_urls)
+            
+            # 現在のURLを正規化
+            normalized_current = [self._normalize_url(url) for url in current_urls]
+            
+            # 重複除去
+            unique_current = list(dict.fromkeys(normalized_current))  # 順序保持で重複除去
+            
+            # 新規URLを計算
+            new_urls = [url for url in unique_current if url not in normalized_existing]
+            existing_count = len(normalized_existing)
         
         print(f"📊 URL差分計算結果:")
-        print(f"   既存記事: {len(normalized_existing)}件")
+        print(f"   既存記事: {existing_count}件")
         print(f"   現在取得: {len(unique_current)}件")
         print(f"   新規記事: {len(new_urls)}件")
         
@@ -73,17 +124,9 @@ class URLDiffer:
         # 正規化
         normalized = self._normalize_url(url)
         
-        # Note記事のパターンチェック
-        patterns = [
-            r'https://note\.com/[^/]+/n/[a-zA-Z0-9_-]+$',  # 標準形式
-        ]
-        
-        for pattern in patterns:
-            if re.match(pattern, normalized):
-                # 除外パターンチェック
-                if '/info/n/' in normalized:
-                    return False
-                return True
+        # Note記事のパターンチェック（除外パターンに当たるものは記事ではない）
+        if re.match(NOTE_ARTICLE_URL_PATTERN, normalized):
+            return not any(fragment in normalized for fragment in EXCLUDED_URL_FRAGMENTS)
         
         return False
     
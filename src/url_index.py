@@ -0,0 +1,118 @@
+"""
+URL索引モジュール
+正規化URLを64ビットハッシュのソート済み配列で保持し、大量のURLの差分をまとめて計算する
+"""
+
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .url_differ import normalize_urls
+
+
+INDEX_VERSION = 1
+
+# pandas のハッシュ関数（SipHash）の鍵（保存した索引と同じ値を使う必要がある）
+HASH_KEY = '0123456789123456'
+
+
+def hash_urls(urls) -> np.ndarray:
+    """正規化済みURLの配列を uint64 のハッシュ値に変換"""
+    return pd.util.hash_array(np.asarray(urls, dtype=object), hash_key=HASH_KEY, categorize=False)
+
+
+class URLIndex:
+    """正規化URLのハッシュ索引
+    
+    hashes はソート済みの uint64 配列で、同じ順に並べたURL文字列を1つのUTF-8バイト列（blob）と
+    区切り位置（offsets）で持つ。照合はハッシュの二分探索でまとめて行い、
+    ハッシュが一致したものだけ文字列を比較して衝突を除く。
+    """
+    
+    def __init__(self, hashes: np.ndarray, offsets: np.ndarray, blob: np.ndarray,
+                 source: Optional[Dict[str, int]] = None):
+        self.hashes = hashes
+        self.offsets = offsets
+        self.blob = blob
+        self.source = source
+    
+    @classmethod
+    def build(cls, urls: Iterable[str], source: Optional[Dict[str, int]] = None) -> 'URLIndex':
+        """正規化済みURLから索引を作成（空欄・重複は除く）"""
+        unique = pd.unique(np.asarray([url for url in urls if url], dtype=object))
+        hashes = hash_urls(unique)
+        order = np.argsort(hashes, kind='stable')
+        
+        encoded = [url.encode('utf-8') for url in unique[order]]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(url) for url in encoded], out=offsets[1:])
+        blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(hashes[order], offsets, blob, source)
+    
+    @classmethod
+    def load(cls, path: str) -> Optional['URLIndex']:
+        """保存した索引を読み込む（ない・形式が違う場合は None）"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data['meta']))
+                if meta.get('version') != INDEX_VERSION or meta.get('hash_key') != HASH_KEY:
+                    return None
+                return cls(data['hashes'], data['offsets'], data['blob'], meta.get('source'))
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def save(self, path: str):
+        """索引を保存（一時ファイル経由で置き換え）"""
+        meta = {'version': INDEX_VERSION, 'hash_key': HASH_KEY, 'source': self.source}
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as f:
+            np.savez(f, hashes=self.hashes, offsets=self.offsets, blob=self.blob, meta=np.array(json.dumps(meta)))
+        os.replace(temp_path, path)
+    
+    def __len__(self) -> int:
+        return len(self.hashes)
+    
+    def __contains__(self, url: str) -> bool:
+        return bool(self.contains(normalize_urls(pd.Series([url])).to_numpy(dtype=object))[0])
+    
+    @property
+    def nbytes(self) -> int:
+        """索引のメモリ使用量（バイト）"""
+        return self.hashes.nbytes + self.offsets.nbytes + self.blob.nbytes
+    
+    def urls(self) -> List[str]:
+        """索引のURL一覧（ハッシュ順）"""
+        return [self._url_at(i) for i in range(len(self))]
+    
+    def contains(self, normalized_urls: np.ndarray) -> np.ndarray:
+        """正規化済みURLの配列それぞれが索引にあるか（bool 配列）"""
+        found = np.zeros(len(normalized_urls), dtype=bool)
+        if len(self) == 0 or len(normalized_urls) == 0:
+            return found
+        
+        hashes = hash_urls(normalized_urls)
+        positions = np.searchsorted(self.hashes, hashes)
+        candidates = positions < len(self)
+        candidates[candidates] = self.hashes[positions[candidates]] == hashes[candidates]
+        
+        # ハッシュが一致したものだけ文字列を比較（同じハッシュ値の項目が続く場合はすべて確認）
+        for i in np.flatnonzero(candidates):
+            position = positions[i]
+            while position < len(self) and self.hashes[position] == hashes[i]:
+                if self._url_at(position) == normalized_urls[i]:
+                    found[i] = True
+                    break
+                position += 1
+        return found
+    
+    def merge(self, urls: Iterable[str]) -> 'URLIndex':
+        """URLを追加した新しい索引（正規化済みURLを渡す）"""
+        return URLIndex.build(self.urls() + list(urls), self.source)
+    
+    def _url_at(self, position: int) -> str:
+        return self.blob[self.offsets[position]:self.offsets[position + 1]].tobytes().decode('utf-8')
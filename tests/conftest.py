@@ -0,0 +1,28 @@
+"""
+テスト共通のフィクスチャ
+"""
+
+from typing import Optional
+
+import pytest
+
+
+@pytest.fixture
+def make_article():
+    """テスト用の記事データ（dict）を作る関数
+    
+    make_article(i) で i 番目の記事（公開日は 2025-01-<i>）を作る。
+    query はURLの末尾に付ける文字列、fields は content・price などの上書き。
+    """
+    def make(i: int, date: Optional[str] = None, query: str = '', **fields) -> dict:
+        article = {
+            'url': f'https://note.com/user/n/n{i}{query}',
+            'title': f'記事{i}',
+            'content': f'本文{i}\n二行目',
+            'date': date if date is not None else f'2025-01-{i:02d}',
+            'price': '無料',
+            'purchase_status': '無料'
+        }
+        article.update(fields)
+        return article
+    return make
@@ -0,0 +1,39 @@
+"""
+記事アーカイブのテスト
+"""
+
+import pytest
+
+from src.csv_manager import CSVManager
+from src.exporter import CSVExporter
+
+pytest.importorskip('zstandard')
+
+from src.archive import ArticleArchive
+
+
+class TestArticleArchive:
+    def setup_method(self):
+        self.manager = CSVManager()
+    
+    def test_random_access_and_round_trip(self, tmp_path, make_article):
+        """URLで必要なフレームだけ読めて、CSVに戻すと元と同じになるテスト"""
+        csv_path = str(tmp_path / 'articles.csv')
+        archive_path = str(tmp_path / 'articles.jsonl.zst')
+        CSVExporter().save_to_csv([make_article(i) for i in range(1, 11)], csv_path)
+        
+        result = self.manager.export_archive(csv_path, archive_path, frame_size=3)
+        assert result['frame_count'] == 4
+        
+        with ArticleArchive(archive_path, cache_frames=1) as archive:
+            assert len(archive) == 10
+            assert 'https://note.com/user/n/n7?ref=x' in archive
+            assert archive.get('https://note.com/user/n/n7')['title'] == '記事7'
+            assert archive.get('https://note.com/user/n/n99') is None
+            
+            found = archive.get_many(['https://note.com/user/n/n2', 'https://note.com/user/n/n9'])
+            assert found['https://note.com/user/n/n9']['content'] == '本文9\n二行目'
+        
+        restored = str(tmp_path / 'restored.csv')
+        self.manager.import_archive(archive_path, restored)
+        assert self.manager.read_csv(restored).equals(self.manager.read_csv(csv_path))
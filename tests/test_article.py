@@ -0,0 +1,51 @@
+"""
+記事レコードのテスト
+"""
+
+from datetime import datetime
+
+from src.article import Article, Price, PurchaseStatus
+
+
+class TestArticle:
+    def setup_method(self):
+        self.row = {
+            '番号': '3',
+            '公開日': '2025-01-02T09:30:00+09:00',
+            'タイトル': 'タイトル',
+            '本文': '本文\n二行目',
+            '価格': '有料',
+            '購入状況': '購入済み or 無料',
+            'URL': 'https://note.com/user/n/n1'
+        }
+    
+    def test_row_round_trip(self):
+        """CSVの1行から作って戻すと同じ値になり、価格・購入状況は列挙型になるテスト"""
+        article = Article.from_row(self.row)
+        
+        assert article.price is Price.PAID
+        assert article.purchase_status is PurchaseStatus.PURCHASED_OR_FREE
+        assert article.number == 3
+        assert article.published_at == datetime.fromisoformat('2025-01-02T09:30:00+09:00')
+        assert article.to_row(3) == self.row | {'番号': 3}
+    
+    def test_unknown_values_and_missing_fields(self):
+        """未知の価格は文字列のまま残り、欠損値は空欄になるテスト"""
+        row = self.row | {'価格': '¥500', '公開日': float('nan'), 'タイトル': None}
+        article = Article.from_row(row)
+        
+        assert article.price == '¥500'
+        assert article.date == ''
+        assert article.title == ''
+        assert article.published_at is None
+        assert article.to_row(1)['価格'] == '¥500'
+    
+    def test_error_article(self):
+        """エラー記事の判定と、辞書としての参照のテスト"""
+        article = Article.error('https://note.com/user/n/n1', ValueError('timeout'))
+        
+        assert article.is_error
+        assert article['title'] == 'エラー: timeout'
+        assert article.get('price') == ''
+        assert not Article.from_dict(Article.from_row(self.row).to_dict()).is_error
+        assert Article.coerce(article.to_dict()) == article
@@ -0,0 +1,31 @@
+"""
+記事ストアのテスト
+"""
+
+import pandas as pd
+from src.article_store import ArticleStore
+
+
+class TestArticleStore:
+    def test_upsert_and_export(self, tmp_path, make_article):
+        """正規化URLでupsertし、公開日順の番号付きCSVを書き出すテスト"""
+        with ArticleStore(str(tmp_path / 'articles.db')) as store:
+            result = store.upsert_articles([make_article(1, '2025-01-02', query='?ref=top'),
+                                            make_article(2, '2025-01-01', query='?ref=top')])
+            assert result == {'inserted': 2, 'updated': 0, 'unchanged': 0}
+            
+            result = store.upsert_articles([make_article(1, '2025-01-02', query='?ref=top'),
+                                            make_article(2, '2025-01-01', query='?ref=top', content='改訂版')])
+            assert result == {'inserted': 0, 'updated': 1, 'unchanged': 1}
+            
+            assert store.filter_new_urls([
+                'https://note.com/user/n/n1', 'https://note.com/user/n/n3/', '/user/n/n3'
+            ]) == ['https://note.com/user/n/n3/']
+            
+            output = str(tmp_path / 'out.csv')
+            store.export_csv(output)
+        
+        df = pd.read_csv(output, encoding='utf-8-sig')
+        assert list(df['番号']) == [2, 1]
+        assert list(df['公開日']) == ['2025-01-02', '2025-01-01']
+        assert df['本文'].iloc[1] == '改訂版'
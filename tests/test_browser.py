@@ -0,0 +1,186 @@
+"""
+Playwright ランタイム共有のテスト
+"""
+
+import asyncio
+
+import src.browser as browser
+from src.browser import BrowserManager, PlaywrightRuntime
+
+
+class FakeBrowser:
+    def __init__(self, launched):
+        self.connected = True
+        self.contexts = []
+        launched.append(self)
+    
+    def is_connected(self):
+        return self.connected
+    
+    async def new_context(self, **kwargs):
+        self.contexts.append(FakeContext(self, kwargs.get('storage_state')))
+        return self.contexts[-1]
+    
+    async def close(self):
+        self.connected = False
+
+
+class FakeContext:
+    def __init__(self, browser, storage_state):
+        self.browser = browser
+        self.restored_state = storage_state
+        self.pages = []
+        self.saved = 0
+    
+    def set_default_timeout(self, timeout):
+        pass
+    
+    async def new_page(self):
+        self.pages.append(FakePage(self.browser))
+        return self.pages[-1]
+    
+    async def storage_state(self):
+        self.saved += 1
+        return {'cookies': [{'name': 'session', 'value': 'logged-in'}]}
+
+
+class FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+        self.visited = []
+    
+    def set_default_timeout(self, timeout):
+        pass
+    
+    def is_closed(self):
+        return not self.browser.connected
+    
+    async def goto(self, url, **kwargs):
+        self._check()
+        self.visited.append(url)
+    
+    async def wait_for_timeout(self, ms):
+        pass
+    
+    async def content(self):
+        self._check()
+        return f'<html>{self.visited[-1]}</html>'
+    
+    def _check(self):
+        if not self.browser.connected:
+            raise RuntimeError('Target page, context or browser has been closed')
+
+
+class FakeChromium:
+    def __init__(self):
+        self.launched = []
+    
+    async def launch(self, **kwargs):
+        return FakeBrowser(self.launched)
+
+
+class FakePlaywright:
+    def __init__(self, counts):
+        self.counts = counts
+        self.chromium = FakeChromium()
+    
+    async def start(self):
+        self.counts['start'] += 1
+        return self
+    
+    async def stop(self):
+        self.counts['stop'] += 1
+
+
+class TestPlaywrightRuntime:
+    def setup_method(self):
+        self.counts = {'start': 0, 'stop': 0}
+    
+    def test_browsers_share_one_runtime(self, monkeypatch):
+        """複数のブラウザで1つのドライバーを共有し、最後に閉じたときだけ停止するテスト"""
+        monkeypatch.setattr(browser, 'async_playwright', lambda: FakePlaywright(self.counts))
+        
+        async def run():
+            first, second = BrowserManager(headless=True), BrowserManager(headless=True)
+            await first.initialize()
+            await second.initialize()
+            assert PlaywrightRuntime.refcount() == 2
+            
+            await first.close()
+            await first.close()
+            assert self.counts == {'start': 1, 'stop': 0}
+            await second.close()
+            assert PlaywrightRuntime.refcount() == 0
+            
+            await first.initialize()
+            await first.close()
+        
+        asyncio.run(run())
+        assert self.counts == {'start': 2, 'stop': 2}
+    
+    def test_recovers_from_crash_and_reopens_url(self, monkeypatch):
+        """ブラウザが落ちたら再起動してCookieを戻し、処理中のURLを開き直すテスト"""
+        runtime = FakePlaywright(self.counts)
+        monkeypatch.setattr(browser, 'async_playwright', lambda: runtime)
+        url = 'https://note.com/user/n/n1'
+        
+        async def run():
+            manager = BrowserManager(headless=True)
+            await manager.initialize(show_instructions=False)
+            await manager.navigate_to_article(url)
+            runtime.chromium.launched[0].connected = False
+            
+            html = await manager.get_page_content()
+            stats = manager.recovery_stats()
+            await manager.close()
+            return html, stats
+        
+        html, stats = asyncio.run(run())
+        relaunched = runtime.chromium.launched[1].contexts[0]
+        assert html == f'<html>{url}</html>'
+        assert relaunched.restored_state == {'cookies': [{'name': 'session', 'value': 'logged-in'}]}
+        assert relaunched.pages[0].visited == [url]
+        assert stats['crash_count'] == 1
+        assert self.counts == {'start': 1, 'stop': 1}
+    
+    def test_recovers_from_crash_during_wait(self, monkeypatch):
+        """ページを開いた後の待機中に落ちても再起動して開き直すテスト"""
+        runtime = FakePlaywright(self.counts)
+        monkeypatch.setattr(browser, 'async_playwright', lambda: runtime)
+        url = 'https://note.com/user/n/n1'
+        
+        async def run():
+            manager = BrowserManager(headless=True)
+            await manager.initialize(show_instructions=False)
+            crashed = runtime.chromium.launched[0]
+            
+            async def crash(ms):
+                crashed.connected = False
+                raise RuntimeError('Target page, context or browser has been closed')
+            
+            manager.page.wait_for_timeout = crash
+            await manager.navigate_to_article(url)
+            stats = manager.recovery_stats()
+            await manager.close()
+            return stats
+        
+        stats = asyncio.run(run())
+        assert runtime.chromium.launched[1].contexts[0].pages[0].visited == [url]
+        assert stats['crash_count'] == 1
+    
+    def test_storage_state_saved_every_n_navigations(self, monkeypatch):
+        """Cookieなどの保存はページ移動のたびではなく、ログイン後と N 回ごとに行うテスト"""
+        runtime = FakePlaywright(self.counts)
+        monkeypatch.setattr(browser, 'async_playwright', lambda: runtime)
+        
+        async def run():
+            manager = BrowserManager(headless=True, storage_state_every=3)
+            await manager.initialize(show_instructions=False)
+            for i in range(7):
+                await manager.navigate_to_article(f'https://note.com/user/n/n{i}')
+            await manager.save_storage_state()
+            await manager.close()
+        
+        asyncio.run(run())
+        # 初回・4回目・7回目の移動後と、明示的な保存の計4回
+        assert runtime.chromium.launched[0].contexts[0].saved == 4
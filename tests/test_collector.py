@@ -50,4 +50,43 @@ class TestArticleCollector:
         metadata = self.collector.extract_article_metadata(soup)
         
         assert metadata['price'] == '無料'
-        assert metadata['purchase_status'] == '無料'
\ No newline at end of file
+        assert metadata['purchase_status'] == '無料'
+    
+    def test_parse_card(self):
+        """一覧カードから公開日・価格・スキ数を読み取るテスト"""
+        card = self.collector.parse_card({
+            'href': '/user/n/nabc123?from=top',
+            'datetime': '2025-01-06T10:00:00.000+09:00',
+            'likes': '1,234',
+            'text': '月10万円稼ぐ方法\n￥500\n1,234'
+        })
+        assert card == {
+            'url': 'https://note.com/user/n/nabc123',
+            'date': '2025-01-06',
+            'price': '有料',
+            'like_count': 1234
+        }
+        
+        card = self.collector.parse_card({'href': '/user/n/ndef', 'datetime': '2025年1月5日', 'likes': '', 'text': '月10万円'})
+        assert card['date'] == '2025-01-05'
+        assert card['price'] == '無料'
+        assert card['like_count'] is None
+    
+    def test_filter_cards(self):
+        """公開日・価格での絞り込みテスト（公開日不明のカードは残す）"""
+        cards = [
+            {'url': 'a', 'date': '2025-02-01', 'price': '有料', 'like_count': None},
+            {'url': 'b', 'date': '2025-01-15', 'price': '無料', 'like_count': None},
+            {'url': 'c', 'date': '2025-01-01', 'price': '無料', 'like_count': None},
+            {'url': 'd', 'date': '', 'price': '無料', 'like_count': None}
+        ]
+        
+        in_window = self.collector.filter_cards(cards, since='2025-01-01', until='2025-01-31')
+        assert [card['url'] for card in in_window] == ['b', 'c', 'd']
+        assert [card['url'] for card in self.collector.filter_cards(cards, price='有料')] == ['a']
+    
+    def test_card_date_in_japan_time(self):
+        """UTC（Z）の公開日は日本時間の日付にして絞り込むテスト"""
+        card = self.collector.parse_card({'href': '/user/n/nabc', 'datetime': '2025-01-01T20:00:00Z', 'likes': '', 'text': ''})
+        assert card['date'] == '2025-01-02'
+        assert self.collector.filter_cards([card], until='2025-01-01') == []
@@ -0,0 +1,117 @@
+"""
+CSV管理のテスト
+"""
+
+import pandas as pd
+
+from src.csv_manager import CSVManager
+
+
+class TestCSVManager:
+    def setup_method(self):
+        self.manager = CSVManager()
+    
+    def _write_csv(self, path):
+        df = pd.DataFrame({
+            '番号': [2, 1],
+            '公開日': ['2025-02-01 10:00', '2025-01-01 09:00'],
+            'タイトル': ['記事2', '記事1'],
+            '本文': ['本文2\n二行目', '本文1'],
+            '価格': ['無料', '500円'],
+            '購入状況': ['無料', '未購入'],
+            'URL': ['https://note.com/user/n/n2', 'https://note.com/user/n/n1']
+        })
+        df.to_csv(path, index=False, encoding='utf-8-sig', quoting=1)
+    
+    def test_projected_and_chunked_loading(self, tmp_path):
+        """列を絞った読み込み・チャンク読み込みが全件読み込みと同じ結果になるテスト"""
+        path = str(tmp_path / 'articles.csv')
+        self._write_csv(path)
+        
+        full = self.manager.load_existing_csv(path)
+        stats = self.manager.load_stats(path)
+        assert stats['existing_urls'] == full['stats']['existing_urls']
+        assert stats['date_range'] == full['stats']['date_range'] == '2025-01-01 〜 2025-02-01'
+        assert stats['latest_date'] == '2025-02-01 10:00:00'
+        
+        for engine in {'c', self.manager.fast_engine}:
+            df = self.manager.read_csv(path, columns=['URL', '存在しない列'], engine=engine)
+            assert list(df.columns) == ['URL']
+        
+        chunks = list(self.manager.read_csv(path, columns=['番号'], chunksize=1))
+        assert [len(chunk) for chunk in chunks] == [1, 1]
+    
+    def test_merge_and_save_streaming(self, tmp_path):
+        """既存CSV（ソート済み・未ソート）と新規記事のマージで番号と並び順が正しいテスト"""
+        new_articles = [{
+            'url': 'https://note.com/user/n/n3',
+            'title': '記事3',
+            'content': '本文3',
+            'date': '2025-01-15 12:00',
+            'price': '無料',
+            'purchase_status': '無料'
+        }]
+        
+        for ascending in (False, True):
+            path = str(tmp_path / f'articles_{ascending}.csv')
+            self._write_csv(path)
+            if ascending:
+                df = pd.read_csv(path, encoding='utf-8-sig').iloc[::-1]
+                df.to_csv(path, index=False, encoding='utf-8-sig', quoting=1)
+            
+            output = str(tmp_path / f'merged_{ascending}.csv')
+            result = self.manager.merge_and_save(path, new_articles, output)
+            
+            merged = pd.read_csv(output, encoding='utf-8-sig')
+            assert result['total_articles_count'] == 3
+            assert list(merged['タイトル']) == ['記事2', '記事3', '記事1']
+            assert list(merged['番号']) == [3, 2, 1]
+            assert merged['本文'].iloc[0] == '本文2\n二行目'
+    
+    def test_update_in_place(self, tmp_path):
+        """新規記事が最新なら先頭に追加し、そうでなければ全体を書き直すテスト"""
+        path = str(tmp_path / 'articles.csv')
+        self._write_csv(path)
+        
+        latest = {'url': 'https://note.com/user/n/n4', 'title': '記事4', 'content': '本文4',
+                  'date': '2025-03-01 08:00', 'price': '無料', 'purchase_status': '無料'}
+        older = dict(latest, url='https://note.com/user/n/n0', title='記事0', date='2024-12-31 23:00')
+        
+        result = self.manager.update_in_place(path, [latest])
+        assert result['total_articles_count'] == 3
+        merged = pd.read_csv(path, encoding='utf-8-sig')
+        assert list(merged['タイトル']) == ['記事4', '記事2', '記事1']
+        assert list(merged['番号']) == [3, 2, 1]
+        assert self.manager.get_csv_stats(path)['latest_date'] == '2025-03-01 08:00:00'
+        
+        self.manager.update_in_place(path, [older])
+        merged = pd.read_csv(path, encoding='utf-8-sig')
+        assert list(merged['タイトル']) == ['記事4', '記事2', '記事1', '記事0']
+        assert list(merged['番号']) == [4, 3, 2, 1]
+    
+    def test_url_only_load_does_not_hide_dates(self, tmp_path):
+        """URL列のみの読み込みの後でも、全列の読み込みで公開日の統計が取れるテスト"""
+        path = str(tmp_path / 'articles.csv')
+        self._write_csv(path)
+        
+        projected = self.manager.load_existing_csv(path, columns=['URL'])
+        assert projected['stats']['latest_date'] is None
+        
+        full = self.manager.load_existing_csv(path)
+        assert full['stats']['date_range'] == '2025-01-01 〜 2025-02-01'
+        assert full['stats']['latest_date'] == '2025-02-01 10:00:00'
+    
+    def test_update_in_place_renumbers_scraper_order(self, tmp_path):
+        """最新記事が番号1のCSV（スクレイパーの取得順）は先頭に追加せず番号を振り直すテスト"""
+        path = str(tmp_path / 'articles.csv')
+        self._write_csv(path)
+        df = pd.read_csv(path, encoding='utf-8-sig')
+        df['番号'] = [1, 2]
+        df.to_csv(path, index=False, encoding='utf-8-sig', quoting=1)
+        
+        latest = {'url': 'https://note.com/user/n/n4', 'title': '記事4', 'content': '本文4',
+                  'date': '2025-03-01 08:00', 'price': '無料', 'purchase_status': '無料'}
+        self.manager.update_in_place(path, [latest])
+        merged = pd.read_csv(path, encoding='utf-8-sig')
+        assert list(merged['タイトル']) == ['記事4', '記事2', '記事1']
+        assert list(merged['番号']) == [3, 2, 1]
@@ -0,0 +1,60 @@
+"""
+ストリーミングCSV出力のテスト
+"""
+
+import asyncio
+import os
+
+import pandas as pd
+from src.exporter import CSVExporter
+
+
+class TestStreamingCSVWriter:
+    def setup_method(self):
+        self.exporter = CSVExporter()
+    
+    def test_stream_and_finalize(self, tmp_path, make_article):
+        """逐次追記したCSVが一括保存と同じ内容になるテスト"""
+        filename = str(tmp_path / 'out.csv')
+        articles = [make_article(1, '2025-01-01'), make_article(2, '2025-01-02')]
+        
+        async def run():
+            sink = self.exporter.open_stream(filename, fsync_every=1)
+            for article in articles:
+                await sink.write_article(article)
+            return await sink.finalize()
+        
+        result = asyncio.run(run())
+        
+        assert result['article_count'] == 2
+        assert not os.path.exists(filename + '.partial')
+        
+        expected_path = str(tmp_path / 'expected.csv')
+        self.exporter.save_to_csv(articles, expected_path)
+        assert pd.read_csv(filename, encoding='utf-8-sig').equals(
+            pd.read_csv(expected_path, encoding='utf-8-sig'))
+    
+    def test_resume_partial_and_sort(self, tmp_path, make_article):
+        """中断した .partial に追記再開し、公開日順で確定するテスト"""
+        filename = str(tmp_path / 'out.csv')
+        
+        async def first_run():
+            sink = self.exporter.open_stream(filename)
+            await sink.write_article(make_article(1, '2025-01-02'))
+            await sink.close()
+        
+        async def second_run():
+            sink = self.exporter.open_stream(filename, resume=True)
+            await sink.write_article(make_article(2, '2025-01-01'))
+            return await sink.finalize(sort_by_date=True)
+        
+        asyncio.run(first_run())
+        assert os.path.exists(filename + '.partial')
+        result = asyncio.run(second_run())
+        
+        df = pd.read_csv(filename, encoding='utf-8-sig')
+        assert result['article_count'] == 2
+        assert list(df.columns)[0] == '番号'
+        assert df['タイトル'].tolist() == ['記事1', '記事2']
+        assert df['番号'].tolist() == [2, 1]
+        assert df['本文'].tolist()[0] == '本文1\n二行目'
@@ -0,0 +1,58 @@
+"""
+CSV検証のテスト
+"""
+
+import pandas as pd
+
+from src.csv_manager import CSVManager
+from src.csv_validator import CSVValidator
+from src.url_differ import URLDiffer
+
+
+class TestCSVValidator:
+    def setup_method(self):
+        self.validator = CSVValidator()
+        self.df = pd.DataFrame({
+            '番号': [5, 4, 3, 2, 1],
+            '公開日': ['2025-02-01T10:00:00.000+09:00', '2025-01-20 09:00', '昨日', '', '2025-01-01'],
+            'タイトル': ['記事5', 'エラー: timeout', '記事3', '記事2', '記事1'],
+            '本文': ['本文5', 'エラーが発生しました: timeout', ' \n', '本文2', '本文1'],
+            '価格': ['無料'] * 5,
+            '購入状況': ['無料'] * 5,
+            'URL': [
+                'https://note.com/user/n/n5',
+                'https://note.com/user/n/n5?from=top',
+                'https://note.com/info/n/n3',
+                '',
+                'https://example.com/n1'
+            ]
+        })
+    
+    def test_report(self):
+        """URL形式・URL重複・公開日・エラー記事・空の本文を検出するテスト"""
+        report = self.validator.validate(self.df)
+        issues = report['issues']
+        
+        assert not report['valid']
+        assert report['row_count'] == 5
+        assert issues['missing_url'] == {'count': 1, 'rows': [3]}
+        assert issues['invalid_url'] == {'count': 2, 'rows': [2, 4]}
+        assert issues['duplicate_url'] == {'count': 1, 'rows': [1]}
+        assert issues['unparseable_date'] == {'count': 1, 'rows': [2]}
+        assert issues['error_row'] == {'count': 1, 'rows': [1]}
+        assert issues['empty_body'] == {'count': 1, 'rows': [2]}
+        
+        differ = URLDiffer()
+        shaped = [differ._is_valid_note_article_url(url) for url in self.df['URL']]
+        assert shaped == [True, True, False, False, False]
+    
+    def test_health_report_from_csv(self, tmp_path):
+        """CSVから読み込んで問題のないCSVは valid になるテスト"""
+        path = str(tmp_path / 'articles.csv')
+        clean = self.df.iloc[[0, 4]].assign(URL=['https://note.com/user/n/n5', 'https://note.com/user/n/n1'])
+        clean.to_csv(path, index=False, encoding='utf-8-sig', quoting=1)
+        
+        report = CSVManager().health_report(path)
+        assert report['valid']
+        assert report['row_count'] == 2
+        assert report['missing_columns'] == []
@@ -0,0 +1,52 @@
+"""
+列型変換のテスト
+"""
+
+import pandas as pd
+
+from src.csv_manager import CSVManager
+from src.dtypes import STRING_DTYPE, apply_article_dtypes
+
+
+class TestArticleDtypes:
+    def setup_method(self):
+        self.manager = CSVManager()
+        self.df = pd.DataFrame({
+            '番号': [2, 1],
+            '公開日': ['2025-02-01T10:00:00.000+09:00', '2025-01-01T09:00:00.123+09:00'],
+            'タイトル': ['記事2', '記事1'],
+            '本文': ['本文2\n二行目', '本文1'],
+            '価格': ['無料', '有料'],
+            '購入状況': ['無料', '購入済み or 無料'],
+            'URL': ['https://note.com/user/n/n2', 'https://note.com/user/n/n1']
+        })
+    
+    def test_typed_load_and_save_round_trip(self, tmp_path):
+        """省メモリな型で読み込み、保存すると元のCSVと同じ内容になるテスト"""
+        path = str(tmp_path / 'articles.csv')
+        saved = str(tmp_path / 'saved.csv')
+        self.df.to_csv(path, index=False, encoding='utf-8-sig', quoting=1)
+        
+        df = self.manager.load_existing_csv(path)['dataframe']
+        assert df['番号'].dtype == 'int32'
+        assert pd.api.types.is_datetime64_any_dtype(df['公開日'])
+        assert isinstance(df['価格'].dtype, pd.CategoricalDtype)
+        assert df['本文'].dtype == STRING_DTYPE
+        
+        self.manager._write_csv_atomic(df, saved)
+        with open(path, 'rb') as original, open(saved, 'rb') as written:
+            assert original.read() == written.read()
+        
+        report = self.manager.memory_report(df)
+        assert report['row_count'] == 2
+        assert set(report['columns']) == set(self.df.columns)
+    
+    def test_unparseable_dates_stay_strings(self):
+        """元の表記に戻せない公開日（タイムゾーン混在・空欄のみ）は文字列のまま残すテスト"""
+        mixed = self.df.assign(公開日=['2025-02-01T10:00:00+09:00', '2025-01-01T09:00:00+00:00'])
+        assert apply_article_dtypes(mixed)['公開日'].dtype == STRING_DTYPE
+        
+        empty = self.df.assign(公開日=['', ''], 番号=[1, None])
+        typed = apply_article_dtypes(empty)
+        assert typed['公開日'].dtype == STRING_DTYPE
+        assert typed['番号'].dtype == 'Int32'
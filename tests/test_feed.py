@@ -0,0 +1,65 @@
+"""
+RSSフィードのテスト
+"""
+
+import asyncio
+
+from src.feed import RSSFeed
+
+
+def _url(i: int) -> str:
+    return f'https://note.com/user/n/n{i}'
+
+
+def _rss(numbers) -> bytes:
+    items = ''.join(
+        f'<item><title>記事{i}</title><link>{_url(i)}</link>'
+        f'<pubDate>Mon, 06 Jan 2025 10:00:00 +0900</pubDate></item>'
+        for i in numbers
+    )
+    return f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>{items}</channel></rss>'.encode('utf-8')
+
+
+class TestRSSFeed:
+    def setup_method(self):
+        self.existing = {_url(i) for i in range(1, 11)}
+        self.requests = []
+    
+    def _fetch(self, numbers, etag='"v1"'):
+        async def fetch(url, headers):
+            self.requests.append((url, headers))
+            if headers.get('If-None-Match') == etag:
+                return 304, {}, b''
+            return 200, {'ETag': etag}, _rss(numbers)
+        return fetch
+    
+    def test_covered_when_oldest_item_is_known(self):
+        """最も古い item が既知ならフィードだけで新規記事が決まるテスト"""
+        feed = RSSFeed('https://note.com/user/', fetch=self._fetch([12, 11, 10, 9]))
+        result = asyncio.run(feed.check(self.existing))
+        
+        assert self.requests[0][0] == 'https://note.com/user/rss'
+        assert result['covered']
+        assert result['new_urls'] == [_url(12), _url(11)]
+    
+    def test_gap_falls_back(self):
+        """フィードがすべて新規記事なら抜けの可能性ありとして covered にならないテスト"""
+        feed = RSSFeed('https://note.com/user', fetch=self._fetch([14, 13, 12, 11]))
+        result = asyncio.run(feed.check(self.existing))
+        
+        assert not result['covered']
+        assert len(result['new_urls']) == 4
+    
+    def test_not_modified_reuses_saved_items(self, tmp_path):
+        """2回目は条件付きGETで 304 になり、保存した item で判定するテスト"""
+        state_path = str(tmp_path / 'articles.csv.rss.json')
+        fetch = self._fetch([11, 10])
+        asyncio.run(RSSFeed('https://note.com/user', state_path, fetch=fetch).check(self.existing))
+        
+        self.existing.add(_url(11))
+        result = asyncio.run(RSSFeed('https://note.com/user', state_path, fetch=fetch).check(self.existing))
+        
+        assert self.requests[1][1] == {'If-None-Match': '"v1"'}
+        assert result['not_modified']
+        assert result['covered']
+        assert result['new_urls'] == []
@@ -5,6 +5,7 @@
 import pytest
 from bs4 import BeautifulSoup
 from src.formatter import ContentFormatter
+from src.blocks import blocks_from_json, blocks_to_json
 
 
 class TestContentFormatter:
@@ -41,4 +42,57 @@ class TestContentFormatter:
         
         result = self.formatter.extract_formatted_content(soup)
         expected = '第一段落です。\n→\n第二段落です。\n→'
-        assert result == expected
\ No newline at end of file
+        assert result == expected
+    
+    def test_simple_content_matches_general_path(self):
+        """単純タグのみの本文は高速パスと汎用パスで同じ結果になるテスト"""
+        html = '''
+        <div class="note-common-styles__textnote-body">
+            <h2>見出し</h2>
+            <p>これは<strong>太字</strong>の<br/>テスト→です</p>
+            <p><b>強調</b></p>
+            <p></p>
+        </div>
+        '''
+        soup = BeautifulSoup(html, 'html.parser')
+        body = soup.find('div')
+        
+        fast_blocks = self.formatter._process_simple_content(body)
+        general_blocks = self.formatter._process_content_elements(body)
+        assert fast_blocks == general_blocks
+        expected = '**見出し**\n\nこれは**太字**のテストです\n\n**強調**\n'
+        assert self.formatter.renderer.render(fast_blocks) == expected
+    
+    def test_simple_content_falls_back_for_other_tags(self):
+        """単純タグ以外を含む本文は汎用パスにフォールバックするテスト"""
+        html = '''
+        <div class="note-common-styles__textnote-body">
+            <p>これは<a href="https://example.com">リンク</a>です</p>
+            <ul><li>項目</li></ul>
+        </div>
+        '''
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        assert self.formatter._process_simple_content(soup.find('div')) is None
+        result = self.formatter.extract_formatted_content(soup)
+        assert result == 'これは[リンク](https://example.com)です\n\n- 項目\n'
+    
+    def test_blocks_round_trip_and_render(self):
+        """ブロック列のJSON往復と各形式へのレンダリングテスト"""
+        html = '''
+        <div class="note-common-styles__textnote-body">
+            <h3>見出し</h3>
+            <p>本文と<a href="https://example.com">リンク</a></p>
+            <figure><img src="https://example.com/a.png" alt="図"><figcaption>説明</figcaption></figure>
+            <ol><li>一つ目</li></ol>
+        </div>
+        '''
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        blocks = self.formatter.extract_blocks(soup)
+        restored = blocks_from_json(blocks_to_json(blocks))
+        
+        assert restored == blocks
+        assert self.formatter.render_blocks(restored) == self.formatter.extract_formatted_content(soup)
+        assert self.formatter.render_blocks(restored, 'text') == '見出し\n\n本文とリンク\n\n説明\n\n一つ目\n'
+        assert '<h3>見出し</h3>' in self.formatter.render_blocks(restored, 'html')
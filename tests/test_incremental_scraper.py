@@ -0,0 +1,73 @@
+"""
+増分スクレイパーのブラウザセッションのテスト
+"""
+
+import asyncio
+
+from src.incremental_scraper import IncrementalScraper
+
+
+class FakeBrowserManager:
+    def __init__(self):
+        self.page = None
+        self.startup_seconds = 0.0
+        self.launches = 0
+        self.closes = 0
+        self.crash_count = 0
+        self.recovery_seconds = 0.0
+    
+    async def initialize(self):
+        self.page = object()
+        self.startup_seconds = 2.0
+        self.launches += 1
+    
+    async def close(self):
+        if self.page is not None:
+            self.closes += 1
+        self.page = None
+    
+    async def navigate_to_article(self, url):
+        pass
+    
+    async def get_page_title(self):
+        return '記事タイトル｜note'
+    
+    def recovery_stats(self):
+        return {'crash_count': self.crash_count, 'recovery_seconds': self.recovery_seconds}
+
+
+class TestBrowserSession:
+    def setup_method(self):
+        self.scraper = IncrementalScraper(headless=True)
+        self.browser = self.scraper.browser_manager = FakeBrowserManager()
+    
+    def test_stages_share_one_launch_in_session(self, monkeypatch):
+        """セッション中は各処理が同じブラウザを使い、終了時に1回だけ閉じるテスト"""
+        async def no_sleep(seconds):
+            pass
+        monkeypatch.setattr(asyncio, 'sleep', no_sleep)
+        
+        async def run():
+            async with self.scraper:
+                await self.scraper.quick_validate_urls(['https://note.com/user/n/n1'])
+                await self.scraper.quick_validate_urls(['https://note.com/user/n/n2'])
+                assert self.browser.closes == 0
+                return self.scraper.session_stats()
+        
+        stats = asyncio.run(run())
+        assert self.browser.launches == 1
+        assert self.browser.closes == 1
+        assert stats == {'launch_count': 1, 'reuse_count': 1, 'startup_seconds': 2.0, 'saved_seconds': 2.0,
+                         'crash_count': 0, 'recovery_seconds': 0.0}
+    
+    def test_without_session_each_stage_closes(self):
+        """セッション外では従来どおり処理ごとに起動・終了するテスト"""
+        async def run():
+            owns_browser = await self.scraper.open_browser()
+            await self.scraper.release_browser(owns_browser)
+            owns_browser = await self.scraper.open_browser()
+            await self.scraper.release_browser(owns_browser)
+        
+        asyncio.run(run())
+        assert self.browser.launches == 2
+        assert self.browser.closes == 2
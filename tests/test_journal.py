@@ -0,0 +1,41 @@
+"""
+チェックポイントジャーナルのテスト
+"""
+
+from src.journal import CheckpointJournal
+
+
+def _article(url: str, title: str = 'タイトル') -> dict:
+    return {'url': url, 'title': title, 'content': '本文', 'date': '2025-07-07',
+            'price': '無料', 'purchase_status': '無料'}
+
+
+class TestCheckpointJournal:
+    def test_resume_skips_errors_and_torn_lines(self, tmp_path):
+        """取得済み記事のみ再開対象となり、壊れた末尾行は無視されるテスト"""
+        path = str(tmp_path / 'run.jsonl')
+        
+        journal = CheckpointJournal(path)
+        journal.start({'output': 'output/a.csv'})
+        journal.update_metadata(new_urls=['u1', 'u2', 'u3'])
+        journal.record(_article('u1'))
+        journal.record(_article('u2', 'エラー: timeout'))
+        journal.close()
+        
+        # 書き込み途中で落ちた行を再現
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "article", "url": "u3", "sta')
+        
+        resumed = CheckpointJournal(path)
+        completed = resumed.resume()
+        resumed.record(_article('u3'))
+        resumed.close()
+        
+        assert list(completed) == ['u1', 'u3']
+        assert resumed.metadata['output'] == 'output/a.csv'
+        assert resumed.metadata['new_urls'] == ['u1', 'u2', 'u3']
+        
+        reloaded = CheckpointJournal(path)
+        assert set(reloaded.resume()) == {'u1', 'u3'}
+        reloaded.discard()
+        assert not reloaded.exists()
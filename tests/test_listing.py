@@ -0,0 +1,91 @@
+"""
+増分一覧取得のテスト
+"""
+
+import asyncio
+
+from src.listing import DRAIN_SCRIPT, BrowserListing, KnownBoundary, NoteAPIListing
+from src.url_index import URLIndex
+
+
+def _url(i: int) -> str:
+    return f'https://note.com/user/n/n{i}'
+
+
+class FakeButton:
+    def __init__(self, page):
+        self.page = page
+    
+    async def scroll_into_view_if_needed(self):
+        pass
+    
+    async def click(self):
+        self.page.clicks += 1
+
+
+class FakePage:
+    """「もっとみる」を押すごとに次のカードが追加される一覧ページ（DRAIN_SCRIPT は追加分だけを返す）"""
+    
+    def __init__(self, batches):
+        self.batches = batches
+        self.clicks = 0
+        self.drained = []
+    
+    async def evaluate(self, script, arg=None):
+        if script == DRAIN_SCRIPT:
+            hrefs = [f'/user/n/n{i}' for i in self.batches[self.clicks]] if len(self.drained) <= self.clicks else []
+            self.drained.append(hrefs)
+            return {'hrefs': hrefs, 'nodeCount': 10 * len(hrefs)}
+    
+    async def query_selector(self, selector):
+        return FakeButton(self) if self.clicks + 1 < len(self.batches) else None
+    
+    async def wait_for_timeout(self, ms):
+        pass
+
+
+class TestKnownBoundary:
+    def setup_method(self):
+        # 記事1〜100が既知（一覧は新しい順なので先頭が新規記事）
+        self.existing = {_url(i) for i in range(1, 101)}
+    
+    def test_stops_after_consecutive_known_urls(self):
+        """既知の記事が連続した時点で止まり、途中の既知記事（固定表示など）では止まらないテスト"""
+        boundary = KnownBoundary(URLIndex.build(self.existing), stop_after=3)
+        
+        assert not boundary.feed([_url(103), _url(50), _url(102) + '?from=top'])
+        assert boundary.feed([_url(101), _url(100), _url(99), _url(98), _url(97)])
+        assert boundary.new_urls == [_url(103), _url(102), _url(101)]
+        assert boundary.seen_count == 7
+        assert boundary.feed([_url(104)])
+        assert boundary.new_urls == [_url(103), _url(102), _url(101)]
+    
+    def test_api_listing_fetches_only_until_boundary(self):
+        """記事一覧APIは境界に達したページ以降を取得しないテスト"""
+        requested = []
+        
+        async def fetch(url):
+            requested.append(url)
+            page = int(url.rsplit('=', 1)[1])
+            newest = 103 - (page - 1) * 2
+            return {'data': {
+                'contents': [{'noteUrl': _url(newest)}, {'noteUrl': _url(newest - 1)}],
+                'isLastPage': False
+            }}
+        
+        listing = NoteAPIListing('https://note.com/user', fetch=fetch, interval=0)
+        new_urls = asyncio.run(listing.collect(KnownBoundary(self.existing, stop_after=3)))
+        
+        assert new_urls == [_url(103), _url(102), _url(101)]
+        assert listing.request_count == 3
+        assert requested[0] == 'https://note.com/api/v2/creators/user/contents?kind=note&page=1'
+    
+    def test_browser_listing_reads_only_added_cards(self):
+        """ブラウザ一覧は追加されたカードだけを読み、境界に達したら展開をやめるテスト"""
+        page = FakePage([[106, 105], [104, 103], [102, 101, 100], [99, 98, 97], [96, 95]])
+        listing = BrowserListing(page, wait_ms=0)
+        new_urls = asyncio.run(listing.collect(KnownBoundary(self.existing, stop_after=3)))
+        
+        assert new_urls == [_url(i) for i in range(106, 100, -1)]
+        assert page.clicks == 3
+        assert [len(hrefs) for hrefs in page.drained] == [2, 2, 3, 3]
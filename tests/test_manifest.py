@@ -0,0 +1,38 @@
+"""
+CSVマニフェストのテスト
+"""
+
+import os
+
+from src.exporter import CSVExporter
+from src.manifest import CSVManifest
+
+
+class TestCSVManifest:
+    def setup_method(self):
+        self.exporter = CSVExporter()
+    
+    def test_written_with_csv_and_rebuilt_when_stale(self, tmp_path, make_article):
+        """CSV保存時にマニフェストが作られ、CSVが変わると作り直されるテスト"""
+        filename = str(tmp_path / 'out.csv')
+        self.exporter.save_to_csv([make_article(1, '2025-01-01 09:00', query='?from=top'),
+                                    make_article(2, '2025-02-01 10:00', query='?from=top')], filename)
+        
+        manifest = CSVManifest(filename)
+        data = manifest.load()
+        assert data is not None
+        assert data['row_count'] == 2
+        assert len(data['row_hashes']) == 2
+        
+        stats = manifest.stats()
+        assert stats['existing_urls'] == {'https://note.com/user/n/n1', 'https://note.com/user/n/n2'}
+        assert stats['date_range'] == '2025-01-01 〜 2025-02-01'
+        
+        # マニフェストを介さずにCSVを書き換える
+        with open(filename, 'a', encoding='utf-8') as f:
+            f.write('3,2025-03-01,記事3,本文3,無料,無料,https://note.com/user/n/n3\n')
+        os.utime(filename, ns=(0, 0))
+        
+        assert manifest.load() is None
+        assert manifest.stats()['total_articles'] == 3
+        assert manifest.load()['max_date'] == '2025-03-01 00:00:00'
@@ -0,0 +1,69 @@
+"""
+Parquet出力のテスト
+"""
+
+import pytest
+
+from src.csv_manager import CSVManager
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+class TestParquetCorpus:
+    def setup_method(self):
+        self.manager = CSVManager()
+    
+    def test_append_adds_part_and_projects_columns(self, tmp_path, make_article):
+        """追記が新しいパートになり、列指定で読み込めるテスト"""
+        path = str(tmp_path / 'corpus.parquet')
+        self.manager.append_to_parquet(path, [make_article(1, '2025-01-01 10:00'), make_article(2, price='500円', purchase_status='未購入')])
+        result = self.manager.append_to_parquet(path, [make_article(2, price='500円', purchase_status='未購入'), make_article(3)])
+        
+        assert result['written_count'] == 1
+        assert result['total_articles_count'] == 3
+        assert len(list((tmp_path / 'corpus.parquet').iterdir())) == 2
+        
+        schema = pq.read_schema(str(tmp_path / 'corpus.parquet' / 'part-00000.parquet'))
+        assert str(schema.field('公開日').type) == 'timestamp[ms, tz=Asia/Tokyo]'
+        assert str(schema.field('価格').type).startswith('dictionary')
+        
+        df = self.manager.load_parquet(path, columns=['番号', 'URL'])
+        assert list(df.columns) == ['番号', 'URL']
+        assert list(df['番号']) == [1, 2, 3]
+    
+    def test_mixed_date_formats_round_trip_in_japan_time(self, tmp_path, make_article):
+        """表記が混在した公開日が欠損・日付ずれなく日本時間で保存されるテスト"""
+        path = str(tmp_path / 'corpus.parquet')
+        self.manager.append_to_parquet(path, [
+            make_article(1, '2025-01-06T08:30:00.000+09:00'),
+            make_article(2, '2025-01-05'),
+            make_article(3, '2025/01/04 10:00'),
+            make_article(4, '')
+        ])
+        
+        dates = self.manager.load_parquet(path, columns=['公開日'])['公開日']
+        assert str(dates.dt.tz) == 'Asia/Tokyo'
+        assert list(dates[:3].dt.strftime('%Y-%m-%d %H:%M')) == ['2025-01-06 08:30', '2025-01-05 00:00', '2025-01-04 10:00']
+        assert dates.isna().tolist() == [False, False, False, True]
+    
+    def test_unparsable_date_fails_loudly(self, tmp_path, make_article):
+        """解析できない公開日は欠損にせずエラーにするテスト"""
+        with pytest.raises(ValueError, match='公開日'):
+            self.manager.append_to_parquet(str(tmp_path / 'corpus.parquet'), [make_article(1, '昨日')])
+    
+    def test_append_numbers_by_date_and_skips_url_variants(self, tmp_path, make_article):
+        """新しい順に渡した新規記事も公開日の古い順に番号が振られ、URLの表記違いは重複として除くテスト"""
+        path = str(tmp_path / 'corpus.parquet')
+        self.manager.append_to_parquet(path, [make_article(2), make_article(1)])
+        result = self.manager.append_to_parquet(path, [
+            make_article(4, '2025-03-01'),
+            make_article(3, '2025-02-01'),
+            make_article(1, query='/'),
+            make_article(2, query='?x=1')
+        ])
+        
+        assert result['written_count'] == 2
+        df = self.manager.load_parquet(path, columns=['番号', 'URL'])
+        numbers = dict(zip(df['URL'], df['番号']))
+        assert numbers['https://note.com/user/n/n3'] == 3
+        assert numbers['https://note.com/user/n/n4'] == 4
@@ -0,0 +1,130 @@
+"""
+記事の先読みのテスト
+"""
+
+import asyncio
+import time
+
+import src.incremental_scraper as incremental_scraper
+from src.article import Article
+from src.incremental_scraper import IncrementalScraper
+from src.prefetch import ArticlePrefetcher, RateLimiter, sequential_interval
+from src.scraper import NoteScraper
+
+
+class FakeTab:
+    def __init__(self, context):
+        self.context = context
+        self.url = None
+    
+    async def goto(self, url, **kwargs):
+        self.context.opened_at.append(time.monotonic())
+        self.url = url
+    
+    async def wait_for_timeout(self, ms):
+        # 読み込み待ちを 1/100 に縮めて再現
+        await asyncio.sleep(ms / 100000)
+    
+    async def title(self):
+        return f"{self.url.rsplit('/', 1)[1]}｜note"
+    
+    async def content(self):
+        return f'<html><body><article><time datetime="2025-01-06T10:00:00+09:00"></time><p>{self.url}</p></article></body></html>'
+    
+    async def close(self):
+        self.context.open_tabs -= 1
+
+
+class FakeContext:
+    def __init__(self):
+        self.open_tabs = 0
+        self.max_open_tabs = 0
+        self.opened_at = []
+    
+    async def new_page(self):
+        self.open_tabs += 1
+        self.max_open_tabs = max(self.max_open_tabs, self.open_tabs)
+        return FakeTab(self)
+
+
+class RecordingLimiter(RateLimiter):
+    """ページを開いてよいとした時刻（割り当てた枠）を記録するレート制限"""
+    
+    def __init__(self, interval):
+        super().__init__(interval)
+        self.slots = []
+    
+    async def wait(self):
+        await super().wait()
+        self.slots.append(self._next_at - self.interval)
+
+
+class FakeBrowserManager:
+    def __init__(self):
+        self.context = FakeContext()
+        self.page = object()
+
+
+_original_prefetcher_init = ArticlePrefetcher.__init__
+
+
+def _fast_prefetcher_init(self, context_getter, urls, depth=1, limiter=None, wait_ms=2000):
+    """テスト用にページを開く間隔を縮めた ArticlePrefetcher の初期化"""
+    _original_prefetcher_init(self, context_getter, urls, depth, RateLimiter(0.01), wait_ms)
+
+
+class TestPrefetch:
+    def test_rate_limiter_spaces_page_opens(self):
+        """レート制限で複数のタブでもページを開く間隔があくテスト"""
+        limiter = RateLimiter(0.05)
+        
+        async def run():
+            started = time.monotonic()
+            await asyncio.gather(*(limiter.wait() for _ in range(3)))
+            return time.monotonic() - started
+        
+        assert asyncio.run(run()) >= 0.1
+    
+    def test_scrape_with_prefetch(self, monkeypatch):
+        """先読みありでも記事の順序と内容が変わらず、開くタブは depth+1 件までのテスト"""
+        scraper = IncrementalScraper(headless=True, prefetch_depth=2)
+        scraper.browser_manager = FakeBrowserManager()
+        urls = [f'https://note.com/user/n/n{i}' for i in range(1, 6)]
+        
+        limiter = RecordingLimiter(0.01)
+        monkeypatch.setattr(incremental_scraper, 'RateLimiter', lambda interval: limiter)
+        
+        articles = asyncio.run(scraper.scrape_new_articles_only(urls))
+        context = scraper.browser_manager.context
+        assert [article.title for article in articles] == ['n1', 'n2', 'n3', 'n4', 'n5']
+        assert articles[0].date == '2025-01-06T10:00:00+09:00'
+        assert context.max_open_tabs <= 3
+        assert context.open_tabs == 0
+        # 5件とも interval 以上離れた枠を割り当てられ、どのページも枠より前には開かれない
+        # （実際に開いた時刻どうしの間隔は実行の遅れで揺れるので比べない）
+        assert len(context.opened_at) == len(limiter.slots) == 5
+        gaps = [later - earlier for earlier, later in zip(limiter.slots, limiter.slots[1:])]
+        assert min(gaps) >= 0.0099
+        assert all(opened >= slot for opened, slot in zip(sorted(context.opened_at), limiter.slots))
+    
+    def test_default_interval_not_faster_than_sequential(self):
+        """先読みの既定の間隔が逐次取得（読み込み待ち＋記事間の待機）より短くないテスト"""
+        prefetcher = ArticlePrefetcher(lambda: None, [], wait_ms=2000)
+        assert prefetcher.limiter.interval == sequential_interval(2000) == 3.5
+    
+    def test_full_scrape_with_prefetch(self, monkeypatch):
+        """全件取得（NoteScraper）でも先読みしたタブから順に記事を取得するテスト"""
+        scraper = NoteScraper(headless=True, prefetch_depth=2)
+        scraper.browser_manager = FakeBrowserManager()
+        urls = [f'https://note.com/user/n/n{i}' for i in range(1, 5)]
+        monkeypatch.setattr(ArticlePrefetcher, '__init__', _fast_prefetcher_init)
+        
+        async def run():
+            completed = {urls[1]: Article(urls[1], title='取得済み')}
+            return [article async for article in scraper._iter_articles(urls, completed)]
+        
+        articles = asyncio.run(run())
+        context = scraper.browser_manager.context
+        assert [article.title for article in articles] == ['n1', '取得済み', 'n3', 'n4']
+        assert len(context.opened_at) == 3
+        assert context.open_tabs == 0
@@ -0,0 +1,104 @@
+"""
+増分更新の事前確認のテスト
+"""
+
+import asyncio
+import time
+
+from src.exporter import CSVExporter
+from src.listing import NoteAPIListing
+from src.updater import NoteScrapeUpdater
+
+
+class TestUpdaterProbe:
+    def setup_method(self):
+        self.updater = NoteScrapeUpdater('https://note.com/user', headless=True)
+        
+        async def fail(*args, **kwargs):
+            raise AssertionError('記事一覧やブラウザを使わないはず')
+        self.updater.scraper.get_all_article_urls_from_page = fail
+        self.updater.scraper.browser_manager.initialize = fail
+        self.updater.use_feed = False
+    
+    def _csv(self, tmp_path, monkeypatch, make_article) -> str:
+        monkeypatch.chdir(tmp_path)
+        path = str(tmp_path / 'articles.csv')
+        CSVExporter().save_to_csv([make_article(i) for i in range(3, 0, -1)], path)
+        return path
+    
+    def test_unchanged_exits_without_listing(self, tmp_path, monkeypatch, make_article):
+        """記事数と最新記事が一致すれば記事一覧もブラウザも使わずに終わるテスト"""
+        path = self._csv(tmp_path, monkeypatch, make_article)
+        
+        async def probe(listing):
+            return {'total_count': 3, 'newest_url': 'https://note.com/user/n/n3'}
+        monkeypatch.setattr(NoteAPIListing, 'probe', probe)
+        
+        for update in (self.updater.update_from_csv, self.updater.batch_update_with_progress):
+            started = time.perf_counter()
+            result = asyncio.run(update(path, manual_setup=False))
+            assert time.perf_counter() - started < 1.0
+            assert result['success']
+            assert result['new_count'] == 0
+            assert result['output_file'] == path
+    
+    def test_changed_falls_through_to_listing(self, tmp_path, monkeypatch, make_article):
+        """最新記事が未知なら通常の記事一覧の取得に進むテスト"""
+        path = self._csv(tmp_path, monkeypatch, make_article)
+        
+        async def probe(listing):
+            return {'total_count': 3, 'newest_url': 'https://note.com/user/n/n4'}
+        monkeypatch.setattr(NoteAPIListing, 'probe', probe)
+        
+        result = asyncio.run(self.updater.update_from_csv(path, manual_setup=False))
+        assert not result['success']
+
+
+class TestListingCache:
+    def test_reused_within_ttl_and_refreshed_on_request(self, tmp_path, monkeypatch):
+        """保存した記事一覧を有効期限内は再利用し、refresh_listing で取得し直すテスト"""
+        monkeypatch.chdir(tmp_path)
+        harvested = []
+        
+        async def harvest(profile_url, manual_setup=True):
+            harvested.append(profile_url)
+            return [f'https://note.com/user/n/n{i}' for i in range(1, 4)]
+        
+        first = NoteScrapeUpdater('https://note.com/user', headless=True, use_probe=False)
+        first.scraper.get_all_article_urls_from_page = harvest
+        assert asyncio.run(first.get_current_article_count(manual_setup=False)) == 3
+        
+        second = NoteScrapeUpdater('https://note.com/user/', headless=True, use_probe=False)
+        second.scraper.get_all_article_urls_from_page = harvest
+        assert asyncio.run(second._get_all_article_urls(manual_setup=False))[0] == 'https://note.com/user/n/n1'
+        assert len(harvested) == 1
+        
+        second.refresh_listing = True
+        asyncio.run(second._get_all_article_urls(manual_setup=False))
+        asyncio.run(second._get_all_article_urls(manual_setup=False))
+        assert len(harvested) == 2
+        
+        expired = NoteScrapeUpdater('https://note.com/user', headless=True, listing_ttl=0)
+        expired.scraper.get_all_article_urls_from_page = harvest
+        asyncio.run(expired._get_all_article_urls(manual_setup=False))
+        assert len(harvested) == 3
+    
+    def test_stale_cache_ignored_after_probe_detects_change(self, tmp_path, monkeypatch):
+        """記事数の確認で変更が見つかれば、件数の合わない保存済みの記事一覧を使わないテスト"""
+        monkeypatch.chdir(tmp_path)
+        current = [f'https://note.com/user/n/n{i}' for i in range(4, 0, -1)]
+        
+        async def harvest(profile_url, manual_setup=True):
+            return current
+        
+        async def probe(listing):
+            return {'total_count': 4, 'newest_url': 'https://note.com/user/n/n4'}
+        monkeypatch.setattr(NoteAPIListing, 'probe', probe)
+        
+        updater = NoteScrapeUpdater('https://note.com/user', headless=True, use_feed=False)
+        updater.scraper.get_all_article_urls_from_page = harvest
+        updater.listing_cache.save(current[1:])
+        
+        new_urls, current_count = asyncio.run(updater._find_new_urls(set(current[1:]), manual_setup=False))
+        assert new_urls == ['https://note.com/user/n/n4']
+        assert current_count == 4
@@ -0,0 +1,80 @@
+"""
+URL索引のテスト
+"""
+
+import numpy as np
+import pandas as pd
+
+import src.url_index as url_index
+from src.csv_manager import CSVManager
+from src.exporter import CSVExporter
+from src.url_differ import URLDiffer, normalize_urls
+from src.url_index import URLIndex
+
+
+class TestURLIndex:
+    def setup_method(self):
+        self.differ = URLDiffer()
+        self.existing = {f'https://note.com/user/n/n{i}' for i in range(1, 6)}
+    
+    def test_diff_matches_set_based_diff(self):
+        """索引を使った差分が集合での差分と同じ結果になるテスト"""
+        current = [
+            'https://note.com/user/n/n7?from=top',
+            'https://note.com/user/n/n1',
+            '/user/n/n6',
+            'https://note.com/user/n/n7',
+            'https://note.com/user/n/n3/'
+        ]
+        index = URLIndex.build(self.existing)
+        
+        assert len(index) == 5
+        assert 'https://note.com/user/n/n2?from=top' in index
+        assert self.differ.calculate_new_urls(index, current) == \
+            self.differ.calculate_new_urls(self.existing, current) == \
+            ['https://note.com/user/n/n7', 'https://note.com/user/n/n6']
+    
+    def test_hash_collision_falls_back_to_string_compare(self, monkeypatch):
+        """ハッシュ値が衝突しても文字列の比較で区別するテスト"""
+        monkeypatch.setattr(url_index, 'hash_urls', lambda urls: np.zeros(len(urls), dtype=np.uint64))
+        index = URLIndex.build(['https://note.com/a/n/n1', 'https://note.com/b/n/n2'])
+        
+        found = index.contains(np.array(['https://note.com/b/n/n2', 'https://note.com/c/n/n3'], dtype=object))
+        assert found.tolist() == [True, False]
+    
+    def test_persisted_and_rebuilt_when_csv_changes(self, tmp_path, make_article):
+        """索引がCSVの横に保存され、CSVが変わると作り直されるテスト"""
+        manager = CSVManager()
+        path = str(tmp_path / 'articles.csv')
+        CSVExporter().save_to_csv([make_article(i) for i in range(1, 4)], path)
+        
+        index = manager.url_index(path)
+        assert len(index) == 3
+        assert URLIndex.load(f"{path}.urls.npz").source == index.source
+        
+        CSVExporter().save_to_csv([make_article(i) for i in range(1, 6)], path)
+        assert len(manager.url_index(path)) == 5
+    
+    def test_normalize_urls_matches_normalize_url(self):
+        """列ごとの正規化が URLDiffer._normalize_url と同じ結果になるテスト"""
+        urls = [
+            'https://note.com/user/n/n1',
+            'https://note.com/user/n/n1/',
+            'https://note.com/user/n/n1?from=top#comment',
+            '/user/n/n1',
+            '/user/n/n1/?x=1',
+            '//note.com/user/n/n1',
+            'https://note.com/user/n/n1;params?x=1',
+            'https://note.com/user;v=1/n/n1',
+            'note.com/user/n/n1',
+            'HTTPS://note.com/user/n/n1',
+            '/user/./n/../n/n1',
+            ' https://note.com/user/n/n1 ',
+            'https://note.com:443/user/n/n1',
+            'https://note.com',
+            '/',
+            '',
+            None
+        ]
+        expected = [self.differ._normalize_url(url) for url in urls]
+        assert normalize_urls(pd.Series(urls, dtype=object)).tolist() == expected